@@ -0,0 +1,330 @@
+import math
+import time
+import pygame
+import config
+from entity_state import EntityState
+
+class ShotCandidate:
+    """AimSolverが評価した1つの発射候補とその予測結果。"""
+    def __init__(self, launch_vector, start_pos):
+        self.launch_vector = launch_vector # 発射ベクトル (Vector2)
+        self.start_pos = start_pos # 発射位置 (スリングショットから引っ張った位置)
+        self.combo = 0 # 予測されるコンボ数
+        self.damage = 0.0 # 敵と弱点に与える予測ダメージの合計
+        self.kills = 0 # 撃破できる見込みの敵の数
+        self.weak_point_hits = 0 # 弱点に当たる回数
+        self.frames = 0 # シミュレーションしたフレーム数
+
+    def __repr__(self):
+        return (f"ShotCandidate(vector=({self.launch_vector.x:.1f}, {self.launch_vector.y:.1f}), "
+                f"combo={self.combo}, damage={self.damage:.1f}, kills={self.kills})")
+
+
+def _bounce_off_rect(x, y, vx, vy, radius, left, top, right, bottom, bounciness):
+    """
+    Bird.collide_and_bounce_off_rect と同じ計算をスカラー値で行う。
+    :return: 衝突してバウンドした場合は (x, y, vx, vy)、そうでなければNone
+    """
+    closest_x = left if x < left else right if x > right else x
+    closest_y = top if y < top else bottom if y > bottom else y
+    dx = x - closest_x
+    dy = y - closest_y
+    distance_sq = dx * dx + dy * dy
+    if distance_sq >= radius * radius:
+        return None
+
+    distance = math.sqrt(distance_sq)
+    if distance > 0.01:
+        nx, ny = dx / distance, dy / distance
+    else: # めり込んでいる場合は四角形の中心から押し出す
+        nx, ny = x - (left + right) / 2, y - (top + bottom) / 2
+        length = math.hypot(nx, ny)
+        if length == 0:
+            return None
+        nx, ny = nx / length, ny / length
+        distance = 0.0
+
+    dot = vx * nx + vy * ny
+    if dot > 0:
+        return None # すでに離れようとしている
+
+    overlap = radius - distance
+    x += nx * overlap
+    y += ny * overlap
+    vx = (vx - 2 * dot * nx) * bounciness
+    vy = (vy - 2 * dot * ny) * bounciness
+    return x, y, vx, vy
+
+
+class AimSolver:
+    """
+    現在のシーン（雲、塔、敵、ボスの弱点）に対して発射ベクトルを探索し、
+    予測コンボ数やダメージの順に並べた発射候補を返すクラス。
+    アシスト機能、タイトル画面のデモ、バランス検証ツールから使うことを想定している。
+
+    探索は、MAX_PULL_DISTANCE 内の極座標グリッドの全候補を1フレームずつ同時に進める
+    バッチシミュレーションで行う。予算（時間、またはシミュレーションする候補フレーム数）を超えたら
+    途中で打ち切り、その時点までの予測結果で順位付けする。予算が余れば上位候補の周囲を細かく探索する。
+    時間予算はCPUの負荷によって探索量が変わるので、結果を再現したい場合（バランス検証ツールなど）は
+    time_budget_ms=Noneにしてフレーム数の予算だけを使う。
+
+    シミュレーション中、敵やボスは静止しているものとみなし、アイテムは無視する。
+    """
+    # 順位付けのキー
+    RANK_KEYS = {
+        "combo": lambda c: (c.combo, c.damage, c.kills),
+        "damage": lambda c: (c.damage, c.kills, c.combo),
+    }
+
+    def __init__(self, angle_steps=24, power_steps=3, max_frames=240, time_budget_ms=8.0, frame_budget=None, refine_top=3):
+        """
+        :param angle_steps: 発射角度の分割数 (360度を等分)
+        :param power_steps: 引っ張り距離の分割数
+        :param max_frames: 1候補あたりにシミュレーションする最大フレーム数
+        :param time_budget_ms: 1回の探索にかけてよい時間 (ミリ秒)。Noneなら時間では打ち切らない
+        :param frame_budget: 1回の探索でシミュレーションしてよい候補フレーム数の合計
+                             (候補の数 x 進めたフレーム数)。Noneなら上限なし
+        :param refine_top: 細かい探索を行う上位候補の数
+        """
+        self.angle_steps = angle_steps
+        self.power_steps = power_steps
+        self.max_frames = max_frames
+        self.time_budget_ms = time_budget_ms
+        self.frame_budget = frame_budget
+        self.frames_left = None # 現在の探索で残っている候補フレーム数 (Noneなら上限なし)
+        self.refine_top = refine_top
+
+        frame_ms = 1000 / config.FPS
+        self.cloud_safe_frames = math.ceil(config.CLOUD_COLLISION_SAFE_TIME / frame_ms)
+        self.tower_safe_frames = math.floor(config.TOWER_COLLISION_SAFE_TIME / frame_ms)
+        self.ground_safe_frames = math.ceil(config.GROUND_COLLISION_SAFE_TIME / frame_ms)
+        self.power_up_cooldown_frames = math.floor(config.BIRD_POWER_UP_COOLDOWN / frame_ms)
+
+    def solve(self, game_logic_manager, slingshot_pos, bird_radius=None, rank_by="combo", top_n=5):
+        """
+        現在のシーンに対して発射ベクトルを探索する。
+        :param game_logic_manager: シーンを参照するGameLogicManager
+        :param slingshot_pos: スリングショットの位置 (Vector2)
+        :param bird_radius: 発射時の弾の半径。Noneなら現在の弾の半径
+        :param rank_by: "combo" または "damage"
+        :param top_n: 返す候補の数
+        :return: 順位の高い順に並んだShotCandidateのリスト
+        """
+        deadline = time.perf_counter() + self.time_budget_ms / 1000 if self.time_budget_ms is not None else None
+        self.frames_left = self.frame_budget
+        scene = self._snapshot_scene(game_logic_manager)
+        if bird_radius is None:
+            bird_radius = game_logic_manager.bird.radius
+        rank_key = self.RANK_KEYS[rank_by]
+
+        # --- 1. 粗いグリッドで全方向を探索 ---
+        angle_step = 360 / self.angle_steps
+        min_pull = config.MIN_PULL_DISTANCE_TO_LAUNCH
+        power_span = config.MAX_PULL_DISTANCE - min_pull
+        vectors = []
+        for i in range(self.angle_steps):
+            for j in range(self.power_steps):
+                pull = config.MAX_PULL_DISTANCE - power_span * j / max(self.power_steps - 1, 1)
+                vectors.append(pygame.math.Vector2(pull, 0).rotate(i * angle_step))
+        candidates = self._simulate_batch(vectors, slingshot_pos, bird_radius, scene, deadline)
+        candidates.sort(key=rank_key, reverse=True)
+
+        # --- 2. 時間が余っていれば、上位候補の周囲を細かく探索 ---
+        if self.refine_top > 0 and not self._out_of_budget(deadline):
+            refined_vectors = []
+            for candidate in candidates[:self.refine_top]:
+                for angle_offset in (-angle_step / 3, angle_step / 3):
+                    for pull_scale in (0.9, 1.0):
+                        vector = candidate.launch_vector.rotate(angle_offset) * pull_scale
+                        if vector.length() >= min_pull:
+                            refined_vectors.append(vector)
+            candidates += self._simulate_batch(refined_vectors, slingshot_pos, bird_radius, scene, deadline)
+            candidates.sort(key=rank_key, reverse=True)
+
+        return candidates[:top_n]
+
+    def _out_of_budget(self, deadline):
+        """時間、または候補フレーム数の予算を使い切っていればTrueを返す。"""
+        if deadline is not None and time.perf_counter() >= deadline:
+            return True
+        return self.frames_left is not None and self.frames_left <= 0
+
+    def _snapshot_scene(self, game_logic_manager):
+        """シーンの障害物を、シミュレーションで扱いやすいタプルのリストに変換する。"""
+        clouds = []
+        for cloud in game_logic_manager.clouds:
+            puffs = [(center[0], center[1], radius) for center, radius in cloud.puffs]
+            if not puffs:
+                continue
+            # 雲全体を囲む円（大まかな判定で個々の円の判定を省くため）
+            cx = sum(p[0] for p in puffs) / len(puffs)
+            cy = sum(p[1] for p in puffs) / len(puffs)
+            bound = max(math.hypot(p[0] - cx, p[1] - cy) + p[2] for p in puffs)
+            clouds.append((cx, cy, bound, puffs))
+
+        blocks = [(b.rect.left, b.rect.top, b.rect.right, b.rect.bottom) for b in game_logic_manager.tower.blocks]
+
+        # (left, top, right, bottom, 種類, HP, 攻撃力)
+        targets = []
+        boss = game_logic_manager.entities.boss
+        for enemy in game_logic_manager.entities.enemies:
+            if enemy.state == EntityState.DYING:
+                continue
+            rect = enemy.rect
+            if enemy is boss:
+                for wp in enemy.weak_points:
+                    if wp.is_active:
+                        targets.append((wp.rect.left, wp.rect.top, wp.rect.right, wp.rect.bottom, "weak_point", enemy.hp, 0))
+                targets.append((rect.left, rect.top, rect.right, rect.bottom, "boss_body", enemy.hp, config.BOSS_BODY_CONTACT_DAMAGE_TO_BIRD))
+            else:
+                targets.append((rect.left, rect.top, rect.right, rect.bottom, "enemy", enemy.hp, enemy.attack_power))
+        return clouds, blocks, targets
+
+    def _simulate_batch(self, vectors, slingshot_pos, bird_radius, scene, deadline):
+        """
+        複数の発射候補を1フレームずつ同時に進める。
+        GameLogicManagerの衝突処理（壁→雲→塔→敵→地面）と同じ順番で判定する。
+        """
+        clouds, blocks, targets = scene
+        count = len(vectors)
+        candidates = []
+        xs, ys, vxs, vys = [0.0] * count, [0.0] * count, [0.0] * count, [0.0] * count
+        radii = [float(bird_radius)] * count
+        hps = [int(bird_radius * config.BIRD_HP_MULTIPLIER)] * count
+        last_power_up = [-self.power_up_cooldown_frames - 1] * count
+        hit_masks = [0] * count # 当たった敵のビットマスク（同じ敵は1回だけ数える）
+        launched_upwards = [False] * count
+        for i, vector in enumerate(vectors):
+            start = slingshot_pos - vector
+            candidates.append(ShotCandidate(vector, start))
+            xs[i], ys[i] = start.x, start.y
+            vxs[i] = vector.x * config.LAUNCH_POWER_MULTIPLIER
+            vys[i] = vector.y * config.LAUNCH_POWER_MULTIPLIER
+            launched_upwards[i] = vys[i] < 0
+
+        gravity = config.GRAVITY
+        ground_y = config.GROUND_Y
+        wall_bounce = config.ENABLE_SIDE_WALL_BOUNCE
+        min_velocity_sq = config.BIRD_RESET_MIN_VELOCITY_SQUARED
+        active = list(range(count))
+
+        for frame in range(1, self.max_frames + 1):
+            if not active or self._out_of_budget(deadline):
+                break
+            if self.frames_left is not None:
+                self.frames_left -= len(active)
+            still_active = []
+            for i in active:
+                x, y, vx, vy, r = xs[i], ys[i], vxs[i], vys[i], radii[i]
+                candidate = candidates[i]
+                vy += gravity
+                x += vx
+                y += vy
+                powered = False
+
+                # 壁
+                if wall_bounce:
+                    if x - r < 0 and vx < 0:
+                        x = r
+                        vx *= -config.SIDE_WALL_BOUNCINESS
+                        hps[i] -= config.SIDE_WALL_DAMAGE
+                    elif x + r > config.SCREEN_WIDTH and vx > 0:
+                        x = config.SCREEN_WIDTH - r
+                        vx *= -config.SIDE_WALL_BOUNCINESS
+                        hps[i] -= config.SIDE_WALL_DAMAGE
+                elif x < -r or x > config.SCREEN_WIDTH + r:
+                    candidate.frames = frame
+                    continue
+
+                # 雲
+                if frame >= self.cloud_safe_frames:
+                    for cx, cy, bound, puffs in clouds:
+                        if (x - cx) ** 2 + (y - cy) ** 2 >= (bound + r) ** 2:
+                            continue
+                        hit = False
+                        for px, py, pr in puffs:
+                            dx, dy = x - px, y - py
+                            distance_sq = dx * dx + dy * dy
+                            if distance_sq >= (r + pr) ** 2:
+                                continue
+                            hit = True
+                            candidate.combo += 1
+                            powered = True
+                            distance = math.sqrt(distance_sq)
+                            if distance > 0:
+                                nx, ny = dx / distance, dy / distance
+                                dot = vx * nx + vy * ny
+                                if dot <= 0:
+                                    overlap = r + pr - distance
+                                    x += nx * overlap
+                                    y += ny * overlap
+                                    vx = (vx - 2 * dot * nx) * config.CLOUD_BOUNCINESS
+                                    vy = (vy - 2 * dot * ny) * config.CLOUD_BOUNCINESS
+                            break
+                        if hit:
+                            break
+
+                # 塔
+                if frame > self.tower_safe_frames:
+                    for left, top, right, bottom in blocks:
+                        bounced = _bounce_off_rect(x, y, vx, vy, r, left, top, right, bottom, config.TOWER_BOUNCINESS)
+                        if bounced:
+                            x, y, vx, vy = bounced
+                            candidate.combo += 1
+                            powered = True
+                            break
+
+                # 敵・ボス
+                for index, (left, top, right, bottom, kind, enemy_hp, enemy_attack) in enumerate(targets):
+                    bit = 1 << index
+                    if hit_masks[i] & bit:
+                        continue
+                    bounciness = config.BOSS_BODY_BOUNCINESS if kind == "boss_body" else config.ENEMY_BOUNCINESS
+                    bounced = _bounce_off_rect(x, y, vx, vy, r, left, top, right, bottom, bounciness)
+                    if not bounced:
+                        continue
+                    x, y, vx, vy = bounced
+                    hit_masks[i] |= bit
+                    attack_power = r * config.BIRD_ATTACK_POWER_MULTIPLIER
+                    if kind == "boss_body":
+                        hps[i] -= enemy_attack
+                    else:
+                        candidate.combo += 1
+                        candidate.damage += min(attack_power, enemy_hp)
+                        if kind == "weak_point":
+                            candidate.weak_point_hits += 1
+                            powered = True
+                        else:
+                            if attack_power >= enemy_hp:
+                                candidate.kills += 1
+                            hps[i] -= enemy_attack
+                            powered = hps[i] > 0
+                    break
+
+                # 地面
+                if not (launched_upwards[i] and frame < self.ground_safe_frames):
+                    if y + r > ground_y:
+                        y = ground_y - r
+                        vy *= -config.BOUNCINESS
+                        vx *= config.FRICTION
+
+                # パワーアップ（Bird.power_upと同じくクールダウンとHP割合を考慮）
+                if powered and frame - last_power_up[i] > self.power_up_cooldown_frames:
+                    max_hp = int(r * config.BIRD_HP_MULTIPLIER)
+                    hp_ratio = hps[i] / max_hp if max_hp > 0 else 1.0
+                    r = min(r * config.BIRD_POWER_UP_SCALE, config.BIRD_MAX_RADIUS)
+                    hps[i] = int(int(r * config.BIRD_HP_MULTIPLIER) * hp_ratio)
+                    last_power_up[i] = frame
+
+                xs[i], ys[i], vxs[i], vys[i], radii[i] = x, y, vx, vy, r
+                candidate.frames = frame
+
+                # 終了判定（HP切れ、または地面で停止）
+                if hps[i] <= 0:
+                    continue
+                if vx * vx + vy * vy < min_velocity_sq and y + r >= ground_y - 1:
+                    continue
+                still_active.append(i)
+            active = still_active
+
+        return candidates
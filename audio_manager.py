@@ -1,134 +1,149 @@
 import pygame
 import config
 import os
+import io
+import asyncio
+
+# デコード済みのSEのキャッシュ（パス -> Sound）。AudioManagerを作り直しても再デコードしない
+_sound_cache = {}
+# 読み込み済みのBGMファイルの中身のキャッシュ（パス -> bytes）
+_music_cache = {}
 
 class AudioManager:
     """
     BGMの再生、切り替え、停止を管理するクラス。
+    SEは初期化時には読み込まず、preload()で1フレームに1つずつバックグラウンドでデコードする。
+    ボス戦BGMのファイルも、SEの後にpreload()で少しずつメモリへ読み込んでおく。
+    プリロードが終わる前に再生要求があったSEは、その場で読み込む。
+    SEの再生要求はフレームの間ためておき、flush()で重複をまとめてから、
+    同時発音数の上限と優先度に従ってチャンネルを割り当てて再生する。
     """
     def __init__(self, initial_enabled=True):
-        """AudioManagerを初期化する。"""
+        """AudioManagerを初期化する。ファイルの存在確認やデコードはここでは行わない。"""
         self.enabled = initial_enabled # サウンドが有効かどうかのフラグ
         self.current_bgm_type = None
         self.bgm_paths = {
             "normal": config.BGM_NORMAL_PATH,
             "boss": config.BGM_BOSS_PATH,
         }
-        # BGMファイルが存在するかどうかを事前にチェック
-        self.music_loaded = {
-            "normal": os.path.exists(config.BGM_NORMAL_PATH),
-            "boss": os.path.exists(config.BGM_BOSS_PATH),
+        # BGMファイルが存在するかどうか。最初に必要になった時に確認する
+        self.music_loaded = {}
+
+        # --- SEの一覧 (名前 -> (パス, 音量)) ---
+        # よく鳴るものから順に並べ、プリロードもこの順番で行う
+        self.sound_manifest = {
+            "combo_hit": (config.SE_COMBO_HIT_PATH, config.SE_COMBO_HIT_VOLUME),
+            "enemy_hit": (config.SE_ENEMY_HIT_PATH, config.SE_VOLUME),
+            "enemy_death": (config.SE_ENEMY_DEATH_PATH, config.SE_VOLUME),
+            "tower_damage": (config.SE_TOWER_DAMAGE_PATH, config.SE_VOLUME),
+            "stage_start": (config.SE_STAGE_START_PATH, config.SE_VOLUME),
+            "ui_click": (config.SE_UI_CLICK_PATH, config.SE_VOLUME),
+            "gauge_max": (config.SE_GAUGE_MAX_PATH, config.SE_VOLUME),
+            "item_spawn": (config.SE_ITEM_SPAWN_PATH, config.SE_VOLUME),
+            "heart_collect": (config.SE_HEART_COLLECT_PATH, config.SE_VOLUME),
+            "speed_up_collect": (config.SE_SPEED_UP_COLLECT_PATH, config.SE_VOLUME),
+            "size_up_collect": (config.SE_SIZE_UP_COLLECT_PATH, config.SE_VOLUME),
         }
-        if not any(self.music_loaded.values()):
-            print("警告: BGMファイルが一つも見つかりません。BGMは再生されません。")
-        
-        # --- コンボヒットSEの読み込み ---
-        self.combo_hit_sound = None
-        if os.path.exists(config.SE_COMBO_HIT_PATH):
-            self.combo_hit_sound = pygame.mixer.Sound(config.SE_COMBO_HIT_PATH)
-            self.combo_hit_sound.set_volume(config.SE_COMBO_HIT_VOLUME)
-        else:
-            print(f"警告: SEファイルが見つかりません: {config.SE_COMBO_HIT_PATH}")
+        if config.USE_SCALE_SOUND_FOR_COMBO:
+            for i, path in enumerate(config.SCALE_SOUND_PATHS):
+                self.sound_manifest[f"scale_{i}"] = (path, config.SE_VOLUME)
+
+        self.sounds = {} # このインスタンスで解決済みのSE (名前 -> Sound または None)
+        self.scale_sounds = None # 読み込めた音階SEの名前のリスト。最初に必要になった時に作る
+        self.is_preloading = False
+        self.is_preloaded = False
+
+        # --- チャンネル管理 ---
+        # 重要なSEには専用チャンネルを確保する（find_channelでは返されなくなる）
+        pygame.mixer.set_num_channels(config.SE_NUM_CHANNELS)
+        pygame.mixer.set_reserved(len(config.SE_RESERVED_SOUNDS))
+        self.reserved_channels = {name: pygame.mixer.Channel(i) for i, name in enumerate(config.SE_RESERVED_SOUNDS)}
+        self.pending_sounds = {} # このフレームに再生要求があったSE（順序付きの集合として使う）
+        self.active_voices = [] # 再生中のSE [(チャンネル, 名前, Sound), ...]（古い順）
 
-        # --- SEの初期化 ---
-        self.scale_sounds = []
-        sounds_found = 0
-        for path in config.SCALE_SOUND_PATHS:
+        pygame.mixer.music.set_volume(config.BGM_VOLUME)
+        self.scale_index = 0
+
+    def _load_sound(self, name):
+        """
+        SEを1つ読み込んでキャッシュする。ファイルがなければNoneを記録して、以降は確認しない。
+        :param name: sound_manifestのキー
+        :return: pygame.mixer.Sound または None
+        """
+        path, volume = self.sound_manifest[name]
+        sound = _sound_cache.get(path)
+        if sound is None:
             if os.path.exists(path):
                 sound = pygame.mixer.Sound(path)
-                sound.set_volume(config.SE_VOLUME)
-                self.scale_sounds.append(sound)
-                sounds_found += 1
+                _sound_cache[path] = sound
             else:
                 print(f"警告: SEファイルが見つかりません: {path}")
-        
-        # 読み込めたSEが一つもなければ、リストを空にして警告を出す
-        if sounds_found == 0:
-            self.scale_sounds.clear() # 念のためクリア
-            print("音階SEは再生されません。")
-
-        # 敵死亡SEの読み込み
-        self.enemy_death_sound = None
-        if os.path.exists(config.SE_ENEMY_DEATH_PATH):
-            self.enemy_death_sound = pygame.mixer.Sound(config.SE_ENEMY_DEATH_PATH)
-            self.enemy_death_sound.set_volume(config.SE_VOLUME)
-        else:
-            print(f"警告: SEファイルが見つかりません: {config.SE_ENEMY_DEATH_PATH}")
-
-        # 敵ヒットSEの読み込み
-        self.enemy_hit_sound = None
-        if os.path.exists(config.SE_ENEMY_HIT_PATH):
-            self.enemy_hit_sound = pygame.mixer.Sound(config.SE_ENEMY_HIT_PATH)
-            self.enemy_hit_sound.set_volume(config.SE_VOLUME)
-        else:
-            print(f"警告: SEファイルが見つかりません: {config.SE_ENEMY_HIT_PATH}")
-
-        # タワーダメージSEの読み込み
-        self.tower_damage_sound = None
-        if os.path.exists(config.SE_TOWER_DAMAGE_PATH):
-            self.tower_damage_sound = pygame.mixer.Sound(config.SE_TOWER_DAMAGE_PATH)
-            self.tower_damage_sound.set_volume(config.SE_VOLUME)
-        else:
-            print(f"警告: SEファイルが見つかりません: {config.SE_TOWER_DAMAGE_PATH}")
-
-        # ハート取得SEの読み込み
-        self.heart_collect_sound = None
-        if os.path.exists(config.SE_HEART_COLLECT_PATH):
-            self.heart_collect_sound = pygame.mixer.Sound(config.SE_HEART_COLLECT_PATH)
-            self.heart_collect_sound.set_volume(config.SE_VOLUME)
-        else:
-            print(f"警告: SEファイルが見つかりません: {config.SE_HEART_COLLECT_PATH}")
-
-        # ステージ開始SEの読み込み
-        self.stage_start_sound = None
-        if os.path.exists(config.SE_STAGE_START_PATH):
-            self.stage_start_sound = pygame.mixer.Sound(config.SE_STAGE_START_PATH)
-            self.stage_start_sound.set_volume(config.SE_VOLUME)
-        else:
-            print(f"警告: SEファイルが見つかりません: {config.SE_STAGE_START_PATH}")
-
-        # UIクリックSEの読み込み
-        self.ui_click_sound = None
-        if os.path.exists(config.SE_UI_CLICK_PATH):
-            self.ui_click_sound = pygame.mixer.Sound(config.SE_UI_CLICK_PATH)
-            self.ui_click_sound.set_volume(config.SE_VOLUME)
-        else:
-            print(f"警告: SEファイルが見つかりません: {config.SE_UI_CLICK_PATH}")
-
-        # アイテム出現SEの読み込み
-        self.item_spawn_sound = None
-        if os.path.exists(config.SE_ITEM_SPAWN_PATH):
-            self.item_spawn_sound = pygame.mixer.Sound(config.SE_ITEM_SPAWN_PATH)
-            self.item_spawn_sound.set_volume(config.SE_VOLUME)
-        else:
-            print(f"警告: SEファイルが見つかりません: {config.SE_ITEM_SPAWN_PATH}")
-
-        # スピードアップ取得SEの読み込み
-        self.speed_up_collect_sound = None
-        if os.path.exists(config.SE_SPEED_UP_COLLECT_PATH):
-            self.speed_up_collect_sound = pygame.mixer.Sound(config.SE_SPEED_UP_COLLECT_PATH)
-            self.speed_up_collect_sound.set_volume(config.SE_VOLUME)
-        else:
-            print(f"警告: SEファイルが見つかりません: {config.SE_SPEED_UP_COLLECT_PATH}")
-
-        # 巨大化取得SEの読み込み
-        self.size_up_collect_sound = None
-        if os.path.exists(config.SE_SIZE_UP_COLLECT_PATH):
-            self.size_up_collect_sound = pygame.mixer.Sound(config.SE_SIZE_UP_COLLECT_PATH)
-            self.size_up_collect_sound.set_volume(config.SE_VOLUME)
-        else:
-            print(f"警告: SEファイルが見つかりません: {config.SE_SIZE_UP_COLLECT_PATH}")
-
-        # ゲージ満タンSEの読み込み
-        self.gauge_max_sound = None
-        if os.path.exists(config.SE_GAUGE_MAX_PATH):
-            self.gauge_max_sound = pygame.mixer.Sound(config.SE_GAUGE_MAX_PATH)
-            self.gauge_max_sound.set_volume(config.SE_VOLUME)
-        else:
-            print(f"警告: SEファイルが見つかりません: {config.SE_GAUGE_MAX_PATH}")
+        if sound is not None:
+            sound.set_volume(volume)
+        self.sounds[name] = sound
+        return sound
+
+    def _get_sound(self, name):
+        """SEを返す。まだ読み込まれていなければ、その場で読み込む。"""
+        if name in self.sounds:
+            return self.sounds[name]
+        return self._load_sound(name)
+
+    async def preload(self):
+        """
+        全てのSEを、1回のasyncioティックにつき1つずつデコードし、続けてボス戦BGMを読み込む。
+        初期化時やステージの途中に、まとめて読み込んでフレームが止まるのを防ぐ。
+        """
+        if self.is_preloading or self.is_preloaded:
+            return
+        self.is_preloading = True
+        for name in self.sound_manifest:
+            if name not in self.sounds:
+                self._load_sound(name)
+            await asyncio.sleep(0) # 次のフレームに処理を譲る
+        await self._prefetch_music_async("boss")
+        self.is_preloading = False
+        self.is_preloaded = True
+        print(f"SEのプリロードが完了しました。({len(_sound_cache)}個)")
+
+    def _is_music_available(self, bgm_type):
+        """BGMファイルが存在するかどうかを返す。結果は記録して、以降は確認しない。"""
+        if bgm_type not in self.music_loaded:
+            self.music_loaded[bgm_type] = os.path.exists(self.bgm_paths[bgm_type])
+            if not self.music_loaded[bgm_type]:
+                print(f"警告: BGMファイルが見つかりません: {self.bgm_paths[bgm_type]}")
+        return self.music_loaded[bgm_type]
+
+    def prefetch_music(self, bgm_type):
+        """
+        BGMファイルを事前にメモリへ読み込んでおく。切り替え時のファイル読み込みを省くため。
+        読み込み済み、またはファイルが存在しない場合は何もしない。
+        :param bgm_type: "normal" または "boss"
+        """
+        path = self.bgm_paths[bgm_type]
+        if path in _music_cache or not self._is_music_available(bgm_type):
+            return
+        with open(path, "rb") as f:
+            _music_cache[path] = f.read()
+        print(f"BGM '{bgm_type}' をプリフェッチしました。")
 
-        pygame.mixer.music.set_volume(config.BGM_VOLUME)
-        self.scale_index = 0
+    async def _prefetch_music_async(self, bgm_type):
+        """
+        BGMファイルを、1回のasyncioティックにつきBGM_PREFETCH_CHUNK_SIZEバイトずつメモリへ読み込む。
+        読み込み済み、またはファイルが存在しない場合は何もしない。
+        :param bgm_type: "normal" または "boss"
+        """
+        path = self.bgm_paths[bgm_type]
+        if path in _music_cache or not self._is_music_available(bgm_type):
+            return
+        chunks = []
+        with open(path, "rb") as f:
+            while chunk := f.read(config.BGM_PREFETCH_CHUNK_SIZE):
+                chunks.append(chunk)
+                await asyncio.sleep(0) # 次のフレームに処理を譲る
+        if path not in _music_cache: # 読み込み中に、再生のためにその場で読み込まれていなければ
+            _music_cache[path] = b"".join(chunks)
+        print(f"BGM '{bgm_type}' をプリフェッチしました。")
 
     def toggle_enabled(self):
         """サウンドの有効/無効を切り替える。"""
@@ -150,12 +165,18 @@ class AudioManager:
         if self.current_bgm_type == bgm_type:
             return
         # 再生しようとしているBGMファイルが存在しない場合は、現在のBGMを止めずに処理を中断
-        if not self.music_loaded.get(bgm_type, False):
+        if not self._is_music_available(bgm_type):
             return
 
         print(f"BGMを '{self.current_bgm_type}' から '{bgm_type}' に切り替えます。")
         pygame.mixer.music.fadeout(config.BGM_FADEOUT_MS)
-        pygame.mixer.music.load(self.bgm_paths[bgm_type])
+        # プリフェッチ済みならメモリ上のデータから、そうでなければファイルから直接ストリーミング再生する
+        # (ここでファイル全体を読み込むと、その分フレームが止まる)
+        path = self.bgm_paths[bgm_type]
+        if path in _music_cache:
+            pygame.mixer.music.load(io.BytesIO(_music_cache[path]), os.path.splitext(path)[1][1:])
+        else:
+            pygame.mixer.music.load(path)
         pygame.mixer.music.play(-1, fade_ms=1000) # -1でループ再生、1秒でフェードイン
         self.current_bgm_type = bgm_type
 
@@ -176,70 +197,132 @@ class AudioManager:
         if config.USE_SCALE_SOUND_FOR_COMBO:
             self.play_scale_sound()
         else:
-            if self.combo_hit_sound:
-                self.combo_hit_sound.play()
+            self._play("combo_hit")
 
     def play_scale_sound(self):
         """現在の音階のSEを再生し、次の音階に進める。"""
-        if not self.enabled or not self.scale_sounds:
+        if not self.enabled:
+            return
+        if self.scale_sounds is None:
+            # 読み込めた音階SEだけを並べる
+            self.scale_sounds = []
+            for i in range(len(config.SCALE_SOUND_PATHS)):
+                if self._get_sound(f"scale_{i}"):
+                    self.scale_sounds.append(f"scale_{i}")
+            if not self.scale_sounds:
+                print("音階SEは再生されません。")
+        if not self.scale_sounds:
             return
 
         # 現在のインデックスのサウンドを再生
-        sound_to_play = self.scale_sounds[self.scale_index]
-        sound_to_play.play()
+        self._play(self.scale_sounds[self.scale_index])
 
         # インデックスを次に進める (リストの範囲でループ)
         self.scale_index = (self.scale_index + 1) % len(self.scale_sounds)
 
+    def _play(self, name):
+        """
+        名前で指定したSEの再生を予約する。実際の再生はflush()で行う。
+        同じフレームに同じSEが何度要求されても、1回の再生にまとめる。
+        """
+        if not self.enabled:
+            return
+        self.pending_sounds[name] = None
+
+    def flush(self):
+        """
+        このフレームに予約されたSEを、優先度の高い順に再生する。1フレームに1回呼び出す。
+        """
+        if not self.pending_sounds:
+            return
+        names = sorted(self.pending_sounds, key=self._get_priority, reverse=True)
+        self.pending_sounds.clear()
+        if not self.enabled:
+            return
+
+        # 再生が終わった（または別のSEに置き換えられた）ボイスを取り除く
+        self.active_voices = [voice for voice in self.active_voices if voice[0].get_busy() and voice[0].get_sound() is voice[2]]
+        for name in names:
+            self._start_voice(name)
+
+    def _get_priority(self, name):
+        return config.SE_PRIORITIES.get(name, config.SE_DEFAULT_PRIORITY)
+
+    def _start_voice(self, name):
+        """
+        チャンネルを割り当ててSEを再生する。
+        同じSEが上限数鳴っていれば最も古いものを止めて鳴らし直し、
+        空きチャンネルがなければ、優先度が同じか低いSEのうち最も優先度が低く古いものを止めて使う。
+        """
+        sound = self._get_sound(name)
+        if sound is None:
+            return
+
+        reserved_channel = self.reserved_channels.get(name)
+        if reserved_channel is not None:
+            reserved_channel.play(sound)
+            return
+
+        same_voices = [voice for voice in self.active_voices if voice[1] == name]
+        if len(same_voices) >= config.SE_VOICE_LIMITS.get(name, config.SE_DEFAULT_VOICE_LIMIT):
+            victim = same_voices[0]
+        else:
+            victim = None
+            channel = pygame.mixer.find_channel()
+            if channel is None:
+                priority = self._get_priority(name)
+                candidates = [voice for voice in self.active_voices if self._get_priority(voice[1]) <= priority]
+                if not candidates:
+                    return # 優先度の高いSEでチャンネルが埋まっているので、このSEは鳴らさない
+                victim = min(candidates, key=lambda voice: self._get_priority(voice[1]))
+
+        if victim is not None:
+            channel = victim[0]
+            channel.stop()
+            self.active_voices.remove(victim)
+
+        channel.play(sound)
+        self.active_voices.append((channel, name, sound))
+
     def play_enemy_death_sound(self):
         """敵の死亡SEを再生する。"""
-        if self.enabled and self.enemy_death_sound:
-            self.enemy_death_sound.play()
+        self._play("enemy_death")
 
     def play_enemy_hit_sound(self):
         """敵ヒットSEを再生する。"""
-        if self.enabled and self.enemy_hit_sound:
-            self.enemy_hit_sound.play()
+        self._play("enemy_hit")
 
     def play_tower_damage_sound(self):
         """タワーのダメージSEを再生する。"""
-        if self.enabled and self.tower_damage_sound:
-            self.tower_damage_sound.play()
+        self._play("tower_damage")
 
     def play_heart_collect_sound(self):
         """ハート取得SEを再生する。"""
-        if self.enabled and self.heart_collect_sound:
-            self.heart_collect_sound.play()
+        self._play("heart_collect")
 
     def play_stage_start_sound(self):
         """ステージ開始SEを再生する。"""
-        if self.enabled and self.stage_start_sound:
-            self.stage_start_sound.play()
+        self._play("stage_start")
 
     def play_ui_click_sound(self):
         """UIクリックSEを再生する。"""
-        if self.enabled and self.ui_click_sound:
-            self.ui_click_sound.play()
+        self._play("ui_click")
 
     def play_item_spawn_sound(self):
         """アイテム出現SEを再生する。"""
-        if self.enabled and self.item_spawn_sound:
-            self.item_spawn_sound.play()
+        self._play("item_spawn")
 
     def play_speed_up_collect_sound(self):
         """スピードアップ取得SEを再生する。"""
-        if self.enabled and self.speed_up_collect_sound:
-            self.speed_up_collect_sound.play()
+        self._play("speed_up_collect")
 
     def play_size_up_collect_sound(self):
         """巨大化取得SEを再生する。"""
-        if self.enabled and self.size_up_collect_sound:
-            self.size_up_collect_sound.play()
+        self._play("size_up_collect")
 
     def play_gauge_max_sound(self):
         """ゲージ満タンSEを再生する。"""
-        if self.enabled and self.gauge_max_sound:
-            self.gauge_max_sound.play()
+        self._play("gauge_max")
 
     def reset_scale(self):
         """音階を最初（ド）に戻す。"""
@@ -259,4 +342,4 @@ class AudioManager:
             else:
                 self._play_music("normal")
         else: # TITLE, GAME_OVER, GAME_WONなどの状態
-            self.stop_music()
\ No newline at end of file
+            self.stop_music()
@@ -0,0 +1,322 @@
+"""
+ヘッドレスでゲームを大量に自動プレイし、ステージごとのバランス指標を集計するツール。
+SCORE_COMBO_TIER_BONUS や stat_multiplier の調整結果を、手動プレイなしで比較するために使う。
+
+使い方:
+    python balance_runner.py --runs 1000 --workers 8
+    python balance_runner.py --runs 200 --seed 42 --json result.json
+    python balance_runner.py --runs 200 --policy solver
+"""
+import argparse
+import contextlib
+import json
+import math
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# 画面と音声を持たない環境でも動くように、pygameのインポート前にダミードライバを指定する
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+import config
+import difficulty_config
+from entity_state import EntityState
+
+
+class SimulatedClock:
+    """
+    pygame.time.get_ticks() の代わりに使う仮想時計。
+    実時間を待たずにフレームを進めるため、1フレームごとに固定時間だけ進める。
+    """
+    def __init__(self):
+        self.now = 0.0
+
+    def get_ticks(self):
+        return int(self.now)
+
+    def advance(self, ms):
+        self.now += ms
+
+
+# ワーカープロセスごとに1つの仮想時計を持つ
+_clock = SimulatedClock()
+
+
+def _init_worker():
+    """ワーカープロセスの初期化。ゲーム内の時間参照を仮想時計に差し替える。"""
+    pygame.time.get_ticks = _clock.get_ticks
+
+
+class ScriptedAimPolicy:
+    """
+    簡易的な自動操作ポリシー。
+    最も近い敵（ボス戦ではアクティブな弱点）を狙い、候補の発射ベクトルの中から
+    予測軌道が目標の近くを通るものを選ぶ。人間らしさのために角度へ誤差を加える。
+    """
+    def __init__(self, rng, aim_noise_deg=5.0):
+        self.rng = rng
+        self.aim_noise_deg = aim_noise_deg
+
+    def _pick_target(self, game_logic_manager):
+        boss = game_logic_manager.current_boss
+        if boss and boss.state == EntityState.ALIVE:
+            for wp in boss.weak_points:
+                if wp.is_active:
+                    return pygame.math.Vector2(wp.rect.center)
+        alive = [enemy for enemy in game_logic_manager.entities.enemies if enemy.state != EntityState.DYING]
+        if not alive:
+            return None
+        nearest = min(alive, key=lambda enemy: enemy.rect.centerx)
+        return pygame.math.Vector2(nearest.rect.center)
+
+    def choose_launch_vector(self, game_logic_manager, slingshot_pos):
+        """
+        発射ベクトルを決める。狙う敵がいなければNoneを返す（発射を見送る）。
+        :return: 発射ベクトル (Vector2) またはNone
+        """
+        target = self._pick_target(game_logic_manager)
+        if target is None:
+            return None
+
+        best_vector = None
+        best_distance = math.inf
+        for angle_deg in range(-80, 41, 8): # 右上〜右下方向
+            for pull in (0.55, 0.8, 1.0):
+                direction = pygame.math.Vector2(1, 0).rotate(angle_deg)
+                vector = direction * config.MAX_PULL_DISTANCE * pull
+                distance = self._closest_approach(slingshot_pos - vector, vector, target)
+                if distance < best_distance:
+                    best_distance = distance
+                    best_vector = vector
+
+        if best_vector is not None and self.aim_noise_deg > 0:
+            best_vector = best_vector.rotate(self.rng.gauss(0, self.aim_noise_deg))
+        return best_vector
+
+    @staticmethod
+    def _closest_approach(start_pos, launch_vector, target, max_steps=240):
+        """重力のみを考慮した軌道が、目標に最も近づく距離を返す。"""
+        pos = start_pos.copy()
+        velocity = launch_vector * config.LAUNCH_POWER_MULTIPLIER
+        best = math.inf
+        for _ in range(max_steps):
+            velocity.y += config.GRAVITY
+            pos += velocity
+            best = min(best, pos.distance_squared_to(target))
+            if pos.y > config.GROUND_Y or not (0 <= pos.x <= config.SCREEN_WIDTH):
+                break
+        return math.sqrt(best)
+
+
+class SolverAimPolicy:
+    """
+    AimSolverで予測ダメージが最も大きい発射ベクトルを選ぶ自動操作ポリシー。
+    コンボ数で順位付けすると、敵を無視して塔や雲で跳ね続ける軌道が選ばれやすいため、ダメージを優先する。
+    ScriptedAimPolicyと同じく、角度へ誤差を加える。
+    同じシードで同じ結果になるよう、探索は時間ではなく候補フレーム数の予算で打ち切る。
+    既定の予算は、粗い探索と上位候補の細かい探索を最後まで行える量。
+    """
+    def __init__(self, rng, aim_noise_deg=5.0, frame_budget=20000):
+        from aim_solver import AimSolver
+        self.rng = rng
+        self.aim_noise_deg = aim_noise_deg
+        self.solver = AimSolver(time_budget_ms=None, frame_budget=frame_budget)
+
+    def choose_launch_vector(self, game_logic_manager, slingshot_pos):
+        if not game_logic_manager.entities.enemies:
+            return None
+        candidates = self.solver.solve(game_logic_manager, slingshot_pos, rank_by="damage", top_n=1)
+        if not candidates:
+            return None
+        vector = candidates[0].launch_vector
+        if self.aim_noise_deg > 0:
+            vector = vector.rotate(self.rng.gauss(0, self.aim_noise_deg))
+        return vector
+
+
+POLICIES = {
+    "scripted": ScriptedAimPolicy,
+    "solver": SolverAimPolicy,
+}
+
+
+def play_one_game(seed, max_sim_ms, shot_delay_ms, aim_noise_deg, policy_name="scripted"):
+    """
+    1ゲームを最後まで（または時間切れまで）ヘッドレスで自動プレイし、結果を返す。
+    :param seed: このゲームで使う乱数シード
+    :param max_sim_ms: シミュレーション上の制限時間 (ms)
+    :param shot_delay_ms: 弾が戻ってから次に発射するまでの待ち時間 (ms)
+    :param aim_noise_deg: 狙いに加える角度誤差の標準偏差 (度)
+    :param policy_name: 使用する自動操作ポリシーの名前 (POLICIESのキー)
+    :return: 結果の辞書
+    """
+    from game import Game # ワーカー内で仮想時計を設定した後にインポートする
+    from data_manager import DataManager
+    from run_history import RunHistory
+
+    _clock.now = 0.0
+    random.seed(seed)
+    policy = POLICIES[policy_name](random.Random(seed ^ 0x5EED), aim_noise_deg)
+    frame_ms = 1000.0 / config.FPS
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        game = Game()
+        # 自動プレイの結果でプレイヤーのセーブデータ（ハイスコアなど）を上書きしないようにする
+        game.data_manager = DataManager(filename=None)
+        game.run_history = RunHistory(filename=None)
+        game._reset_game(play_start_sound=False)
+        game.game_state = "PLAYING"
+        glm = game.game_logic_manager
+
+        stage_start_ms = _clock.now
+        stage_clear_ms = {}
+        last_stage_state = glm.stage_state
+        bird_idle_since = _clock.now
+        shots = 0
+
+        while _clock.now < max_sim_ms:
+            _clock.advance(frame_ms)
+
+            # 弾が止まっていて、待ち時間が過ぎたら次の弾を発射する
+            if glm.stage_state == "PLAYING" and not game.bird.is_flying:
+                if _clock.now - bird_idle_since >= shot_delay_ms:
+                    vector = policy.choose_launch_vector(glm, game.slingshot_pos)
+                    if vector is not None:
+                        game.bird.pos = game.slingshot_pos - vector
+                        game.bird.launch(vector)
+                        shots += 1
+            elif game.bird.is_flying:
+                bird_idle_since = _clock.now
+
+            pygame.event.pump()
+            game._update_state()
+
+            # ステージクリアの瞬間を検知して、クリアにかかった時間を記録する
+            if glm.stage_state != last_stage_state:
+                if glm.stage_state == "CLEARING":
+                    stage_clear_ms[glm.stage_manager.current_stage] = _clock.now - stage_start_ms
+                elif glm.stage_state == "PLAYING":
+                    stage_start_ms = _clock.now
+                last_stage_state = glm.stage_state
+
+            if glm.stage_state in ("GAME_OVER", "GAME_WON"):
+                break
+
+    if glm.stage_state in ("GAME_OVER", "GAME_WON"):
+        result = glm.stage_state
+    else:
+        result = "TIMEOUT"
+    return {
+        "seed": seed,
+        "result": result,
+        "score": glm.current_score,
+        "stage_reached": glm.stage_manager.current_stage,
+        "stage_clear_ms": stage_clear_ms,
+        "max_combo": glm.max_combo_count,
+        "tower_height": len(game.tower.blocks),
+        "shots": shots,
+        "duration_ms": _clock.now,
+    }
+
+
+def _percentile(values, ratio):
+    """ソート済みでない数値リストから、指定割合の分位点を返す（最近傍法）。"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(ratio * len(ordered)) - 1))
+    return ordered[index]
+
+
+def aggregate(results):
+    """各ゲームの結果を、全体とステージごとの指標に集計する。"""
+    total = len(results)
+    wins = sum(1 for r in results if r["result"] == "GAME_WON")
+    summary = {
+        "runs": total,
+        "win_rate": wins / total if total else 0.0,
+        "game_over_rate": sum(1 for r in results if r["result"] == "GAME_OVER") / total if total else 0.0,
+        "timeout_rate": sum(1 for r in results if r["result"] == "TIMEOUT") / total if total else 0.0,
+        "score_mean": statistics.fmean(r["score"] for r in results) if total else 0.0,
+        "max_combo_mean": statistics.fmean(r["max_combo"] for r in results) if total else 0.0,
+        "max_combo_best": max((r["max_combo"] for r in results), default=0),
+        "tower_height_mean": statistics.fmean(r["tower_height"] for r in results) if total else 0.0,
+        "stages": {},
+    }
+
+    for stage_number, settings in difficulty_config.STAGES.items():
+        reached = [r for r in results if r["stage_reached"] >= stage_number]
+        clear_times = [r["stage_clear_ms"][stage_number] for r in results if stage_number in r["stage_clear_ms"]]
+        stage_summary = {
+            "stage_name": settings.get("stage_name"),
+            "stat_multiplier": settings.get("stat_multiplier"),
+            "is_boss_stage": settings.get("is_boss_stage", False),
+            "reached": len(reached),
+            "cleared": len(clear_times),
+            "clear_rate": len(clear_times) / len(reached) if reached else 0.0,
+        }
+        if clear_times:
+            stage_summary["clear_ms_mean"] = statistics.fmean(clear_times)
+            stage_summary["clear_ms_median"] = statistics.median(clear_times)
+            stage_summary["clear_ms_p90"] = _percentile(clear_times, 0.9)
+        summary["stages"][stage_number] = stage_summary
+    return summary
+
+
+def print_report(summary, elapsed_sec):
+    """集計結果を表形式で表示する。"""
+    print(f"=== Balance report: {summary['runs']} runs in {elapsed_sec:.1f}s ===")
+    print(f"win rate: {summary['win_rate']:.1%}  game over: {summary['game_over_rate']:.1%}  timeout: {summary['timeout_rate']:.1%}")
+    print(f"score mean: {summary['score_mean']:.0f}  max combo mean/best: {summary['max_combo_mean']:.1f}/{summary['max_combo_best']}  tower height mean: {summary['tower_height_mean']:.2f}")
+    print(f"{'stage':>5} {'reached':>8} {'cleared':>8} {'rate':>7} {'mean(s)':>8} {'median(s)':>10} {'p90(s)':>8}  stat_multiplier")
+    for stage_number, stage in summary["stages"].items():
+        if "clear_ms_mean" in stage:
+            times = f"{stage['clear_ms_mean'] / 1000:>8.1f} {stage['clear_ms_median'] / 1000:>10.1f} {stage['clear_ms_p90'] / 1000:>8.1f}"
+        else:
+            times = f"{'-':>8} {'-':>10} {'-':>8}"
+        print(f"{stage_number:>5} {stage['reached']:>8} {stage['cleared']:>8} {stage['clear_rate']:>7.1%} {times}  {stage['stat_multiplier']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo balance runner for Babel's Tower Shooter.")
+    parser.add_argument("--runs", type=int, default=200, help="プレイするゲーム数")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="並列に動かすプロセス数")
+    parser.add_argument("--seed", type=int, default=0, help="最初のゲームのシード (以降は+1ずつ)")
+    parser.add_argument("--max-minutes", type=float, default=10.0, help="1ゲームあたりのシミュレーション上の制限時間 (分)")
+    parser.add_argument("--shot-delay", type=int, default=500, help="弾が戻ってから次に発射するまでの待ち時間 (ms)")
+    parser.add_argument("--aim-noise", type=float, default=5.0, help="狙いの角度誤差の標準偏差 (度)")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="scripted", help="自動操作ポリシー")
+    parser.add_argument("--json", help="集計結果と各ゲームの結果を書き出すJSONファイルのパス")
+    parser.add_argument("--config", help="設定値を上書きするJSONファイルのパス (例: {\"GRAVITY\": 0.45})")
+    args = parser.parse_args()
+
+    if args.config:
+        config.load_overrides_file(args.config)
+        # ワーカープロセスがconfigを読み込み直した場合にも同じ上書きが適用されるようにする
+        os.environ[config.CONFIG_OVERRIDES_ENV] = args.config
+
+    seeds = range(args.seed, args.seed + args.runs)
+    max_sim_ms = args.max_minutes * 60 * 1000
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker) as pool:
+        futures = [
+            pool.submit(play_one_game, seed, max_sim_ms, args.shot_delay, args.aim_noise, args.policy)
+            for seed in seeds
+        ]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - started
+
+    summary = aggregate(results)
+    print_report(summary, elapsed)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"summary": summary, "runs": results}, f, indent=2)
+        print(f"Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
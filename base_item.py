@@ -2,6 +2,7 @@ import pygame
 import math
 import config
 import random
+from entity_state import EntityState
 
 class BaseItem:
     """
@@ -9,6 +10,12 @@ class BaseItem:
     - 雲への追従、または空中での浮遊
     - バードとの衝突判定
     """
+    # サブクラスも自身で追加する属性を__slots__に列挙すること
+    __slots__ = (
+        "parent_cloud", "size", "pos", "state", "spawn_start_time", "current_scale",
+        "y_offset_from_center", "base_pos", "float_timer",
+    )
+
     def __init__(self, parent_cloud=None, position=None, size=40):
         """
         アイテムを初期化する。
@@ -21,7 +28,7 @@ class BaseItem:
         self.pos = pygame.math.Vector2(0, 0)
 
         # 出現アニメーション用の状態
-        self.state = "SPAWNING" # "SPAWNING", "IDLE"
+        self.state = EntityState.SPAWNING # SPAWNING, IDLE
         self.spawn_start_time = pygame.time.get_ticks()
         self.current_scale = 0.0 # 0.0 (見えない) から 1.0 (通常サイズ) へ
 
@@ -42,11 +49,11 @@ class BaseItem:
 
     def update(self):
         """アイテムの状態を更新する。"""
-        if self.state == "SPAWNING":
+        if self.state == EntityState.SPAWNING:
             elapsed_time = pygame.time.get_ticks() - self.spawn_start_time
             if elapsed_time >= config.ITEM_SPAWN_ANIMATION_DURATION:
                 self.current_scale = 1.0
-                self.state = "IDLE"
+                self.state = EntityState.IDLE
             else:
                 # 一気に大きくなってから元に戻るアニメーション
                 duration = config.ITEM_SPAWN_ANIMATION_DURATION
@@ -66,7 +73,7 @@ class BaseItem:
         if self.parent_cloud:
             self.pos.x = self.parent_cloud.center.x
             self.pos.y = self.parent_cloud.center.y + (self.y_offset_from_center * self.parent_cloud.current_scale)
-        elif self.state == "IDLE": # 空中浮遊は出現アニメーション完了後
+        elif self.state == EntityState.IDLE: # 空中浮遊は出現アニメーション完了後
             self.float_timer += config.CLOUD_FLOAT_SPEED
             float_offset = math.sin(self.float_timer) * config.CLOUD_FLOAT_AMPLITUDE
             self.pos.y = self.base_pos.y + float_offset
@@ -74,7 +81,7 @@ class BaseItem:
     def collide_with_bird(self, bird):
         """弾(bird)と衝突したか判定する（単純な円形衝突判定）。"""
         # 出現アニメーション中は衝突しない
-        if self.state != "IDLE":
+        if self.state != EntityState.IDLE:
             return False
         distance = self.pos.distance_to(bird.pos)
         return distance < (self.size * self.current_scale / 2 + bird.radius)
\ No newline at end of file
@@ -1,6 +1,10 @@
 import pygame
 import math
 import config
+from timer_scheduler import timer_scheduler
+from physics_utils import circle_rect_contact
+from quality_governor import quality_governor
+from sprite_cache import sprite_cache
 
 # --- Birdクラス（弾） ---
 class Bird:
@@ -8,6 +12,7 @@ class Bird:
     def __init__(self, x, y, radius):
         self.start_pos = pygame.math.Vector2(x, y)
         self.pos = pygame.math.Vector2(x, y)
+        self.prev_pos = pygame.math.Vector2(x, y) # 前フレームの位置（連続衝突判定用）
         self.original_radius = radius # 元の半径を保持
         self.radius = radius # 現在の半径
         self.color = config.YELLOW  # 弾の色
@@ -23,6 +28,7 @@ class Bird:
         self.angular_velocity = 0 # 回転の角速度 (度/フレーム)
         self.radius_before_boost = 0 # 巨大化前の半径を保存
         self.size_boost_end_time = 0 # 巨大化効果の終了時間
+        self.size_boost_timer = None # 巨大化効果を終了させるタイマー
         self._create_image() # 描画用のSurfaceを初期作成
 
     def _update_stats(self):
@@ -34,33 +40,49 @@ class Bird:
 
     def _create_image(self):
         """
-        現在の半径と状態に基づいて、ボールを描画したSurfaceを生成する。
-        このSurfaceは回転や拡縮の元となる。
+        現在の半径と状態に基づいて、ボールを描画したSurfaceを用意する。
+        このSurfaceは回転や拡縮の元となる。同じ半径の画像はキャッシュから再利用する。
         """
         if self.radius <= 0: return
+        self.original_image = self.get_image(self.radius)
 
-        surface_size = int(self.radius * 2 + 4)
-        self.original_image = pygame.Surface((surface_size, surface_size), pygame.SRCALPHA)
+    def get_image(self, radius):
+        """
+        指定した半径のボールの画像を返す。キャッシュになければ描画して登録する。
+        巨大化やリセットで半径が行き来しても、同じ半径の画像は描き直さない。
+        パワーアップで半径は様々な値を取るので、上限のあるsprite_cacheに入れ、使われなくなったものは捨てる。
+        :param radius: ボールの半径
+        :return: 描画済みのSurface (共有されるので、書き換えないこと)
+        """
+        surface_size = int(radius * 2 + 4)
+        # 見た目を変えないよう、大きさを刻みに丸めず、半径そのものを種類のキーに含める
+        return sprite_cache.get(("bird", radius, self.color), surface_size, surface_size, lambda width, height: self._draw_image(radius))
+
+    def _draw_image(self, radius):
+        """指定した半径で、ボールの本体と目をSurfaceに描画する。"""
+        surface_size = int(radius * 2 + 4)
+        image = pygame.Surface((surface_size, surface_size), pygame.SRCALPHA)
         center = pygame.math.Vector2(surface_size / 2, surface_size / 2)
 
         # 本体を描画
-        pygame.draw.circle(self.original_image, self.color, center, self.radius)
-        pygame.draw.circle(self.original_image, config.BLACK, center, self.radius, 2)
+        pygame.draw.circle(image, self.color, center, radius)
+        pygame.draw.circle(image, config.BLACK, center, radius, 2)
 
         # --- 目の描画 (Surfaceのローカル座標系で) ---
-        eye_radius = self.radius * config.BIRD_EYE_SIZE_SCALE
+        eye_radius = radius * config.BIRD_EYE_SIZE_SCALE
         pupil_radius = eye_radius * config.BIRD_PUPIL_SIZE_SCALE
-        eye_offset_x = self.radius * config.BIRD_EYE_OFFSET_X_SCALE
-        eye_offset_y = self.radius * config.BIRD_EYE_OFFSET_Y_SCALE
+        eye_offset_x = radius * config.BIRD_EYE_OFFSET_X_SCALE
+        eye_offset_y = radius * config.BIRD_EYE_OFFSET_Y_SCALE
         eye_center_pos = center + pygame.math.Vector2(eye_offset_x, eye_offset_y)
         pupil_pos = eye_center_pos.copy()
         max_offset = (eye_radius - pupil_radius) * config.BIRD_PUPIL_MAX_OFFSET_SCALE
         direction = pygame.math.Vector2(1, 0) # アイドル時の向きで固定
         pupil_pos += direction * max_offset
 
-        pygame.draw.circle(self.original_image, config.WHITE, eye_center_pos, eye_radius)
-        pygame.draw.circle(self.original_image, config.BLACK, pupil_pos, pupil_radius)
-        pygame.draw.circle(self.original_image, config.BLACK, eye_center_pos, eye_radius, config.BIRD_EYE_OUTLINE_WIDTH)
+        pygame.draw.circle(image, config.WHITE, eye_center_pos, eye_radius)
+        pygame.draw.circle(image, config.BLACK, pupil_pos, pupil_radius)
+        pygame.draw.circle(image, config.BLACK, eye_center_pos, eye_radius, config.BIRD_EYE_OUTLINE_WIDTH)
+        return image
 
     def update(self, gravity=config.GRAVITY):
         """弾の位置を更新する（物理演算）"""
@@ -68,16 +90,9 @@ class Bird:
             return
 
         self.velocity.y += gravity
+        self.prev_pos.update(self.pos)
         self.pos += self.velocity
 
-        # --- 巨大化効果のチェック ---
-        if self.size_boost_end_time > 0 and pygame.time.get_ticks() > self.size_boost_end_time:
-            print("巨大化効果が終了。")
-            self.radius = self.radius_before_boost
-            self.size_boost_end_time = 0
-            self._update_stats()
-            self._create_image()
-
         # --- 回転処理 (角速度ベース) ---
         is_on_ground = self.pos.y + self.radius >= config.GROUND_Y - 1
         if is_on_ground and abs(self.velocity.x) > 0.1:
@@ -96,7 +111,7 @@ class Bird:
         if not hasattr(self, 'original_image') or self.original_image is None:
             return
 
-        rotated_image = pygame.transform.rotozoom(self.original_image, self.angle, 1.0)
+        rotated_image = quality_governor.rotate(("bird", self.radius, self.color), self.original_image, self.angle)
         new_rect = rotated_image.get_rect(center=self.pos)
         screen.blit(rotated_image, new_rect)
 
@@ -104,6 +119,7 @@ class Bird:
         """弾を発射する"""
         self.is_flying = True
         self.velocity = launch_vector * config.LAUNCH_POWER_MULTIPLIER
+        self.prev_pos.update(self.pos)
         self.launch_time = pygame.time.get_ticks() # 発射時にタイマーを開始
         # 発射方向を記録（Y速度が負なら上向きに発射）
         self.launched_upwards = self.velocity.y < 0
@@ -119,9 +135,8 @@ class Bird:
 
     def apply_size_boost(self):
         """巨大化アイテムの効果を適用する。"""
-        # すでに巨大化している場合は効果時間を延長するだけ
+        # すでに巨大化している場合は、効果時間を今から測り直すだけ (残り時間には加算しない)
         if self.size_boost_end_time > 0:
-            self.size_boost_end_time += config.SIZE_BOOST_DURATION
             print("巨大化効果を延長！")
         else:
             # 巨大化前の半径を保存
@@ -132,10 +147,37 @@ class Bird:
             self._update_stats()
             self._create_image()
             print(f"巨大化！ 半径が {self.radius} に。")
-        
+
         # 効果終了時間をセット
         self.size_boost_end_time = pygame.time.get_ticks() + config.SIZE_BOOST_DURATION
 
+        # 効果終了のタイマーを (延長した場合は新しい終了時間で) 登録し直す
+        if self.size_boost_timer:
+            self.size_boost_timer.cancel()
+        self.size_boost_timer = timer_scheduler.schedule_at(self.size_boost_end_time, self._end_size_boost)
+
+    def _end_size_boost(self):
+        """巨大化効果の終了時間になったら、元の大きさに戻す。"""
+        print("巨大化効果が終了。")
+        self.radius = self.radius_before_boost
+        self.size_boost_end_time = 0
+        self.size_boost_timer = None
+        self._update_stats()
+        self._create_image()
+
+    def shift_clock(self, delay):
+        """
+        ゲームが一時停止していた間に時間が進まなかったことにするため、記録している時刻を後ろへずらす。
+        :param delay: 一時停止していた時間 (ms)
+        """
+        if self.launch_time is not None:
+            self.launch_time += delay
+        if self.low_velocity_start_time is not None:
+            self.low_velocity_start_time += delay
+        self.last_power_up_time += delay
+        if self.size_boost_end_time > 0:
+            self.size_boost_end_time += delay # 終了のタイマー自体はtimer_scheduler.shiftでずらす
+
     def power_up(self):
         """ボールをパワーアップして大きくする。クールダウンを考慮する。"""
         current_time = pygame.time.get_ticks()
@@ -165,40 +207,53 @@ class Bird:
             return True # HPが0以下になったことを通知
         return False
 
-    def bounce_off_cloud(self, collided_puff_info):
+    def _bounce(self, normal_x, normal_y, overlap, bounciness):
         """
-        雲に当たってバウンドする処理。
-        めり込みの解消と、不必要な連続衝突の防止も行う。
+        法線方向へ押し出し、速度を反射させる。位置と速度はその場で更新し、新しいVector2は作らない。
+        :param normal_x: 衝突面の法線 (単位ベクトル) のX成分
+        :param normal_y: 衝突面の法線 (単位ベクトル) のY成分
+        :param overlap: めり込み量
+        :param bounciness: 反発係数
+        :return: バウンドした場合はTrue、すでに離れようとしている場合はFalse
         """
-        cloud_puff_center, cloud_puff_radius = collided_puff_info
-
-        # 衝突点での法線ベクトルを計算（雲の円の中心 -> 弾の中心）
-        # normalize()で長さを1の単位ベクトルにする
-        normal = (self.pos - cloud_puff_center).normalize()
-
-        # --- 衝突方向のチェック ---
-        # 速度ベクトルと法線ベクトルの内積を計算し、オブジェクトが離れようとしている場合は処理しない
-        # (内積 > 0 は、速度ベクトルと法線ベクトルが同じような方向を向いている = 離れている)
-        if self.velocity.dot(normal) > 0:
-            return
+        velocity = self.velocity
+        # 速度ベクトルと法線ベクトルの内積が正なら、すでに離れようとしている（不要な連続衝突を防ぐ）
+        normal_speed = velocity.x * normal_x + velocity.y * normal_y
+        if normal_speed > 0:
+            return False
 
         # --- 回転の追加 ---
-        # 速度ベクトルの法線に垂直な成分（接線ベクトル）を計算
-        tangent = pygame.math.Vector2(-normal.y, normal.x)
-        # 接線方向の速度
-        tangential_speed = self.velocity.dot(tangent)
-        # 接線速度に応じて角速度を変化させる（時計回りが負の回転）
+        # 接線 (-normal_y, normal_x) 方向の速度からスピンを計算して角速度に加える（時計回りが負の回転）
+        tangential_speed = velocity.y * normal_x - velocity.x * normal_y
         self.angular_velocity -= tangential_speed * config.BIRD_COLLISION_SPIN_FACTOR
 
         # --- 位置の補正（めり込み解消） ---
-        # めり込み量を計算し、法線方向に押し出すことでめり込みを解消する
-        distance = self.pos.distance_to(cloud_puff_center)
-        overlap = (self.radius + cloud_puff_radius) - distance
-        self.pos += normal * overlap
+        self.pos.x += normal_x * overlap
+        self.pos.y += normal_y * overlap
 
         # --- 速度の反射 ---
-        reflected_velocity = self.velocity.reflect(normal)
-        self.velocity = reflected_velocity * config.CLOUD_BOUNCINESS
+        velocity.x = (velocity.x - 2 * normal_speed * normal_x) * bounciness
+        velocity.y = (velocity.y - 2 * normal_speed * normal_y) * bounciness
+        return True
+
+    def bounce_off_cloud(self, collided_puff_info):
+        """
+        雲に当たってバウンドする処理。
+        めり込みの解消と、不必要な連続衝突の防止も行う。
+        """
+        (puff_x, puff_y), puff_radius = collided_puff_info
+
+        # 衝突点での法線ベクトルを計算（雲の円の中心 -> 弾の中心）
+        offset_x = self.pos.x - puff_x
+        offset_y = self.pos.y - puff_y
+        distance = math.hypot(offset_x, offset_y)
+        if distance == 0:
+            normal_x, normal_y = 0.0, -1.0 # 中心が重なっている場合は上に押し出す
+        else:
+            normal_x, normal_y = offset_x / distance, offset_y / distance
+
+        overlap = (self.radius + puff_radius) - distance
+        self._bounce(normal_x, normal_y, overlap, config.CLOUD_BOUNCINESS)
 
     def collide_and_bounce_off_rect(self, rect_obj, bounciness):
         """
@@ -207,42 +262,25 @@ class Bird:
         :param bounciness: 反発係数
         :return: 衝突していればTrue、そうでなければFalse
         """
-        # ステップ1: 円の中心から最も近い四角形上の点を見つける
-        closest_x = max(rect_obj.rect.left, min(self.pos.x, rect_obj.rect.right))
-        closest_y = max(rect_obj.rect.top, min(self.pos.y, rect_obj.rect.bottom))
-        closest_point = pygame.math.Vector2(closest_x, closest_y)
-
-        # ステップ2: その点と円の中心との距離を計算し、衝突を判定
-        distance = self.pos.distance_to(closest_point)
-        if distance >= self.radius:
+        contact = circle_rect_contact(self.pos.x, self.pos.y, self.radius, rect_obj.rect)
+        if contact is None:
             return False # 衝突していない
+        normal_x, normal_y, overlap = contact
+        return self._bounce(normal_x, normal_y, overlap, bounciness)
 
-        # ステップ3: 衝突法線ベクトルを計算
-        if distance > 0.01:
-            normal = (self.pos - closest_point).normalize()
-        else: # めり込んでいる場合
-            normal = (self.pos - pygame.math.Vector2(rect_obj.rect.center)).normalize()
-
-        # ステップ4: 衝突方向のチェック（不要な連続衝突を防ぐ）
-        if self.velocity.dot(normal) > 0:
-            return False # すでに離れようとしている
-
-        # --- 回転の追加 ---
-        # 衝突時の接線速度からスピンを計算して角速度に加える
-        tangent = pygame.math.Vector2(-normal.y, normal.x)
-        tangential_speed = self.velocity.dot(tangent)
-        # 時計回りが負の回転になるように符号を調整
-        self.angular_velocity -= tangential_speed * config.BIRD_COLLISION_SPIN_FACTOR
-
-        # ステップ5: 位置の補正（めり込み解消）
-        overlap = self.radius - distance
-        self.pos += normal * overlap
-
-        # ステップ6: 速度の反射
-        reflected_velocity = self.velocity.reflect(normal)
-        self.velocity = reflected_velocity * bounciness
-
-        return True
+    def rewind_to_contact(self, toi):
+        """
+        このフレームの移動を、連続衝突判定で求めた接触時刻まで巻き戻す。
+        離散的な衝突判定が確実に反応するよう、わずかにめり込んだ位置に置く。
+        :param toi: 前フレームの位置から現在位置までの移動に対する接触時刻 (0.0 ~ 1.0)
+        :return: 巻き戻した後に残っている移動の割合 (0.0 ~ 1.0)
+        """
+        travel = self.pos - self.prev_pos
+        travel_length = travel.length()
+        if travel_length > 0:
+            toi = min(toi + config.BIRD_CCD_CONTACT_SKIN / travel_length, 1.0)
+        self.pos = self.prev_pos + travel * toi
+        return 1.0 - toi
 
     def is_clicked(self, mouse_pos):
         """マウスカーソルが弾の上にあるか判定する"""
@@ -273,6 +311,7 @@ class Bird:
             self.start_pos = new_start_pos.copy()
 
         self.pos = self.start_pos.copy()
+        self.prev_pos.update(self.pos)
         self.velocity = pygame.math.Vector2(0, 0)
         self.is_flying = False
         self.radius = self.original_radius # 半径を元に戻す
@@ -282,6 +321,9 @@ class Bird:
         self.launched_upwards = False # 発射方向フラグをリセット
         self.combo_count = 0 # コンボカウントをリセット
         self.size_boost_end_time = 0 # 巨大化効果もリセット
+        if self.size_boost_timer:
+            self.size_boost_timer.cancel()
+            self.size_boost_timer = None
         self.angle = 0 # 角度をリセット
         self.angular_velocity = 0 # 角速度をリセット
         self._create_image() # 画像を再生成
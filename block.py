@@ -1,11 +1,22 @@
 import pygame
 import config
+from entity_state import EntityState
+from quality_governor import quality_governor
 
 class Block:
     """塔を構成する四角いブロックを管理するクラス。HPと物理挙動を持つ。"""
+    __slots__ = (
+        "original_rect", "rect", "color", "death_effect_max_radius",
+        "hp", "max_hp", "state", "velocity", "is_falling",
+        "is_animating", "animation_start_time", "current_scale",
+        "death_animation_start_time", "death_effect_radius", "center_on_death",
+        "on_wake",
+    )
+
     def __init__(self, x, y, width, height):
         # スケール変更前の元の形状と位置を保持
-        self.original_rect = pygame.Rect(x, y, width, height) # 落下停止時の基準位置
+        self.original_rect = pygame.FRect(x, y, width, height) # 落下停止時の基準位置
+        self.death_effect_max_radius = (self.original_rect.width / 2) * config.BLOCK_DEATH_EFFECT_MAX_RADIUS_MULTIPLIER # 死亡エフェクトの最大半径
         # 描画と当たり判定に使うRectオブジェクト
         self.rect = self.original_rect.copy()
         self.color = config.WHITE
@@ -13,7 +24,7 @@ class Block:
         # --- ステータスと状態 ---
         self.hp = config.BLOCK_HP
         self.max_hp = config.BLOCK_HP
-        self.state = "ALIVE"  # "ALIVE", "DYING", "DESTROYED"
+        self.state = EntityState.ALIVE  # ALIVE, DYING, DESTROYED
 
         # --- 物理演算関連 ---
         self.velocity = pygame.math.Vector2(0, 0)
@@ -29,15 +40,28 @@ class Block:
         self.death_effect_radius = 0
         self.center_on_death = (0, 0)
 
+        # 静止状態から動き出した時に呼ばれるコールバック (Towerが設定する)
+        self.on_wake = None
+
+    def is_resting(self):
+        """落下もアニメーションもしていない、更新不要な状態か判定する。"""
+        return self.state == EntityState.ALIVE and not self.is_falling and not self.is_animating
+
+    def wake(self):
+        """静止状態から動き出したことを通知し、毎フレームの更新対象に戻してもらう。"""
+        if self.on_wake:
+            self.on_wake(self)
+
     def start_animation(self):
         """衝突アニメーションを開始する。"""
-        if not self.is_animating and self.state == "ALIVE":
+        if not self.is_animating and self.state == EntityState.ALIVE:
             self.is_animating = True
             self.animation_start_time = pygame.time.get_ticks()
+            self.wake()
 
     def update(self, blocks_below, ground_y):
         """ブロックの状態を更新する。落下やアニメーションを処理する。"""
-        if self.state == "ALIVE":
+        if self.state == EntityState.ALIVE:
             # --- 落下処理 ---
             if self.is_falling:
                 self.velocity.y += config.GRAVITY
@@ -74,19 +98,18 @@ class Block:
                 self.rect.height = self.original_rect.height * self.current_scale
                 self.rect.center = center
 
-        elif self.state == "DYING":
+        elif self.state == EntityState.DYING:
             # 死亡エフェクトのアニメーション
             elapsed_time = pygame.time.get_ticks() - self.death_animation_start_time
             if elapsed_time >= config.BLOCK_DEATH_EFFECT_DURATION:
-                self.state = "DESTROYED" # アニメーション完了
+                self.state = EntityState.DESTROYED # アニメーション完了
             else:
                 progress = elapsed_time / config.BLOCK_DEATH_EFFECT_DURATION
-                max_radius = (self.original_rect.width / 2) * config.BLOCK_DEATH_EFFECT_MAX_RADIUS_MULTIPLIER
-                self.death_effect_radius = max_radius * progress
+                self.death_effect_radius = self.death_effect_max_radius * progress
 
     def draw(self, screen):
         """ブロックを描画する"""
-        if self.state == "ALIVE":
+        if self.state == EntityState.ALIVE:
             # ブロック本体を描画
             pygame.draw.rect(screen, self.color, self.rect)
             # 見やすくするために黒い枠線を描画
@@ -98,13 +121,13 @@ class Block:
             window_height = self.rect.height * config.BLOCK_WINDOW_HEIGHT_RATIO
             
             # 窓のRectを作成 (ブロックの中心に配置)
-            window_rect = pygame.Rect(0, 0, window_width, window_height)
+            window_rect = pygame.FRect(0, 0, window_width, window_height)
             window_rect.center = self.rect.center
 
             # 窓と枠線を描画
             pygame.draw.rect(screen, config.BLOCK_WINDOW_COLOR, window_rect)
             pygame.draw.rect(screen, config.BLACK, window_rect, config.BLOCK_WINDOW_OUTLINE_WIDTH)
-        elif self.state == "DYING":
+        elif self.state == EntityState.DYING:
             # 死亡エフェクト（広がる半透明の円）を描画
             progress = (pygame.time.get_ticks() - self.death_animation_start_time) / config.BLOCK_DEATH_EFFECT_DURATION
             progress = min(progress, 1.0)
@@ -113,11 +136,16 @@ class Block:
             max_radius = int(self.death_effect_radius * 2)
             if max_radius <= 0: return
 
-            effect_surface = pygame.Surface((max_radius, max_radius), pygame.SRCALPHA)
-            effect_color = (*config.BLOCK_DEATH_EFFECT_COLOR, alpha)
-            
             current_radius = int(self.death_effect_radius)
             line_width = min(config.BLOCK_DEATH_EFFECT_LINE_WIDTH, current_radius)
+            if not quality_governor.death_ring_alpha:
+                # 軽量な画質では、崩れる円を不透明のまま画面に直接描く
+                if line_width > 0:
+                    pygame.draw.circle(screen, config.BLOCK_DEATH_EFFECT_COLOR, self.center_on_death, current_radius, line_width)
+                return
+
+            effect_surface = pygame.Surface((max_radius, max_radius), pygame.SRCALPHA)
+            effect_color = (*config.BLOCK_DEATH_EFFECT_COLOR, alpha)
             if line_width > 0:
                 pygame.draw.circle(effect_surface, effect_color, (current_radius, current_radius), current_radius, line_width)
 
@@ -126,7 +154,7 @@ class Block:
 
     def take_damage(self, amount):
         """ダメージを受けてHPを減らす。HPが0以下になったらTrueを返す。"""
-        if self.state != "ALIVE":
+        if self.state != EntityState.ALIVE:
             return False
         
         self.hp -= amount
@@ -138,17 +166,19 @@ class Block:
 
     def destroy(self):
         """ブロックを破壊し、死亡アニメーションを開始する。"""
-        if self.state == "ALIVE":
-            self.state = "DYING"
+        if self.state == EntityState.ALIVE:
+            self.state = EntityState.DYING
             self.death_animation_start_time = pygame.time.get_ticks()
             self.center_on_death = self.rect.center
+            self.wake()
 
     def start_falling(self):
         """ブロックの落下を開始する。"""
-        if not self.is_falling and self.state == "ALIVE":
+        if not self.is_falling and self.state == EntityState.ALIVE:
             self.is_falling = True
             # 落下開始時の基準位置を保存
             self.original_rect.topleft = self.rect.topleft
+            self.wake()
 
     def stop_falling(self):
         """ブロックの落下を停止する。"""
@@ -159,4 +189,4 @@ class Block:
 
     def is_finished(self):
         """ブロックが完全に消滅したか（リストから削除してよいか）を返す。"""
-        return self.state == "DESTROYED"
\ No newline at end of file
+        return self.state == EntityState.DESTROYED
\ No newline at end of file
@@ -4,12 +4,22 @@ import math
 import random
 from enemy import Enemy
 from weak_point import WeakPoint
+from sprite_cache import sprite_cache
+from timer_scheduler import timer_scheduler
+from entity_state import EntityState
 
 class BossEnemy(Enemy):
     """
     巨大な地上ボスを管理するクラス。
     基本的な移動や描画はEnemyクラスを継承する。
     """
+    sprite_kind = "boss"
+    entity_kind = "boss"
+    __slots__ = (
+        "base_speed", "persistent_scale", "halo_animation_timer",
+        "weak_points", "weak_point_switch_interval", "weak_point_switch_timer",
+    )
+
     def __init__(self, stat_multiplier):
         """
         ボス敵を初期化する。
@@ -39,7 +49,7 @@ class BossEnemy(Enemy):
         start_y = config.GROUND_Y - self.original_height
         # 浮動小数点座標とRectの両方を、ボス固有のサイズと位置で再設定する
         self.pos = pygame.math.Vector2(start_x, start_y)
-        self.rect = pygame.Rect(start_x, start_y, self.original_width, self.original_height)
+        self.rect = pygame.FRect(start_x, start_y, self.original_width, self.original_height)
 
         # --- 形態変化用の設定 ---
         self.persistent_scale = 1.0 # 永続的なスケール
@@ -63,14 +73,18 @@ class BossEnemy(Enemy):
         for pos in positions:
             self.weak_points.append(WeakPoint(self, pos))
 
-        # 弱点切り替えタイマー
+        # 弱点切り替えタイマー (一定時間ごとに_switch_weak_pointを呼ぶ)
         self.weak_point_switch_interval = config.WEAK_POINT_SWITCH_INTERVAL
-        self.weak_point_switch_timer = pygame.time.get_ticks()
+        self.weak_point_switch_timer = timer_scheduler.schedule(self.weak_point_switch_interval, self._on_weak_point_timer)
         
         # 最初にランダムな弱点をアクティブにする
         if self.weak_points:
             random.choice(self.weak_points).is_active = True
 
+        # 通常時の見た目を出現時に焼き込んでおく
+        self.get_sprite()
+        self._get_halo_sprite()
+
         print("巨大なボスが生成された！")
 
     def update(self, tower, ground):
@@ -99,19 +113,19 @@ class BossEnemy(Enemy):
         # 3. rectの位置を調整。X座標はsuper()で更新されたものを維持し、Y座標はアニメーション中の地面に接地させる
         self.rect.bottom = ground.rect.top
 
-        # 4. 浮動小数点座標(pos)のY成分のみ、地面に合わせたrectの位置を反映する。
-        #    X成分はsuper()で計算された小数部分を維持するため、変更しない。
+        # 4. 浮動小数点座標(pos)のY成分に、地面に合わせたrectの位置を反映する。
         self.pos.y = self.rect.y
 
         # 弱点の位置を更新
         for wp in self.weak_points:
             wp.update()
 
-        # 弱点の切り替えロジック
-        current_time = pygame.time.get_ticks()
-        if current_time - self.weak_point_switch_timer > self.weak_point_switch_interval:
-            print("時間経過により弱点の位置を変更します。")
-            self._switch_weak_point()
+    def _on_weak_point_timer(self):
+        """弱点切り替えタイマーが満了した時に呼ばれる。"""
+        if self.state != EntityState.ALIVE:
+            return
+        print("時間経過により弱点の位置を変更します。")
+        self._switch_weak_point()
 
     def _switch_weak_point(self):
         """弱点をランダムに切り替え、タイマーをリセットする。"""
@@ -123,24 +137,36 @@ class BossEnemy(Enemy):
                 if current_active_wp:
                     current_active_wp.is_active = False
                 new_active_wp.is_active = True
-        # 切り替えタイマーを現在時刻でリセット
-        self.weak_point_switch_timer = pygame.time.get_ticks()
+        # 切り替えタイマーを現在時刻からやり直す
+        self.weak_point_switch_timer.cancel()
+        self.weak_point_switch_timer = timer_scheduler.schedule(self.weak_point_switch_interval, self._on_weak_point_timer)
 
     def force_switch_weak_point(self):
         """外部から弱点を強制的に切り替える。"""
         print("弱点ヒット！位置を即座に変更します。")
         self._switch_weak_point()
 
+    def _build_halo_sprite(self, width, height):
+        """天使の輪（楕円の線）をSurfaceに描画する。"""
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        pygame.draw.ellipse(surface, config.BOSS_HALO_COLOR, surface.get_rect(), config.BOSS_HALO_LINE_WIDTH)
+        return surface
+
+    def _get_halo_sprite(self):
+        """ボスの現在の幅に対応する、焼き込み済みの天使の輪を返す。"""
+        halo_width = self.rect.width * config.BOSS_HALO_WIDTH_SCALE
+        halo_height = self.rect.width * config.BOSS_HALO_HEIGHT_SCALE
+        return sprite_cache.get("boss_halo", halo_width, halo_height, self._build_halo_sprite)
+
     def draw(self, screen):
         # 親クラスのdrawを呼び出して、ボス本体を描画
         super().draw(screen)
 
         # 生存中のみ天使の輪と弱点を描画
-        if self.state == "ALIVE":
+        if self.state == EntityState.ALIVE:
             # --- 天使の輪を描画 ---
-            # 輪の幅と高さを計算 (ボスの現在のサイズに追従)
-            halo_width = self.rect.width * config.BOSS_HALO_WIDTH_SCALE
-            halo_height = self.rect.width * config.BOSS_HALO_HEIGHT_SCALE
+            # 輪の大きさはボスの現在のサイズに追従する (焼き込み済みのものを使う)
+            halo_sprite = self._get_halo_sprite()
 
             # 輪のY座標を計算 (上下にふわふわ動く)
             float_offset = math.sin(self.halo_animation_timer) * config.BOSS_HALO_FLOAT_AMPLITUDE
@@ -149,22 +175,26 @@ class BossEnemy(Enemy):
             halo_center_x = self.rect.centerx
             halo_center_y = self.rect.top + config.BOSS_HALO_OFFSET_Y + float_offset
 
-            # 輪を描画するためのRectを作成
-            halo_rect = pygame.Rect(0, 0, halo_width, halo_height)
-            halo_rect.center = (halo_center_x, halo_center_y)
-
-            # 楕円を描画
-            pygame.draw.ellipse(screen, config.BOSS_HALO_COLOR, halo_rect, config.BOSS_HALO_LINE_WIDTH)
+            screen.blit(halo_sprite, halo_sprite.get_rect(center=(halo_center_x, round(halo_center_y))))
 
             # 弱点を描画
             for wp in self.weak_points:
                 wp.draw(screen)
 
+    def destroy(self):
+        """死亡アニメーションを開始し、弱点の切り替えタイマーを止める。"""
+        self.weak_point_switch_timer.cancel()
+        super().destroy()
+
+    def on_removed(self):
+        """登録を解除されたら、弱点の切り替えタイマーを止める。"""
+        self.weak_point_switch_timer.cancel()
+
     def take_damage(self, amount):
         """
         ダメージ処理をオーバーライドし、縮小機能を追加する。
         """
-        if self.state != "ALIVE":
+        if self.state != EntityState.ALIVE:
             return False
 
         # 1. 永続スケールを縮小（最小値でクランプ）
@@ -7,6 +7,12 @@ class Cloud:
     """
     複数の円を組み合わせて雲を表現し、描画するクラス。
     """
+    __slots__ = (
+        "center", "original_center_y", "original_puffs", "puffs",
+        "is_animating", "animation_start_time", "current_scale",
+        "float_animation_timer", "has_item",
+    )
+
     def __init__(self, center_x, center_y, num_puffs):
         """
         雲を初期化する。
@@ -58,10 +64,13 @@ class Cloud:
 
             self.puffs.append(((puff_center.x, puff_center.y), scaled_radius))
 
-    def update(self):
-        """雲のアニメーション状態（浮遊、衝突）を更新する。"""
+    def update(self, frames=1):
+        """
+        雲のアニメーション状態（浮遊、衝突）を更新する。
+        :param frames: 前回の更新から経過したフレーム数。更新を間引いた場合も浮遊の速さを保つ
+        """
         # --- 1. 浮遊アニメーション (常に実行) ---
-        self.float_animation_timer += config.CLOUD_FLOAT_SPEED
+        self.float_animation_timer += config.CLOUD_FLOAT_SPEED * frames
         float_offset = math.sin(self.float_animation_timer) * config.CLOUD_FLOAT_AMPLITUDE
         self.center.y = self.original_center_y + float_offset
 
@@ -2,6 +2,15 @@
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 FPS = 60
+# 表示する大きさの倍率（描画の解像度ではない）。1.0未満にすると、ウィンドウ（ブラウザのcanvas）をこの倍率の大きさで開き、
+# 論理解像度 (SCREEN_WIDTH x SCREEN_HEIGHT) で描いたシーンを毎フレーム1回だけ縮小して転送する。
+# 減るのは画面へ転送するピクセル数（倍率の2乗に比例）だけで、ゲーム内の描画の負荷は変わらず、縮小の分だけCPUの処理は増える。
+# canvasへの転送や拡大表示が遅い環境向けの設定
+PRESENT_SCALE = 1.0
+PRESENT_SMOOTH_SCALE = True # 縮小にsmoothscaleを使うか (Falseなら、より速いが粗いscaleを使う)
+IDLE_FPS = 15 # 入力も動くものもない間 (タイトル画面、リザルト画面) の描画のフレームレート
+IDLE_DELAY_MS = 1500 # 最後の入力や動きからこの時間が経ったら、IDLE_FPSに下げる (ミリ秒)
+HIDDEN_POLL_INTERVAL_MS = 250 # タブが非表示の間、再表示されたかを確認する間隔 (ミリ秒)
 DEBUG = True # デバッグモードのフラグ。リリース時にはFalseに設定
 
 # 色の定義
@@ -29,6 +38,7 @@ BGM_VOLUME = 0.2 # BGMの音量 (0.0 ~ 1.0)
 BGM_FADEOUT_MS = 500 # BGM切り替え時のフェードアウト時間 (ミリ秒)
 BGM_NORMAL_PATH = "assets/audio/bgm_normal.ogg" # 通常BGMのパス
 BGM_BOSS_PATH = "assets/audio/bgm_boss.ogg" # ボス戦BGMのパス
+BGM_PREFETCH_CHUNK_SIZE = 256 * 1024 # BGMを事前に読み込む時、1フレームに読むバイト数
 SE_VOLUME = 0.4 # SEの音量 (0.0 ~ 1.0)
 
 # コンボヒット音の設定
@@ -58,6 +68,32 @@ SE_SIZE_UP_COLLECT_PATH = "assets/audio/GiantUP.ogg" # 巨大化取得SE
 SE_ITEM_SPAWN_PATH = "assets/audio/item_spawn.ogg" # アイテム出現SE
 SE_UI_CLICK_PATH = "assets/audio/select.ogg" # UIクリックSE
 
+# SEのボイス管理
+SE_NUM_CHANNELS = 16 # ミキサーのチャンネル数
+SE_RESERVED_SOUNDS = ("gauge_max", "stage_start") # 専用チャンネルを確保し、他のSEに邪魔されないようにするSE
+SE_DEFAULT_VOICE_LIMIT = 2 # 同じSEを同時に鳴らせる数の既定値
+SE_VOICE_LIMITS = { # SEごとの同時発音数の上限
+    "combo_hit": 3,
+    "enemy_hit": 2,
+    "enemy_death": 2,
+    "ui_click": 1,
+}
+SE_DEFAULT_PRIORITY = 1 # SEの優先度の既定値（大きいほど優先）
+SE_PRIORITIES = { # チャンネルが足りない時、優先度の低いSEから止めて割り当てる
+    "tower_damage": 3,
+    "enemy_death": 2,
+    "heart_collect": 2,
+    "speed_up_collect": 2,
+    "size_up_collect": 2,
+    "item_spawn": 2,
+    "ui_click": 2,
+    "combo_hit": 0,
+}
+
+# セーブデータ設定
+SAVE_DEBOUNCE_MS = 1000 # 最後の変更からこの時間(ms)たってから、まとめてセーブデータを書き込む
+SAVE_STORAGE_KEY = "babel_tower_save_data" # Web版でセーブデータを保存するlocalStorageのキー
+
 # タイトル画面設定
 TITLE_ENEMY_SPAWN_INTERVAL = 8000 # にぎやかしの敵が出現する間隔 (ms)
 TITLE_ENEMY_MAX_COUNT = 20         # にぎやかしの敵の最大数
@@ -71,6 +107,8 @@ SLINGSHOT_OFFSET_Y = -20 # 塔のてっぺんからのオフセット（負の
 
 # ドラッグ操作の誤認識防止
 DRAG_RELEASE_DELAY = 100 # リリース後、この時間(ms)内に再プレスがなければ発射を確定する
+IMMEDIATE_LAUNCH = False # Trueなら、DRAG_RELEASE_DELAYを待たずにリリースしたフレームで発射する
+IMMEDIATE_LAUNCH_DEBOUNCE_MS = 80 # IMMEDIATE_LAUNCHの場合、押してからこの時間(ms)以内のリリースは誤タッチとみなして発射しない
 
 # スリングショットの支柱設定
 SLINGSHOT_POST_WIDTH = 10
@@ -91,6 +129,11 @@ ENABLE_SIDE_WALL_BOUNCE = True # Trueにすると画面の左右の壁でボー
 SIDE_WALL_BOUNCINESS = 0.8 # 画面端での反発係数
 SIDE_WALL_DAMAGE = 100 # 画面端の壁に衝突した際に受けるダメージ
 
+# 連続衝突判定 (高速な弾のすり抜け防止)
+BIRD_CCD_ENABLED = True # Trueにすると、1フレームの移動中に通過した雲・塔・敵との衝突も検出する
+BIRD_CCD_MAX_CONTACTS = 4 # 1フレーム内で順番に解決する接触の最大数
+BIRD_CCD_CONTACT_SKIN = 0.5 # 接触位置へ巻き戻す際にめり込ませる距離 (ピクセル)
+
 GROUND_COLLISION_SAFE_TIME = 500 # 発射後に地面との衝突判定が有効になるまでの時間 (ミリ秒)
 TOWER_COLLISION_SAFE_TIME = 500 # 発射後に塔との衝突判定が有効になるまでの時間 (ミリ秒)
 
@@ -276,6 +319,7 @@ STAGE_CLEAR_WAIT_TIME = 2500 # ステージクリア表示から次のステー
 # 敵の設定
 ENEMY_SPAWN_INTERVAL = 5000 # 敵が出現する間隔 (ミリ秒)
 FIRST_ENEMY_SPAWN_DELAY = 500 # 最初の敵が出現するまでの時間 (ミリ秒)
+SPAWN_TIMELINE_LOOKAHEAD = 32 # 出現予定を何体先まで事前に決めておくか
 ENEMY_SPAWN_OFFSET_X = 20 # 画面右端からどれだけ離れて出現するか
 ENEMY_MIN_SIZE = 40 # 敵の最小サイズ
 ENEMY_MAX_SIZE = 120 # 敵の最大サイズ
@@ -343,6 +387,10 @@ JUMPING_ENEMY_EYE_OFFSET_Y_SCALE = 0 # 敵の中心からのYオフセット比
 ENEMY_ANIMATION_DURATION = 300 # 敵が元の大きさに戻るまでの時間 (ミリ秒)
 ENEMY_ANIMATION_MIN_SCALE = 0.7 # 衝突時に縮む最小スケール
 
+# 敵のスプライトキャッシュ設定
+SPRITE_CACHE_SIZE_BUCKET = 4 # 焼き込むスプライトの大きさの刻み (px)。ひるみアニメーション中の縮小版もこの刻みで共有する
+SPRITE_CACHE_MAX_BYTES = 32 * 1024 * 1024 # キャッシュするスプライトの合計サイズの上限 (バイト)。超えたら古いものから捨てる
+
 # 敵の死亡エフェクト設定
 ENEMY_DEATH_EFFECT_DURATION = 200 # 死亡エフェクトの時間 (ミリ秒)
 ENEMY_DEATH_EFFECT_MAX_RADIUS_MULTIPLIER = 1.5 # 敵のサイズに対する最大半径の倍率
@@ -434,3 +482,187 @@ AIR_ITEM_SPAWN_X_MIN = 300
 AIR_ITEM_SPAWN_X_MAX = SCREEN_WIDTH - 100
 AIR_ITEM_SPAWN_Y_MIN = 200
 AIR_ITEM_SPAWN_Y_MAX = 500
+
+# ガベージコレクション (GC) の設定
+GC_POLICY_ENABLED = True # ゲームの場面に合わせてGCの実行タイミングを制御するか
+GC_DISABLE_DURING_PLAY = True # プレイ中は自動GCを止め、ステージクリア待機中などにまとめて実行するか
+GC_PLAYING_THRESHOLDS = (20000, 50, 100) # GC_DISABLE_DURING_PLAYがFalseの場合に、プレイ中に使うGCのしきい値 (世代0, 1, 2)
+GC_PLAYING_MAX_PENDING = 200000 # プレイ中に自動GCを止めていても、未回収の割り当てがこの数を超えたら世代0だけ回収する
+
+# 画質の自動調整 (品質ガバナー) の設定
+# 直近のフレームの処理時間を測り、予算 (1000 / FPS ミリ秒) を超え続けたら画質を一段下げ、
+# 十分な余裕が続いたら一段上げる
+QUALITY_GOVERNOR_ENABLED = True # フレーム時間に応じて画質を自動で切り替えるか
+QUALITY_FRAME_WINDOW = 60 # 平均をとる直近のフレーム数
+QUALITY_DOWNGRADE_RATIO = 1.1 # 平均処理時間が予算のこの倍率を超えたら画質を下げる
+QUALITY_UPGRADE_RATIO = 0.6 # 平均処理時間が予算のこの倍率を下回ったら画質を上げる
+QUALITY_INITIAL_LEVEL = 0 # 起動時の画質レベル (QUALITY_LEVELSの添字)
+# 画質レベルのプリセット。添字が大きいほど軽い
+#   particle_scale: パーティクルの数に掛ける倍率 (HIT_PARTICLE_COUNTなど。1個以上は必ず出す)
+#   trajectory_points: 軌道予測の点の数 (軌道の長さは変わらず、点の間隔が広がる)
+#   death_ring_alpha: 死亡エフェクトの円を半透明で描くか。Falseなら不透明の円を画面に直接描く
+#   rotation_cache_step: 0なら弾と飛行する敵を毎フレームrotozoomで回転させる。
+#                        0より大きければ角度をこの刻み (度) に丸め、スプライトキャッシュの回転済み画像を使う
+#   cloud_update_interval: 雲のアニメーションを何フレームに1回更新するか
+QUALITY_LEVELS = [
+    # 0: 高画質。本来の演出をすべて描く
+    {"name": "high", "particle_scale": 1.0, "trajectory_points": TRAJECTORY_NUM_POINTS, "death_ring_alpha": True, "rotation_cache_step": 0, "cloud_update_interval": 1},
+    # 1: 中画質。回転をキャッシュし、パーティクルを少し減らす
+    {"name": "medium", "particle_scale": 0.6, "trajectory_points": 8, "death_ring_alpha": True, "rotation_cache_step": 6, "cloud_update_interval": 1},
+    # 2: 低画質。半透明の死亡エフェクトをやめ、雲の更新を半分にする
+    {"name": "low", "particle_scale": 0.4, "trajectory_points": 6, "death_ring_alpha": False, "rotation_cache_step": 12, "cloud_update_interval": 2},
+    # 3: 最低画質。演出を最小限にして、ゲームの進行を優先する
+    {"name": "minimal", "particle_scale": 0.2, "trajectory_points": 5, "death_ring_alpha": False, "rotation_cache_step": 20, "cloud_update_interval": 4},
+]
+
+# ---------------------------------------------------------------------------
+# 設定の上書き・検証・凍結・派生値
+# 上の定数を読み込んだ後に一度だけ実行される。実験用に設定を上書きしたい場合は、
+# 環境変数 BABEL_CONFIG_OVERRIDES にJSONファイル（{"定数名": 値, ...}）のパスを指定するか、
+# load_overrides_file() / apply_overrides() を呼び出す。
+# ---------------------------------------------------------------------------
+import json as _json
+from itertools import accumulate as _accumulate
+import os as _os
+from types import MappingProxyType as _MappingProxyType
+
+CONFIG_OVERRIDES_ENV = "BABEL_CONFIG_OVERRIDES"
+COLOR_LERP_TABLE_STEPS = 64 # 色の線形補間テーブルの分割数
+
+def _freeze(value):
+    """リストをタプルに、辞書を読み取り専用の辞書に変換する（入れ子も含む）。"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (dict, _MappingProxyType)):
+        return _MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    return value
+
+def _is_color(value):
+    return (isinstance(value, tuple) and len(value) in (3, 4)
+            and all(isinstance(c, int) and 0 <= c <= 255 for c in value))
+
+def _build_lerp_table(start_color, end_color, steps=COLOR_LERP_TABLE_STEPS):
+    """開始色から終了色までを steps 等分した色のタプルを返す。"""
+    return tuple(
+        tuple(int(s + (e - s) * i / steps) for s, e in zip(start_color, end_color))
+        for i in range(steps + 1)
+    )
+
+def lerp_color(table, progress):
+    """
+    色の補間テーブルから、進行度に対応する色を返す。
+    :param table: _build_lerp_table で作った色のテーブル
+    :param progress: 進行度 (0.0 ~ 1.0)
+    """
+    index = int(progress * (len(table) - 1) + 0.5)
+    return table[0 if index < 0 else min(index, len(table) - 1)]
+
+def _validate():
+    """設定値の整合性を確認する。問題があればまとめてValueErrorを送出する。"""
+    errors = []
+    settings = globals()
+    for name, value in settings.items():
+        if name.isupper() and (name.endswith("_COLOR") or name.endswith("_COLOR_INACTIVE")) and not _is_color(value):
+            errors.append(f"{name} は (R, G, B) の色である必要があります: {value!r}")
+        if name.isupper() and "_COLORS" in name and not all(_is_color(c) for c in value):
+            errors.append(f"{name} は色のリストである必要があります: {value!r}")
+
+    def check(condition, message):
+        if not condition:
+            errors.append(message)
+
+    check(SCREEN_WIDTH > 0 and SCREEN_HEIGHT > 0, "SCREEN_WIDTH / SCREEN_HEIGHT は正の値である必要があります")
+    check(FPS > 0, "FPS は正の値である必要があります")
+    check(0 < PRESENT_SCALE <= 1, "PRESENT_SCALE は 0 より大きく 1.0 以下である必要があります")
+    check(0 < IDLE_FPS <= FPS, "IDLE_FPS は 0 より大きく FPS 以下である必要があります")
+    check(0 < MIN_PULL_DISTANCE_TO_LAUNCH < MAX_PULL_DISTANCE, "MIN_PULL_DISTANCE_TO_LAUNCH は 0 より大きく MAX_PULL_DISTANCE より小さい必要があります")
+    check(0 < BIRD_DEFAULT_RADIUS <= BIRD_MAX_RADIUS, "BIRD_DEFAULT_RADIUS は 0 より大きく BIRD_MAX_RADIUS 以下である必要があります")
+    check(CLOUD_MIN_COUNT <= CLOUD_MAX_COUNT, "CLOUD_MIN_COUNT は CLOUD_MAX_COUNT 以下である必要があります")
+    check(CLOUD_SPAWN_Y_MIN < CLOUD_SPAWN_Y_MAX, "CLOUD_SPAWN_Y_MIN は CLOUD_SPAWN_Y_MAX より小さい必要があります")
+    check(0 < GROUND_Y <= SCREEN_HEIGHT, "GROUND_Y は画面内にある必要があります")
+    check(all(isinstance(tier, int) and tier >= 2 for tier in SCORE_COMBO_TIER_BONUS), "SCORE_COMBO_TIER_BONUS のキーは 2 以上の整数である必要があります")
+    check(abs(sum(ITEM_SPAWN_CHANCES.values()) - 1.0) < 1e-6, "ITEM_SPAWN_CHANCES の確率の合計は 1.0 である必要があります")
+    check(isinstance(SPRITE_CACHE_SIZE_BUCKET, int) and SPRITE_CACHE_SIZE_BUCKET >= 1, "SPRITE_CACHE_SIZE_BUCKET は 1 以上の整数である必要があります")
+    check(len(GC_PLAYING_THRESHOLDS) == 3 and all(isinstance(t, int) and t >= 1 for t in GC_PLAYING_THRESHOLDS), "GC_PLAYING_THRESHOLDS は 1 以上の整数 3 つである必要があります")
+    check(BGM_PREFETCH_CHUNK_SIZE >= 1, "BGM_PREFETCH_CHUNK_SIZE は 1 以上である必要があります")
+    check(GC_PLAYING_MAX_PENDING >= 1, "GC_PLAYING_MAX_PENDING は 1 以上である必要があります")
+    check(QUALITY_FRAME_WINDOW >= 1, "QUALITY_FRAME_WINDOW は 1 以上である必要があります")
+    check(0 < QUALITY_UPGRADE_RATIO < QUALITY_DOWNGRADE_RATIO, "QUALITY_UPGRADE_RATIO は 0 より大きく QUALITY_DOWNGRADE_RATIO より小さい必要があります")
+    check(len(QUALITY_LEVELS) >= 1 and 0 <= QUALITY_INITIAL_LEVEL < len(QUALITY_LEVELS), "QUALITY_INITIAL_LEVEL は QUALITY_LEVELS の添字である必要があります")
+    for level in QUALITY_LEVELS:
+        check(0 < level["particle_scale"] <= 1, f"QUALITY_LEVELS の particle_scale は 0 より大きく 1 以下である必要があります: {level['name']}")
+        check(1 <= level["trajectory_points"] <= TRAJECTORY_NUM_POINTS * TRAJECTORY_POINT_GAP, f"QUALITY_LEVELS の trajectory_points は 1 以上 TRAJECTORY_NUM_POINTS * TRAJECTORY_POINT_GAP 以下である必要があります: {level['name']}")
+        check(level["rotation_cache_step"] >= 0, f"QUALITY_LEVELS の rotation_cache_step は 0 以上である必要があります: {level['name']}")
+        check(isinstance(level["cloud_update_interval"], int) and level["cloud_update_interval"] >= 1, f"QUALITY_LEVELS の cloud_update_interval は 1 以上の整数である必要があります: {level['name']}")
+    if errors:
+        raise ValueError("設定値が不正です:\n  " + "\n  ".join(errors))
+
+def _derive():
+    """よく使う計算結果を事前に求めておく。設定を上書きした場合も再計算される。"""
+    settings = globals()
+    # スコア計算用: 段階ボーナスを、しきい値の大きい順に並べたもの
+    settings["SCORE_COMBO_TIERS_DESC"] = tuple(sorted(SCORE_COMBO_TIER_BONUS.items(), reverse=True))
+    # 距離の比較を平方根なしで行うための2乗値
+    settings["MAX_PULL_DISTANCE_SQUARED"] = MAX_PULL_DISTANCE ** 2
+    settings["CLOUD_MIN_DISTANCE_FROM_TOWER_SQUARED"] = CLOUD_MIN_DISTANCE_FROM_TOWER ** 2
+    # アイテム抽選用の種類と重み
+    settings["ITEM_SPAWN_TYPES"] = tuple(ITEM_SPAWN_CHANCES.keys())
+    settings["ITEM_SPAWN_CUM_WEIGHTS"] = tuple(_accumulate(ITEM_SPAWN_CHANCES.values())) # random.choices の cum_weights 用
+    # 色の補間テーブル
+    settings["COMBO_COLOR_TABLE"] = _build_lerp_table(COMBO_START_COLOR, COMBO_END_COLOR)
+    settings["COMBO_GAUGE_FLASH_COLOR_TABLE"] = _build_lerp_table(COMBO_GAUGE_COLOR, COMBO_GAUGE_FLASH_COLOR)
+
+def _finalize():
+    """設定値を凍結・検証し、派生値を計算する。"""
+    settings = globals()
+    for name, value in list(settings.items()):
+        if name.isupper() and isinstance(value, (list, dict)):
+            settings[name] = _freeze(value)
+    _validate()
+    _derive()
+
+def apply_overrides(overrides):
+    """
+    設定値を上書きして、検証と派生値の計算をやり直す。
+    存在しない定数名や型の合わない値、検証に通らない値はValueErrorになり、設定は変更されない。
+    :param overrides: {"定数名": 値, ...}
+    """
+    settings = globals()
+    converted = {}
+    for name, value in overrides.items():
+        if not name.isupper() or name not in settings:
+            raise ValueError(f"存在しない設定値は上書きできません: {name}")
+        current = settings[name]
+        if isinstance(current, tuple) and isinstance(value, list):
+            value = tuple(value) # JSONの配列はタプルとして扱う
+        if isinstance(current, _MappingProxyType) and isinstance(value, dict) and current and all(isinstance(key, int) for key in current):
+            value = {int(key): item for key, item in value.items()} # JSONのキーは文字列なので整数に戻す
+        if isinstance(current, bool):
+            if not isinstance(value, bool):
+                raise ValueError(f"{name} には true / false を指定してください: {value!r}")
+        elif isinstance(current, (int, float)):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"{name} には数値を指定してください: {value!r}")
+        converted[name] = value
+
+    previous = {name: settings[name] for name in converted}
+    settings.update(converted)
+    try:
+        _finalize()
+    except ValueError:
+        settings.update(previous) # 検証に通らなかった上書きは取り消す
+        _finalize()
+        raise
+    print(f"設定を上書きしました: {', '.join(converted)}")
+
+def load_overrides_file(path):
+    """
+    JSONファイルから設定の上書きを読み込んで適用する。
+    :param path: {"定数名": 値, ...} 形式のJSONファイルのパス
+    """
+    with open(path, "r") as f:
+        apply_overrides(_json.load(f))
+
+_finalize()
+if _os.environ.get(CONFIG_OVERRIDES_ENV):
+    load_overrides_file(_os.environ[CONFIG_OVERRIDES_ENV])
@@ -1,9 +1,131 @@
 import json
 import os
-from typing import Dict, Any
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, Any, Optional
+import config
+
+
+class _FileBackend:
+    """Reads and atomically writes save data as a local file."""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+
+    def read(self) -> Optional[str]:
+        """Returns the stored text, or None if nothing has been saved yet."""
+        if not os.path.exists(self.filename):
+            return None
+        with open(self.filename, 'r') as f:
+            return f.read()
+
+    def write(self, text: str) -> None:
+        """Writes to a temporary file and renames it over the save file.
+
+        The rename is atomic, so a crash mid-write leaves the previous save intact.
+        """
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        fd, temp_path = tempfile.mkstemp(prefix=".save_", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.filename)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def describe(self) -> str:
+        return f"'{self.filename}'"
+
+
+class _BrowserStorageBackend:
+    """Stores save data in the browser's localStorage (pygbag/emscripten builds)."""
+
+    def __init__(self, key: str):
+        import platform as browser_platform # pygbag replaces this module with one exposing `window`
+        self.storage = browser_platform.window.localStorage
+        self.key = key
+
+    def read(self) -> Optional[str]:
+        return self.storage.getItem(self.key)
+
+    def write(self, text: str) -> None:
+        # A single setItem call replaces the value atomically
+        self.storage.setItem(self.key, text)
+
+    def describe(self) -> str:
+        return f"localStorage['{self.key}']"
+
+
+class _MemoryBackend:
+    """Keeps save data in memory only. Used when no filename is given (e.g. headless tools)."""
+
+    def __init__(self):
+        self.text: Optional[str] = None
+
+    def read(self) -> Optional[str]:
+        return self.text
+
+    def write(self, text: str) -> None:
+        self.text = text
+
+    def describe(self) -> str:
+        return "memory"
+
+
+class _BackgroundWriter:
+    """Writes save data on a worker thread, always keeping only the latest payload."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.condition = threading.Condition()
+        self.pending_text: Optional[str] = None
+        self.is_writing = False
+        self.thread = threading.Thread(target=self._run, name="SaveDataWriter", daemon=True)
+        self.thread.start()
+
+    def submit(self, text: str) -> None:
+        with self.condition:
+            self.pending_text = text # An unwritten older payload is simply replaced
+            self.condition.notify_all()
+
+    def wait_until_idle(self) -> None:
+        with self.condition:
+            while self.pending_text is not None or self.is_writing:
+                self.condition.wait()
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                while self.pending_text is None:
+                    self.condition.wait()
+                text, self.pending_text = self.pending_text, None
+                self.is_writing = True
+            try:
+                self.backend.write(text)
+                print(f"Data successfully saved to {self.backend.describe()}.")
+            except (IOError, OSError) as e:
+                print(f"Failed to save data to {self.backend.describe()}: {e}")
+            finally:
+                with self.condition:
+                    self.is_writing = False
+                    self.condition.notify_all()
+
 
 class DataManager:
-    """Manages reading and writing game save data (e.g., high score, best combo)."""
+    """Manages reading and writing game save data (e.g., high score, best combo).
+
+    Saves are debounced: save_data() only records the changes, and update() writes them
+    once no further changes have arrived for SAVE_DEBOUNCE_MS. On desktop the write runs
+    on a background thread. In the browser the data goes to localStorage instead of a file
+    and is written immediately: setItem is synchronous and cheap, and pygbag gives no chance
+    to flush pending changes when the page is closed.
+    """
     DEFAULT_DATA: Dict[str, Any] = {
         "high_score": 0,
         "best_combo": 0,
@@ -11,42 +133,81 @@ class DataManager:
         "sound_enabled": True
     }
 
-    def __init__(self, filename: str = "save_data.json"):
+    def __init__(self, filename: Optional[str] = "save_data.json", debounce_ms: int = config.SAVE_DEBOUNCE_MS):
         """Initializes the DataManager.
 
-        :param filename: The name of the save data file.
+        :param filename: The name of the save data file. If None, data is kept in memory only.
+        :param debounce_ms: How long to wait after the last change before writing.
         """
         self.filename = filename
-        
+        self.debounce_ms = debounce_ms
+        if filename is None:
+            self.backend = _MemoryBackend()
+        elif sys.platform == "emscripten":
+            self.backend = _BrowserStorageBackend(config.SAVE_STORAGE_KEY)
+        else:
+            self.backend = _FileBackend(filename)
+        # Threads are not available in the browser build, so write synchronously there
+        self.writer = _BackgroundWriter(self.backend) if isinstance(self.backend, _FileBackend) else None
+        self.data: Dict[str, Any] = self.DEFAULT_DATA.copy()
+        self.dirty_since: Optional[float] = None # When unsaved changes were last made (monotonic seconds)
+
     def load_data(self) -> Dict[str, Any]:
-        """Loads save data from a file.
-        Returns default data if the file doesn't exist or is corrupt.
+        """Loads save data from the backend.
+        Returns default data if nothing has been saved or the data is corrupt.
         :return: A dictionary containing the save data.
         """
-        if not os.path.exists(self.filename):
-            print(f"Save file '{self.filename}' not found. Creating initial data.")
-            return self.DEFAULT_DATA.copy()
-
+        location = self.backend.describe()
         try:
-            with open(self.filename, 'r') as f:
-                data = json.load(f)
-                # 読み込んだデータにデフォルト値をマージして、キーの欠損に対応する
-                loaded_data = self.DEFAULT_DATA.copy()
-                loaded_data.update(data)
-                print(f"Successfully loaded save file '{self.filename}'.")
-                return loaded_data
+            text = self.backend.read()
+            if text is None:
+                print(f"Save data {location} not found. Creating initial data.")
+                return self.DEFAULT_DATA.copy()
+            data = json.loads(text)
+            # 読み込んだデータにデフォルト値をマージして、キーの欠損に対応する
+            loaded_data = self.DEFAULT_DATA.copy()
+            loaded_data.update(data)
+            self.data = loaded_data.copy()
+            print(f"Successfully loaded save data {location}.")
+            return loaded_data
         except (json.JSONDecodeError, IOError) as e:
-            print(f"Failed to load save file '{self.filename}': {e}. Creating initial data.")
+            print(f"Failed to load save data {location}: {e}. Creating initial data.")
             return self.DEFAULT_DATA.copy()
 
     def save_data(self, data: Dict[str, Any]) -> None:
-        """Saves the given data to the file.
+        """Records the given data to be saved. The actual write happens in update() or flush().
 
+        Keys not included in data keep their previously saved values.
         :param data: The dictionary of data to save.
         """
+        self.data.update(data)
+        self.dirty_since = time.monotonic()
+        if isinstance(self.backend, _BrowserStorageBackend):
+            self._commit() # The tab may be closed before the debounce interval passes
+
+    def update(self) -> None:
+        """Writes pending changes once the debounce interval has passed. Call once per frame."""
+        if self.dirty_since is None:
+            return
+        if (time.monotonic() - self.dirty_since) * 1000 >= self.debounce_ms:
+            self._commit()
+
+    def flush(self) -> None:
+        """Writes any pending changes immediately and waits for the write to finish."""
+        if self.dirty_since is not None:
+            self._commit()
+        if self.writer:
+            self.writer.wait_until_idle()
+
+    def _commit(self) -> None:
+        """Serializes the current data and hands it to the backend."""
+        self.dirty_since = None
+        text = json.dumps(self.data, indent=4)
+        if self.writer:
+            self.writer.submit(text)
+            return
         try:
-            with open(self.filename, 'w') as f:
-                json.dump(data, f, indent=4)
-            print(f"Data successfully saved to '{self.filename}'.")
-        except IOError as e:
-            print(f"Failed to save data to '{self.filename}': {e}")
\ No newline at end of file
+            self.backend.write(text)
+            print(f"Data successfully saved to {self.backend.describe()}.")
+        except (IOError, OSError) as e:
+            print(f"Failed to save data to {self.backend.describe()}: {e}")
@@ -15,10 +15,11 @@ class EndScreen:
         button_width, button_height = 240, 60
         self.restart_button_rect = pygame.Rect(0, 0, button_width, button_height)
 
-    def draw(self, stage_state, score=0, high_score=0, max_combo=0, best_combo=0, tower_height=0, tower_bonus=0, best_tower_height=0, mouse_pos=(0,0)):
+    def draw(self, stage_state, score=0, high_score=0, max_combo=0, best_combo=0, tower_height=0, tower_bonus=0, best_tower_height=0, mouse_pos=(0,0), run_rank=None):
         """
         ステージクリアまたはゲームオーバーの画面を描画する。
         :param stage_state: 現在のステージの状態 ("CLEARING", "GAME_OVER", "GAME_WON")
+        :param run_rank: プレイ履歴の中での順位 {"rank", "total", "percentile"}。Noneなら表示しない
         """
         if stage_state == "CLEARING": # ステージクリア時はメッセージのみ
             draw_text(
@@ -58,6 +59,14 @@ class EndScreen:
                 (config.SCREEN_WIDTH / 2, current_y),
                 config.BLACK, config.UI_COUNTER_OUTLINE_WIDTH
             )
+            # 歴代の順位
+            if run_rank:
+                draw_text(
+                    self.screen,
+                    f"#{run_rank['rank']} / {run_rank['total']} (TOP {run_rank['percentile']:.1f}%)", self.result_font, config.WHITE,
+                    (config.SCREEN_WIDTH / 2 + 300, current_y),
+                    config.BLACK, config.UI_COUNTER_OUTLINE_WIDTH
+                )
             current_y += line_height
 
             # ハイスコア
@@ -1,14 +1,35 @@
 import pygame
 import random
 import config
+from sprite_cache import sprite_cache
+from entity_state import EntityState
+from quality_governor import quality_governor
 
 class Enemy:
     """地上を歩く敵を管理するクラス"""
-    def __init__(self, stat_multiplier):
+    sprite_kind = "enemy" # スプライトキャッシュ上の種類名。見た目が違うサブクラスでは上書きする
+    entity_kind = "ground" # EntityRegistry上の種類名
+    # 1ウェーブで大量に出現するため、属性を__slots__で固定してインスタンスごとの辞書を持たせない
+    # (サブクラスも自身で追加する属性を__slots__に列挙すること)
+    __slots__ = (
+        "original_width", "original_height", "death_effect_max_radius",
+        "hp", "max_hp", "speed", "attack_power",
+        "pos", "rect", "color", "draw_eyes", "velocity",
+        "is_animating", "animation_start_time", "current_scale",
+        "state", "death_animation_start_time", "death_effect_radius",
+    )
+
+    def __init__(self, stat_multiplier, size=None):
+        """
+        :param stat_multiplier: ステータス補正値の辞書
+        :param size: 敵の大きさ。省略時はランダムに決める
+        """
         # --- 大きさとステータスの決定 ---
         # ランダムなサイズを決定（正方形とする）
-        size = random.uniform(config.ENEMY_MIN_SIZE, config.ENEMY_MAX_SIZE)
+        if size is None:
+            size = random.uniform(config.ENEMY_MIN_SIZE, config.ENEMY_MAX_SIZE)
         self.original_width = size  # アニメーション用に元のサイズを保持
+        self.death_effect_max_radius = (size / 2) * config.ENEMY_DEATH_EFFECT_MAX_RADIUS_MULTIPLIER # 死亡エフェクトの最大半径 (毎フレーム計算しないよう保持)
         self.original_height = size
 
         # 大きさとステージ補正に基づいてステータスを計算
@@ -25,8 +46,8 @@ class Enemy:
         start_y = config.GROUND_Y - self.original_height
         # 浮動小数点数で座標を管理するためのVector2
         self.pos = pygame.math.Vector2(start_x, start_y)
-        # 描画と当たり判定用のRect
-        self.rect = pygame.Rect(round(self.pos.x), round(self.pos.y), self.original_width, self.original_height)
+        # 描画と当たり判定用のFRect (posと同じく浮動小数点で持つので、丸めによるずれが出ない)
+        self.rect = pygame.FRect(self.pos.x, self.pos.y, self.original_width, self.original_height)
         self.color = config.RED
         self.draw_eyes = True # 目を描画するかのフラグ
 
@@ -38,22 +59,69 @@ class Enemy:
         self.animation_start_time = 0
         self.current_scale = 1.0
 
-        # 状態管理 ("ALIVE", "DYING")
-        self.state = "ALIVE"
+        # 状態管理 (ALIVE, DYING)
+        self.state = EntityState.ALIVE
         # 死亡エフェクト用の属性
         self.death_animation_start_time = 0
         self.death_effect_radius = 0
 
+        # 通常時の見た目を出現時に焼き込んでおく
+        # (見た目を上書きするサブクラスは、自身の初期化の最後に焼き込む)
+        if type(self) is Enemy:
+            self.get_sprite()
+
+    def _build_sprite(self, width, height):
+        """
+        指定した大きさで、敵の見た目（本体、枠線、目）をSurfaceに描画する。
+        :return: 描画したSurface
+        """
+        surface = pygame.Surface((width, height))
+        rect = surface.get_rect()
+        # 本体
+        surface.fill(self.color)
+        # 枠線
+        pygame.draw.rect(surface, config.BLACK, rect, 2)
+
+        # --- 目の描画処理 ---
+        if self.draw_eyes:
+            # 1. 目の大きさを計算
+            eye_radius = width * config.GROUND_ENEMY_EYE_SIZE_SCALE
+            pupil_radius = eye_radius * config.ENEMY_EYE_PUPIL_SCALE
+
+            # 2. 目の位置を計算
+            offset_x = width * config.GROUND_ENEMY_EYE_OFFSET_X_SCALE
+            offset_y = height * config.GROUND_ENEMY_EYE_OFFSET_Y_SCALE
+            eye_center = (rect.centerx + offset_x, rect.centery + offset_y)
+
+            # 3. 描画
+            pygame.draw.circle(surface, config.ENEMY_EYE_WHITE_COLOR, eye_center, eye_radius)
+            pygame.draw.circle(surface, config.ENEMY_EYE_PUPIL_COLOR, eye_center, pupil_radius)
+            pygame.draw.circle(surface, config.BLACK, eye_center, eye_radius, config.ENEMY_EYE_OUTLINE_WIDTH)
+        return surface
+
+    def get_sprite(self):
+        """現在の大きさ（ひるみによる縮小も含む）に対応する、焼き込み済みのスプライトを返す。"""
+        kind = (self.sprite_kind, self.color, self.draw_eyes)
+        return sprite_cache.get(kind, self.rect.width, self.rect.height, self._build_sprite)
+
     def start_animation(self):
         """衝突アニメーションを開始する。"""
-        if not self.is_animating and self.state == "ALIVE":
+        if not self.is_animating and self.state == EntityState.ALIVE:
             self.is_animating = True
             self.animation_start_time = pygame.time.get_ticks()
 
     def update(self, tower, ground):
         """敵の位置を更新する。ノックバックと通常移動、地面の動きへの追従を管理する。"""
+        # --- 歩いているだけの場合 (ひるみもノックバックもない) は、移動と接地だけを行う ---
+        if self.state == EntityState.ALIVE and not self.is_animating and self.velocity.x == 0 and self.velocity.y == 0:
+            self.pos.x -= self.speed
+            self.rect.x = self.pos.x
+            self.rect.bottom = ground.rect.top
+            self.pos.y = self.rect.y
+            return
+
         # --- 状態に応じた更新処理 ---
-        if self.state == "ALIVE":
+        if self.state == EntityState.ALIVE:
             # 衝突アニメーション処理
             if self.is_animating:
                 elapsed_time = pygame.time.get_ticks() - self.animation_start_time
@@ -70,12 +138,11 @@ class Enemy:
             self.rect.height = self.original_height * self.current_scale
             self.rect.center = center
 
-        elif self.state == "DYING":
+        elif self.state == EntityState.DYING:
             # 死亡エフェクトのアニメーション
             elapsed_time = pygame.time.get_ticks() - self.death_animation_start_time
             progress = min(elapsed_time / config.ENEMY_DEATH_EFFECT_DURATION, 1.0)
-            max_radius = (self.original_width / 2) * config.ENEMY_DEATH_EFFECT_MAX_RADIUS_MULTIPLIER
-            self.death_effect_radius = max_radius * progress
+            self.death_effect_radius = self.death_effect_max_radius * progress
 
         # --- 共通の物理演算処理 (生存中も死亡中も適用) ---
         # length_squared()は平方根を計算しないため、length()より高速
@@ -93,46 +160,29 @@ class Enemy:
 
                 if abs(self.velocity.y) < 1:
                     self.velocity.y = 0
-        elif self.state == "ALIVE":
+        elif self.state == EntityState.ALIVE:
             # ノックバックの速度がほぼ無くなったら、通常の移動に戻る
             self.velocity.x = 0
             self.velocity.y = 0
             self.pos.x -= self.speed # 浮動小数点座標を更新
 
-        # 最後に、浮動小数点座標を整数のRectに反映させる
-        self.rect.topleft = (round(self.pos.x), round(self.pos.y))
+        # 最後に、浮動小数点座標をFRectに反映させる
+        self.rect.topleft = self.pos
 
         # 地面がアニメーションで動いた場合に追従させる
         # ノックバック中でない場合、常に地面に接地させる
-        if self.velocity.length_squared() <= 0.1 and self.state == "ALIVE":
+        if self.velocity.length_squared() <= 0.1 and self.state == EntityState.ALIVE:
             self.rect.bottom = ground.rect.top
             self.pos.y = self.rect.y
 
     def draw(self, screen):
         """敵を描画する"""
-        if self.state == "ALIVE":
-            # 本体
-            pygame.draw.rect(screen, self.color, self.rect)
-            # 枠線
-            pygame.draw.rect(screen, config.BLACK, self.rect, 2)
-
-            # --- 目の描画処理 ---
-            if self.draw_eyes:
-                # 1. 目の大きさを計算
-                eye_radius = self.rect.width * config.GROUND_ENEMY_EYE_SIZE_SCALE
-                pupil_radius = eye_radius * config.ENEMY_EYE_PUPIL_SCALE
-
-                # 2. 目の位置を計算
-                offset_x = self.rect.width * config.GROUND_ENEMY_EYE_OFFSET_X_SCALE
-                offset_y = self.rect.height * config.GROUND_ENEMY_EYE_OFFSET_Y_SCALE
-                eye_center = (self.rect.centerx + offset_x, self.rect.centery + offset_y)
-
-                # 3. 描画
-                pygame.draw.circle(screen, config.ENEMY_EYE_WHITE_COLOR, eye_center, eye_radius)
-                pygame.draw.circle(screen, config.ENEMY_EYE_PUPIL_COLOR, eye_center, pupil_radius)
-                pygame.draw.circle(screen, config.BLACK, eye_center, eye_radius, config.ENEMY_EYE_OUTLINE_WIDTH)
-
-        elif self.state == "DYING":
+        if self.state == EntityState.ALIVE:
+            # 焼き込み済みのスプライトを、当たり判定の中心に合わせて1回で描画する
+            sprite = self.get_sprite()
+            screen.blit(sprite, sprite.get_rect(center=self.rect.center))
+
+        elif self.state == EntityState.DYING:
             # 死亡エフェクト（広がる半透明の円）を描画
             progress = (pygame.time.get_ticks() - self.death_animation_start_time) / config.ENEMY_DEATH_EFFECT_DURATION
             progress = min(progress, 1.0) # 1.0を超えないようにする
@@ -140,18 +190,24 @@ class Enemy:
             # 徐々に透明にする (alpha: 255 -> 0)
             alpha = 255 * (1 - progress)
 
+            # 線の太さが半径を超えないように調整（太すぎると描画が崩れるため）
+            current_radius = int(self.death_effect_radius)
+            line_width = min(config.ENEMY_DEATH_EFFECT_LINE_WIDTH, current_radius)
+
+            if not quality_governor.death_ring_alpha:
+                # 画質を下げている間は、半透明のSurfaceを作らずに不透明の円を画面へ直接描く
+                if line_width > 0:
+                    pygame.draw.circle(screen, config.ENEMY_DEATH_EFFECT_COLOR, self.rect.center, current_radius, line_width)
+                return
+
             # 円を描画するための新しいSurfaceを作成
-            max_radius = int((self.original_width / 2) * config.ENEMY_DEATH_EFFECT_MAX_RADIUS_MULTIPLIER)
+            max_radius = int(self.death_effect_max_radius)
             surface_size = max_radius * 2
             effect_surface = pygame.Surface((surface_size, surface_size), pygame.SRCALPHA)
 
             # 色にアルファ値を適用
             effect_color = (*config.ENEMY_DEATH_EFFECT_COLOR, alpha)
 
-            # 線の太さが半径を超えないように調整（太すぎると描画が崩れるため）
-            current_radius = int(self.death_effect_radius)
-            line_width = min(config.ENEMY_DEATH_EFFECT_LINE_WIDTH, current_radius)
-
             # Surfaceの中心に、現在の半径で円を描く
             pygame.draw.circle(effect_surface, effect_color, (max_radius, max_radius), current_radius, line_width)
 
@@ -161,7 +217,7 @@ class Enemy:
 
     def take_damage(self, amount):
         """ダメージを受けてHPを減らす。HPが0以下になったらTrueを返す。"""
-        if self.state != "ALIVE":
+        if self.state != EntityState.ALIVE:
             return False # すでに死亡中の場合は何もしない
 
         self.hp -= amount
@@ -175,17 +231,21 @@ class Enemy:
 
     def destroy(self):
         """外部から敵を破壊し、死亡アニメーションを開始する。"""
-        if self.state != "DYING":
-            self.state = "DYING"
+        if self.state != EntityState.DYING:
+            self.state = EntityState.DYING
             self.death_animation_start_time = pygame.time.get_ticks()
 
+    def on_removed(self):
+        """EntityRegistryから登録を解除された時に呼ばれる。敵が登録したタイマーがあれば、ここで取り消す。"""
+        pass
+
     def knockback(self, direction, force):
         """指定された方向に力を加えてノックバックさせる"""
         self.velocity += direction * force
 
     def is_finished(self):
         """死亡アニメーションが完了したか判定する"""
-        if self.state == "DYING":
+        if self.state == EntityState.DYING:
             elapsed_time = pygame.time.get_ticks() - self.death_animation_start_time
             return elapsed_time >= config.ENEMY_DEATH_EFFECT_DURATION
         return False
\ No newline at end of file
@@ -0,0 +1,56 @@
+class EntityRegistry:
+    """
+    ステージ上の敵とアイテムをまとめて管理するクラス。
+    敵は出現順に並んだ全体の集合に加えて、種類（entity_kind）ごとの集合にも登録し、
+    ボスは直接参照できるように保持する。アイテムは種類（item_kind）に関係なく1つの集合で管理する。
+    集合には挿入順を保つdictを使うため、登録・削除・所属の判定はいずれも要素数に関係なく一定時間で済み、
+    毎フレームの型判定やリストの作り直しが不要になる。
+    """
+    ENEMY_KINDS = ("ground", "jumping", "flying", "boss")
+
+    def __init__(self):
+        self.enemies = {} # 出現順に並んだ全ての敵 (値は使わない)
+        self.enemy_buckets = {kind: {} for kind in self.ENEMY_KINDS} # 種類ごとの敵
+        self.boss = None # 現在のボス。いなければNone
+        self.items = {} # 出現順に並んだ全てのアイテム (値は使わない)
+
+    def add_enemy(self, enemy):
+        """敵を登録する。ボスの場合は直接参照できるように保持する。"""
+        self.enemies[enemy] = None
+        self.enemy_buckets[enemy.entity_kind][enemy] = None
+        if enemy.entity_kind == "boss":
+            self.boss = enemy
+        return enemy
+
+    def remove_enemy(self, enemy):
+        """敵の登録を解除する。"""
+        del self.enemies[enemy]
+        del self.enemy_buckets[enemy.entity_kind][enemy]
+        if enemy is self.boss:
+            self.boss = None
+        enemy.on_removed()
+
+    def remove_finished_enemies(self):
+        """死亡アニメーションが完了した、または画面外に出た敵の登録を解除する。"""
+        finished = [enemy for enemy in self.enemies if enemy.is_finished() or enemy.rect.right <= 0]
+        for enemy in finished:
+            self.remove_enemy(enemy)
+
+    def add_item(self, item):
+        """アイテムを登録する。"""
+        self.items[item] = None
+        return item
+
+    def remove_item(self, item):
+        """アイテムの登録を解除する。"""
+        del self.items[item]
+
+    def clear(self):
+        """全ての敵とアイテムの登録を解除する。"""
+        for enemy in self.enemies:
+            enemy.on_removed()
+        self.enemies.clear()
+        for bucket in self.enemy_buckets.values():
+            bucket.clear()
+        self.boss = None
+        self.items.clear()
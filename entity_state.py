@@ -0,0 +1,19 @@
+from enum import IntEnum
+
+class EntityState(IntEnum):
+    """
+    敵、ブロック、アイテムの状態。
+    文字列ではなく整数で持つため、比較が速く、綴りの間違いもその場でエラーになる。
+    """
+    ALIVE = 0 # 通常 (地上の敵、ボス、ブロック)
+    DYING = 1 # 死亡エフェクトの再生中
+    DESTROYED = 2 # 死亡エフェクトが終わり、取り除かれるのを待っている (ブロック)
+    PATROLING = 3 # まっすぐ進んでいる (飛行する敵)
+    ATTACKING = 4 # タワーを狙って追尾している (飛行する敵)
+    SPAWNING = 5 # 出現アニメーションの再生中 (アイテム)
+    IDLE = 6 # 取得できる状態 (アイテム)
+
+class JumpState(IntEnum):
+    """ジャンプする敵の接地状態。"""
+    ON_GROUND = 0
+    JUMPING = 1
@@ -2,21 +2,38 @@ import pygame
 import random
 import math
 import config
+from entity_state import EntityState
+from sprite_cache import sprite_cache
+from quality_governor import quality_governor
 
 class FlyingEnemy:
     """空中を飛行する三角の敵を管理するクラス"""
-
-    def __init__(self, x, y, stat_multiplier):
+    sprite_kind = "flying_enemy" # スプライトキャッシュ上の種類名
+    entity_kind = "flying" # EntityRegistry上の種類名
+    __slots__ = (
+        "size", "original_size", "death_effect_max_radius",
+        "hp", "max_hp", "speed", "attack_power",
+        "pos", "rect", "color", "angle", "velocity",
+        "is_animating", "animation_start_time", "current_scale",
+        "state", "target_y_offset", "trigger_distance",
+        "death_animation_start_time", "death_effect_radius",
+        "original_image", "image",
+    )
+
+    def __init__(self, x, y, stat_multiplier, size=None):
         """
         飛行する敵を初期化する。
         :param x: 出現位置のX座標
         :param y: 出現位置のY座標
         :param stat_multiplier: ステータス補正値の辞書
+        :param size: 敵の大きさ。省略時はランダムに決める
         """
         # --- 大きさとステータスの決定 ---
-        size = random.uniform(config.FLYING_ENEMY_MIN_SIZE, config.FLYING_ENEMY_MAX_SIZE)
+        if size is None:
+            size = random.uniform(config.FLYING_ENEMY_MIN_SIZE, config.FLYING_ENEMY_MAX_SIZE)
         self.size = size
         self.original_size = size # アニメーション用
+        self.death_effect_max_radius = (size / 2) * config.ENEMY_DEATH_EFFECT_MAX_RADIUS_MULTIPLIER # 死亡エフェクトの最大半径
 
         # 大きさとステージ補正に基づいてステータスを計算
         self.hp = self.size * config.FLYING_ENEMY_HP_MULTIPLIER * stat_multiplier.get("hp", 1.0)
@@ -38,8 +55,8 @@ class FlyingEnemy:
         self.animation_start_time = 0
         self.current_scale = 1.0
 
-        # 状態管理 ("PATROLING", "ATTACKING", "DYING")
-        self.state = "PATROLING"
+        # 状態管理 (PATROLING, ATTACKING, DYING)
+        self.state = EntityState.PATROLING
         # 攻撃モードで狙うY座標のオフセット
         self.target_y_offset = 0
         # 攻撃を開始する、タワーからのX軸距離
@@ -51,63 +68,69 @@ class FlyingEnemy:
         self.death_animation_start_time = 0
         self.death_effect_radius = 0
 
-        # --- 画像サーフェスの作成 ---
+        # --- 画像サーフェスの取得 ---
         # 描画の安定性を高めるため、一度画像(Surface)に三角形を描画し、
         # それを回転・拡縮して画面にblitする方式に変更します。
         # これにより、画面外の頂点を扱う際のPygameの描画アーティファクトを回避できます。
-        size_int = int(self.original_size)
-        self.original_image = pygame.Surface((size_int, size_int), pygame.SRCALPHA)
+        # 元の画像は同じ大きさの飛行する敵で共有するため、スプライトキャッシュから取得します。
+        self.original_image = sprite_cache.get((self.sprite_kind, self.color), self.original_size, self.original_size, self._build_sprite)
+        self.image = self.original_image
+
+        # 当たり判定用のFRectを計算
+        self.rect = pygame.FRect(0, 0, 0, 0)
+        self._update_rect()
+
+    def _build_sprite(self, width, height):
+        """
+        指定した大きさで、右向きの三角形の本体と目をSurfaceに描画する。
+        :return: 描画したSurface (三角形の外側は透明)
+        """
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
 
         # --- 本体（三角形）を描画 ---
         # ポイントは (先端, 左下, 左上)
         points = [
-            (size_int, size_int / 2), 
-            (0, 0), 
-            (0, size_int)
+            (width, height / 2),
+            (0, 0),
+            (0, height)
         ]
-        pygame.draw.polygon(self.original_image, self.color, points)
-        pygame.draw.polygon(self.original_image, config.BLACK, points, config.FLYING_ENEMY_OUTLINE_WIDTH)
+        pygame.draw.polygon(surface, self.color, points)
+        pygame.draw.polygon(surface, config.BLACK, points, config.FLYING_ENEMY_OUTLINE_WIDTH)
 
-        # --- 目をoriginal_imageに描き込む ---
-        eye_center = (size_int / 2, size_int / 2 + 2)
-        eye_radius = self.original_size * config.FLYING_ENEMY_EYE_SIZE_SCALE
+        # --- 目を描き込む ---
+        eye_center = (width / 2, height / 2 + 2)
+        eye_radius = width * config.FLYING_ENEMY_EYE_SIZE_SCALE
         pupil_radius = eye_radius * config.ENEMY_EYE_PUPIL_SCALE
 
-        pygame.draw.circle(self.original_image, config.ENEMY_EYE_WHITE_COLOR, eye_center, eye_radius)
-        pygame.draw.circle(self.original_image, config.ENEMY_EYE_PUPIL_COLOR, eye_center, pupil_radius)
-        pygame.draw.circle(self.original_image, config.BLACK, eye_center, eye_radius, config.ENEMY_EYE_OUTLINE_WIDTH)
-
-        self.image = self.original_image.copy()
-        
-        # 当たり判定用のRectを計算
-        self._update_rect()
+        pygame.draw.circle(surface, config.ENEMY_EYE_WHITE_COLOR, eye_center, eye_radius)
+        pygame.draw.circle(surface, config.ENEMY_EYE_PUPIL_COLOR, eye_center, pupil_radius)
+        pygame.draw.circle(surface, config.BLACK, eye_center, eye_radius, config.ENEMY_EYE_OUTLINE_WIDTH)
+        return surface
 
     def start_animation(self):
         """衝突アニメーションを開始する。"""
         # 生存中かつ、別のアニメーションが実行中でない場合のみ
-        if self.state != "DYING" and not self.is_animating:
+        if self.state != EntityState.DYING and not self.is_animating:
             self.is_animating = True
             self.animation_start_time = pygame.time.get_ticks()
 
     def _update_rect(self):
-        """現在の位置とサイズから当たり判定用のRectを計算する。"""
+        """現在の位置とサイズから当たり判定用のFRectを更新する (新しいRectは作らない)。"""
         # 三角形を包含する最小の四角形を計算
         # 簡単のため、中心に正方形のRectを割り当てる
-        self.rect = pygame.Rect(
-            self.pos.x - self.size / 2,
-            self.pos.y - self.size / 2,
-            self.size,
-            self.size
-        )
+        half_size = self.size / 2
+        self.rect.update(self.pos.x - half_size, self.pos.y - half_size, self.size, self.size)
 
-    def update(self, tower):
-        """敵の位置や状態を更新する。"""
-        if self.state == "DYING":
+    def update(self, tower, ground=None):
+        """
+        敵の位置や状態を更新する。
+        :param ground: 地上の敵と同じ呼び出し方にするために受け取るが、飛行する敵は使わない
+        """
+        if self.state == EntityState.DYING:
             # 死亡エフェクトのアニメーション
             elapsed_time = pygame.time.get_ticks() - self.death_animation_start_time
             progress = min(elapsed_time / config.ENEMY_DEATH_EFFECT_DURATION, 1.0)
-            max_radius = (self.original_size / 2) * config.ENEMY_DEATH_EFFECT_MAX_RADIUS_MULTIPLIER
-            self.death_effect_radius = max_radius * progress
+            self.death_effect_radius = self.death_effect_max_radius * progress
             # 死亡中は以降の処理は不要
             return
 
@@ -128,7 +151,7 @@ class FlyingEnemy:
         self.size = self.original_size * self.current_scale
 
         # 3. 状態ごとの移動ロジック
-        if self.state == "PATROLING":
+        if self.state == EntityState.PATROLING:
             # 左にまっすぐ進む
             self.pos.x -= self.speed
             
@@ -140,7 +163,7 @@ class FlyingEnemy:
                 # 自身のX座標が、個別に設定された攻撃開始距離に入ったか判定
                 # 敵は左に進んでいるので、X座標が「タワーの中心X + トリガー距離」以下になったら攻撃開始
                 if self.pos.x <= tower_center_x + self.trigger_distance:
-                    self.state = "ATTACKING"
+                    self.state = EntityState.ATTACKING
                     # 攻撃モードに移行する際に、ターゲットとするY座標のオフセットをランダムに決定
                     self.target_y_offset = random.uniform(
                         config.FLYING_ENEMY_TARGET_Y_MIN,
@@ -148,7 +171,7 @@ class FlyingEnemy:
                     )
                     print(f"飛行する敵が攻撃モードに移行！ トリガー距離: {self.trigger_distance:.1f}")
 
-        elif self.state == "ATTACKING":
+        elif self.state == EntityState.ATTACKING:
             # タワーが破壊されたら、そのまま直進する
             if tower.is_destroyed():
                 # 現在の角度のまま直進
@@ -195,22 +218,27 @@ class FlyingEnemy:
 
     def draw(self, screen):
         """敵（三角形）を描画する。"""
-        if self.state == "DYING":
+        if self.state == EntityState.DYING:
             # 死亡エフェクトの描画 (Enemyクラスとほぼ同じロジック)
             progress = (pygame.time.get_ticks() - self.death_animation_start_time) / config.ENEMY_DEATH_EFFECT_DURATION
             progress = min(progress, 1.0)
             alpha = 255 * (1 - progress)
-            max_radius = int((self.original_size / 2) * config.ENEMY_DEATH_EFFECT_MAX_RADIUS_MULTIPLIER)
+            max_radius = int(self.death_effect_max_radius)
 
             # 描画する円がなければ何もしない
             if max_radius <= 0:
                 return
 
+            current_radius = int(self.death_effect_radius)
+            line_width = min(config.ENEMY_DEATH_EFFECT_LINE_WIDTH, current_radius)
+            if not quality_governor.death_ring_alpha:
+                if line_width > 0:
+                    pygame.draw.circle(screen, config.ENEMY_DEATH_EFFECT_COLOR, self.pos, current_radius, line_width)
+                return
+
             surface_size = max_radius * 2
             effect_surface = pygame.Surface((surface_size, surface_size), pygame.SRCALPHA)
             effect_color = (*config.ENEMY_DEATH_EFFECT_COLOR, alpha)
-            current_radius = int(self.death_effect_radius)
-            line_width = min(config.ENEMY_DEATH_EFFECT_LINE_WIDTH, current_radius)
 
             if line_width > 0:
                 pygame.draw.circle(effect_surface, effect_color, (max_radius, max_radius), current_radius, line_width)
@@ -224,7 +252,8 @@ class FlyingEnemy:
         #    pygame.transform.rotozoomは高品質な回転と拡縮を同時に行います。
         #    self.angleは数学的な角度（反時計回り）であり、rotozoomも反時計回りに回転するため、
         #    角度をそのまま渡すことで、移動方向と画像の向きが一致します。
-        self.image = pygame.transform.rotozoom(self.original_image, self.angle, self.current_scale)
+        #    画質を下げている間は、角度を丸めてキャッシュ済みの回転画像を使います。
+        self.image = quality_governor.rotate((self.sprite_kind, self.color), self.original_image, self.angle, self.current_scale)
         
         # 2. 回転・拡縮後の画像のRectを取得し、中心を敵の現在位置に合わせる
         rotated_rect = self.image.get_rect(center=self.pos)
@@ -232,7 +261,7 @@ class FlyingEnemy:
         screen.blit(self.image, rotated_rect)
 
     def take_damage(self, amount):
-        if self.state == "DYING": return False
+        if self.state == EntityState.DYING: return False
         self.hp -= amount
         if self.hp <= 0:
             self.hp = 0
@@ -241,15 +270,19 @@ class FlyingEnemy:
         return False
 
     def destroy(self):
-        if self.state != "DYING":
-            self.state = "DYING"
+        if self.state != EntityState.DYING:
+            self.state = EntityState.DYING
             self.death_animation_start_time = pygame.time.get_ticks()
 
+    def on_removed(self):
+        """EntityRegistryから登録を解除された時に呼ばれる。飛行する敵はタイマーを持たないので何もしない。"""
+        pass
+
     def knockback(self, direction, force):
         self.velocity += direction * force
 
     def is_finished(self):
-        if self.state == "DYING":
+        if self.state == EntityState.DYING:
             elapsed_time = pygame.time.get_ticks() - self.death_animation_start_time
             return elapsed_time >= config.ENEMY_DEATH_EFFECT_DURATION
         return False
\ No newline at end of file
@@ -0,0 +1,57 @@
+import sys
+import pygame
+import config
+
+class FrameScheduler:
+    """
+    画面が動いていない間、描画の頻度を下げてバッテリーの消費を抑えるクラス。
+    - 入力がなく、動いているもの（飛んでいる弾、パーティクル、敵、スコアやコンボの表示）もない状態が
+      IDLE_DELAY_MS続いたら、IDLE_FPSで描画する。ゲームの状態の更新も1回の描画につき1回だけ行い、
+      その間に進んだフレーム数を渡すので、背景の雲が浮遊する速さは変わらない
+    - 入力があれば、そのフレームからすぐに通常のFPSに戻す
+    - タブが非表示になっている間（pygbag）やウィンドウが最小化されている間は、ゲームループを止める
+    """
+    def __init__(self):
+        self.last_activity_time = 0 # 最後に入力があった時間、または画面が動いていた時間
+        self.window_hidden = False # ウィンドウが最小化・非表示になっているか (デスクトップ)
+        self.document = None # ブラウザのdocument (pygbagのみ)
+        if sys.platform == "emscripten":
+            import platform as browser_platform # pygbag replaces this module with one exposing `window`
+            self.document = browser_platform.window.document
+
+    def process_event(self, event):
+        """
+        イベントを見て、入力の有無とウィンドウの表示状態を記録する。
+        :param event: pygameのイベント
+        """
+        if event.type in (pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN):
+            self.window_hidden = True
+        elif event.type in (pygame.WINDOWRESTORED, pygame.WINDOWSHOWN, pygame.WINDOWMAXIMIZED):
+            self.window_hidden = False
+        elif event.type in (
+            pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION,
+            pygame.FINGERDOWN, pygame.FINGERUP, pygame.FINGERMOTION, pygame.KEYDOWN,
+        ):
+            self.last_activity_time = pygame.time.get_ticks()
+
+    def is_hidden(self):
+        """タブが非表示、またはウィンドウが最小化されていればTrueを返す。"""
+        if self.document is not None:
+            return bool(self.document.hidden)
+        return self.window_hidden
+
+    def frames_per_update(self, is_animating):
+        """
+        今回の状態の更新で、何フレーム分の時間を進めるかを返す。
+        :param is_animating: 画面上で動いているものがあるか
+        :return: 通常は1。アイドル中はFPS / IDLE_FPS
+        """
+        now = pygame.time.get_ticks()
+        if is_animating:
+            self.last_activity_time = now
+        if now - self.last_activity_time < config.IDLE_DELAY_MS:
+            return 1
+        return max(1, round(config.FPS / config.IDLE_FPS))
+
+# アプリ全体で共有するフレームの頻度の管理用インスタンス
+frame_scheduler = FrameScheduler()
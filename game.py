@@ -3,25 +3,37 @@
 # https://opensource.org/licenses/MIT
 
 import pygame
-import math
 import asyncio # Webアプリ(Pygbag)化のために追加
+import time
 import random
 import config
 from bird import Bird
-from cloud import Cloud
 from ground import Ground
-from enemy import Enemy
 from tower import Tower
-from heart_item import HeartItem
-from speed_up_item import SpeedUpItem
-from size_up_item import SizeUpItem
-from flying_enemy import FlyingEnemy
-from game_logic import GameLogicManager, calculate_trajectory
+from physics_utils import calculate_trajectory
 from ui import UIManager
 from level_utils import create_cloud_layout
 from scene_title import TitleScene
-from audio_manager import AudioManager
 from data_manager import DataManager
+from profiler import startup_profiler, pause_profiler
+from gc_policy import gc_policy
+from quality_governor import quality_governor
+from render_target import render_target
+from frame_scheduler import frame_scheduler
+from input_layer import input_layer
+from sprite_batch import sprite_batch
+from timer_scheduler import timer_scheduler
+from entity_registry import EntityRegistry
+
+# ゲームプレイ専用のモジュール。タイトル画面を早く表示するため、最初のプレイ開始時に読み込む
+GameLogicManager = None
+
+def _load_gameplay_modules():
+    """ゲームプレイ専用のモジュール（敵、アイテム、ステージ管理など）を読み込む。"""
+    global GameLogicManager
+    if GameLogicManager is None:
+        from game_logic import GameLogicManager
+        startup_profiler.mark("gameplay modules loaded")
 
 class Game:
     """ゲーム全体を管理するクラス"""
@@ -29,9 +41,11 @@ class Game:
         """ゲームの初期化。開始ステージを指定できる。"""
         pygame.init()
         
-        self.screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+        # ゲームは常に論理解像度のself.screenに描画する。表示解像度への変換はrender_targetが行う
+        self.screen = render_target.open()
         pygame.display.set_caption("Babel's Tower Shooter")
         self.clock = pygame.time.Clock()
+        startup_profiler.mark("display initialized")
         
         # フォントの準備
         ui_font = pygame.font.Font(None, 72)
@@ -42,6 +56,7 @@ class Game:
 
         # UIマネージャーのインスタンスを作成
         self.ui_manager = UIManager(self.screen, ui_font, title_font, boss_font, combo_font, result_font)
+        startup_profiler.mark("fonts and UIManager")
 
         # データマネージャーのインスタンスを作成し、ハイスコアを読み込む
         self.data_manager = DataManager()
@@ -50,6 +65,8 @@ class Game:
         self.best_combo = save_data.get("best_combo", 0)
         self.best_tower_height = save_data.get("best_tower_height", 0)
         self.sound_enabled_setting = save_data.get("sound_enabled", True)
+        # 1プレイごとの結果の履歴（リザルト画面の順位表示に使う）。最初のゲーム終了時に開く
+        self.run_history = None
         self.mixer_initialized = False
         self.audio_manager = None
         
@@ -57,15 +74,25 @@ class Game:
         self.slingshot_x = config.SLINGSHOT_X
         self.initial_tower_top_y = config.GROUND_Y - (config.TOWER_INITIAL_BLOCKS * config.TOWER_BLOCK_HEIGHT)
 
+        # ここまでに読み込んだモジュールと、作ったフォント、設定、UIなどは終了まで使われるので、GCの対象から外す
+        # タイトル画面の雲や敵など、作り直されるゲームのオブジェクトは凍結しないよう、それらを作る前に行う
+        gc_policy.freeze_long_lived("startup")
+
+        # タイトル画面の背景（雲と地面）だけを作成する
+        # 塔、弾、GameLogicManagerなどのゲームプレイ用オブジェクトは、ゲーム開始時に_reset_gameで作成する
+        self.clouds = create_cloud_layout(self.slingshot_x, self.initial_tower_top_y)
+        self.ground = Ground()
+        self.running = True  # ゲームループの実行フラグ
+        self.cloud_update_frame = 0 # 雲の更新を間引くためのフレーム数
+
         # シーンのインスタンスを作成
         self.title_scene = TitleScene(self.ui_manager, self.audio_manager)
-
-        # ゲームの状態をリセットして初期化
-        self._reset_game(play_start_sound=False)
+        startup_profiler.mark("title scene")
 
         # 開始ステージが指定されていれば、直接そのステージから開始する
         if start_stage is not None and config.DEBUG:
             print(f"デバッグモード: ステージ {start_stage} から直接開始します。")
+            self._reset_game(play_start_sound=False)
             self.game_logic_manager.jump_to_stage(start_stage)
             self.game_state = "PLAYING"
         else:
@@ -84,7 +111,13 @@ class Game:
             pygame.mixer.init()
             print("Pygame mixer initialized successfully.")
             self.mixer_initialized = True
+            from audio_manager import AudioManager # 最初の入力まで読み込みを遅らせる
             self.audio_manager = AudioManager(initial_enabled=self.sound_enabled_setting)
+            # SEのデコードはフレームをまたいでバックグラウンドで行う
+            try:
+                self.audio_preload_task = asyncio.get_running_loop().create_task(self.audio_manager.preload())
+            except RuntimeError:
+                pass # イベントループ外では、SEは再生時にその場で読み込まれる
 
             # AudioManagerが作成されたら、それを必要とする他のオブジェクトに渡す
             self.title_scene.audio_manager = self.audio_manager
@@ -104,35 +137,43 @@ class Game:
         self.bird = Bird(self.slingshot_x, self.tower.get_top_y() + config.SLINGSHOT_OFFSET_Y, config.BIRD_DEFAULT_RADIUS)
         self.clouds = create_cloud_layout(self.slingshot_x, tower_top_y)
         self.ground = Ground()
-        self.enemies = []
+        self.entities = EntityRegistry() # 敵とアイテム
 
     def _reset_game(self, play_start_sound=True):
         """
         ゲームを初期化またはリセットし、すべてのオブジェクトとマネージャーをセットアップする。
         """
+        _load_gameplay_modules()
+        # 前のプレイのオブジェクトが登録したタイマーを破棄する
+        timer_scheduler.clear()
+
+        # このプレイの乱数シード。プレイ履歴に記録し、同じ展開を再現できるようにする
+        self.run_seed = random.getrandbits(31)
+        random.seed(self.run_seed)
+        self.run_start_time = pygame.time.get_ticks()
+        self.last_run_rank = None # リザルト画面に表示する順位
+
         self._setup_level(self.initial_tower_top_y)
 
-        self.heart_items = []
-        self.speed_up_items = []
-        self.size_up_items = []
         self.particles = []
         self.slingshot_pos = pygame.math.Vector2(self.slingshot_x, self.tower.get_top_y() + config.SLINGSHOT_OFFSET_Y)
 
         self.game_logic_manager = GameLogicManager(
-            self.bird, self.tower, self.clouds, self.ground, self.enemies,
-            self.heart_items, self.speed_up_items, self.size_up_items,
+            self.bird, self.tower, self.clouds, self.ground, self.entities,
             self.particles, self.slingshot_pos, self.ui_manager, self.audio_manager,
-            play_start_sound=play_start_sound
+            play_start_sound=play_start_sound, run_seed=self.run_seed
         )
 
         # ゲームループに関わる状態もここでリセットする
         self.is_dragging = False
         self.drag_start_pos = None # ドラッグ開始位置を記録
+        self.drag_start_time = 0 # ドラッグ開始時間
         self.is_game_over_processed = False # ゲームオーバー処理が完了したかのフラグ
         self.is_release_pending = False # リリース待機中フラグ
         self.release_pending_start_time = 0 # リリース待機開始時間
         self.pending_launch_vector = None # 発射待機中のベクトル
         self.trajectory_points = []
+        self.trajectory_key = None # 軌道を計算した時の (弾の位置, 発射ベクトル, 点の数)
         self.mouse_pos = pygame.math.Vector2(0, 0)
         self.recall_button_rect = None
         self.running = True  # ゲームループの実行フラグ
@@ -145,7 +186,10 @@ class Game:
 
     def _handle_events(self):
         """イベント処理 (Input)"""
-        for event in pygame.event.get():
+        # 同じフレームに届いた移動イベントは、最新の位置だけにまとめて受け取る
+        for event in input_layer.poll():
+            render_target.map_event(event) # マウスの座標を論理解像度に合わせる
+            frame_scheduler.process_event(event)
             if event.type == pygame.QUIT:
                 self.running = False
 
@@ -220,6 +264,7 @@ class Game:
                         self.drag_start_pos = pygame.math.Vector2(pos) # タッチ開始点を記録
                         self.mouse_pos.x, self.mouse_pos.y = pos # 現在のタッチ位置も更新
                         self.last_activity_time = pygame.time.get_ticks()
+                        self.drag_start_time = self.last_activity_time
 
                 # 2. ドラッグ中の移動処理
                 if self.is_dragging and (event.type == pygame.MOUSEMOTION or event.type == pygame.FINGERMOTION):
@@ -229,18 +274,66 @@ class Game:
                 # 3. リリース処理
                 if self.is_dragging and ((event.type == pygame.MOUSEBUTTONUP and event.button == 1) or event.type == pygame.FINGERUP):
                     self.is_dragging = False
-                    self.is_release_pending = True
-                    self.release_pending_start_time = pygame.time.get_ticks()
-                    # 発射待機中のベクトルを保存
-                    self.pending_launch_vector = self.slingshot_pos - self.bird.pos
-                    print("Release pending...")
-
-    def _update_state(self):
-        """状態更新 (Update)"""
+                    input_layer.mark_release()
+                    if config.IMMEDIATE_LAUNCH:
+                        # 次の更新を待たずに、このイベントまでの最新の位置で発射する
+                        self._apply_drag_to_bird()
+                        if pygame.time.get_ticks() - self.drag_start_time < config.IMMEDIATE_LAUNCH_DEBOUNCE_MS:
+                            print("Release too soon after press, launch cancelled.")
+                            self.bird.cancel_launch()
+                            input_layer.cancel_release()
+                            self.trajectory_points.clear()
+                        else:
+                            self._launch_or_cancel(self.slingshot_pos - self.bird.pos)
+                    else:
+                        self.is_release_pending = True
+                        self.release_pending_start_time = pygame.time.get_ticks()
+                        # 発射待機中のベクトルを保存
+                        self.pending_launch_vector = self.slingshot_pos - self.bird.pos
+                        print("Release pending...")
+
+    def _apply_drag_to_bird(self):
+        """現在のドラッグ位置に合わせて、スリングショット上の弾の位置を更新する。"""
+        # ドラッグ開始点からのベクトルを計算
+        drag_vector = self.mouse_pos - self.drag_start_pos
+        # スリングショットの位置に、ドラッグベクトルを加算してボールを配置（直感的な引っ張り操作）
+        self.bird.pos = self.slingshot_pos + drag_vector
+
+        # 平方根を避けるため、距離の2乗で比較する
+        if self.slingshot_pos.distance_squared_to(self.bird.pos) > config.MAX_PULL_DISTANCE_SQUARED:
+            direction = (self.bird.pos - self.slingshot_pos).normalize()
+            self.bird.pos = self.slingshot_pos + direction * config.MAX_PULL_DISTANCE
+
+    def _launch_or_cancel(self, launch_vector):
+        """
+        引っ張った距離が十分なら弾を発射し、足りなければ発射を取り消す。
+        :param launch_vector: 発射ベクトル (スリングショットの位置 - 弾の位置)
+        """
+        if launch_vector.length() > config.MIN_PULL_DISTANCE_TO_LAUNCH:
+            print("Launch confirmed.")
+            self.bird.launch(launch_vector)
+            self.last_activity_time = pygame.time.get_ticks()
+            input_layer.mark_launch()
+        else:
+            print("Pull distance too short, launch cancelled.")
+            self.bird.cancel_launch()
+            input_layer.cancel_release()
+        self.trajectory_points.clear()
+
+    def _update_state(self, frames=1):
+        """
+        状態更新 (Update)
+        :param frames: 今回の更新で進めるフレーム数。2以上になるのは、画面上に動くものがないアイドル中だけ
+                       (フレーム数で進む処理のうち、その間も動いているのは雲の浮遊だけ)
+        """
         current_time = pygame.time.get_ticks()
 
         # タイトル画面でも背景が動くように、雲は常に更新
-        for cloud in self.clouds: cloud.update()
+        # 画質を下げている間は数フレームに1回だけ、まとめて進める
+        self.cloud_update_frame += frames
+        if self.cloud_update_frame >= quality_governor.cloud_update_interval:
+            for cloud in self.clouds: cloud.update(self.cloud_update_frame)
+            self.cloud_update_frame = 0
 
         # オーディオマネージャーの更新
         if self.audio_manager:
@@ -276,46 +369,23 @@ class Game:
             # --- リリース待機処理 ---
             if self.is_release_pending and current_time - self.release_pending_start_time > config.DRAG_RELEASE_DELAY:
                 self.is_release_pending = False
-                pull_distance = self.pending_launch_vector.length()
-                if pull_distance > config.MIN_PULL_DISTANCE_TO_LAUNCH:
-                    print("Launch confirmed.")
-                    self.bird.launch(self.pending_launch_vector)
-                    self.last_activity_time = pygame.time.get_ticks()
-                else:
-                    print("Pull distance too short, launch cancelled.")
-                    self.bird.cancel_launch()
+                self._launch_or_cancel(self.pending_launch_vector)
                 self.pending_launch_vector = None
-                self.trajectory_points.clear()
 
             # プレイ中のみゲームオブジェクトの状態を更新
             self.slingshot_pos.y = self.tower.get_top_y() + config.SLINGSHOT_OFFSET_Y
 
             if self.is_dragging or self.is_release_pending:
-                # ドラッグ開始点からのベクトルを計算
-                drag_vector = self.mouse_pos - self.drag_start_pos
-                # スリングショットの位置に、ドラッグベクトルを加算してボールを配置（直感的な引っ張り操作）
-                self.bird.pos = self.slingshot_pos + drag_vector
-
-                distance = self.slingshot_pos.distance_to(self.bird.pos)
-                if distance > config.MAX_PULL_DISTANCE:
-                    if distance > 0:
-                        direction = (self.bird.pos - self.slingshot_pos).normalize()
-                        self.bird.pos = self.slingshot_pos + direction * config.MAX_PULL_DISTANCE
+                self._apply_drag_to_bird()
             elif self.bird.is_flying:
                 self.bird.update(gravity=config.GRAVITY)
             else:
                 self.bird.pos = self.slingshot_pos.copy()
                 self.bird.start_pos = self.slingshot_pos.copy()
 
-            for heart in self.heart_items: heart.update()
-            for item in self.speed_up_items: item.update()
-            for item in self.size_up_items: item.update()
+            for item in self.entities.items: item.update()
             for p in self.particles: p.update()
-            for enemy in self.enemies:
-                if isinstance(enemy, FlyingEnemy):
-                    enemy.update(self.tower)
-                else:
-                    enemy.update(self.tower, self.ground)
+            for enemy in self.entities.enemies: enemy.update(self.tower, self.ground)
 
             self.tower.update()
             self.ground.update()
@@ -323,7 +393,11 @@ class Game:
 
             if self.is_dragging or self.is_release_pending:
                 current_launch_vector = self.slingshot_pos - self.bird.pos
-                self.trajectory_points = calculate_trajectory(self.bird.pos, current_launch_vector)
+                # 引っ張る位置が前のフレームから変わっていなければ、軌道を計算し直さない
+                trajectory_key = (self.bird.pos.x, self.bird.pos.y, current_launch_vector.x, current_launch_vector.y, quality_governor.trajectory_points)
+                if trajectory_key != self.trajectory_key or not self.trajectory_points:
+                    self.trajectory_points = calculate_trajectory(self.bird.pos, current_launch_vector, quality_governor.trajectory_points)
+                    self.trajectory_key = trajectory_key
 
             # --- ゲームオーバー/クリア時のスコア記録処理 ---
             if self.game_logic_manager.stage_state in ["GAME_OVER", "GAME_WON"] and not self.is_game_over_processed:
@@ -365,8 +439,29 @@ class Game:
                 "best_tower_height": self.best_tower_height
             }
             self.data_manager.save_data(save_data)
+
+        # プレイ履歴に記録し、歴代の中での順位を求める
+        if self.run_history is None:
+            from run_history import RunHistory
+            self.run_history = RunHistory()
+        stage_state = self.game_logic_manager.stage_state
+        if self.run_history.record_run(
+            score=current_score,
+            stage_reached=self.game_logic_manager.stage_manager.current_stage,
+            max_combo=max_combo,
+            tower_height=final_height,
+            duration_ms=pygame.time.get_ticks() - self.run_start_time,
+            seed=self.run_seed,
+            result=stage_state
+        ) is not None:
+            self.last_run_rank = self.run_history.rank_summary(current_score)
         
         self.is_game_over_processed = True
+        # このプレイ中に発生したGCなどの停止時間を表示する
+        pause_profiler.report()
+        pause_profiler.clear()
+        input_layer.report()
+        input_layer.clear()
 
     def _save_current_settings(self):
         """現在の設定（ハイスコア、サウンドON/OFFなど）をファイルに保存する。"""
@@ -384,7 +479,7 @@ class Game:
 
     def _draw_screen(self):
         """描画処理 (Draw)"""
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = render_target.mouse_pos()
         # --- 共通の背景描画 ---
         self.screen.fill(config.BLUE)
         for cloud in self.clouds: cloud.draw(self.screen)
@@ -407,15 +502,16 @@ class Game:
                 pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_ARROW)
             self.tower.draw(self.screen)
             # --- ゲームプレイ中のオブジェクト描画 ---
-            for enemy in self.enemies: enemy.draw(self.screen)
-            for heart in self.heart_items: heart.draw(self.screen)
-            for item in self.speed_up_items: item.draw(self.screen)
-            for item in self.size_up_items: item.draw(self.screen)
-            for p in self.particles: p.draw(self.screen)
+            for enemy in self.entities.enemies: enemy.draw(self.screen)
+            for item in self.entities.items: item.draw(self.screen)
+            # パーティクルと軌道の点は、それぞれ1回のfblitsでまとめて描画する
+            for p in self.particles: p.add_to_batch(sprite_batch)
+            sprite_batch.draw(self.screen)
 
             if self.is_dragging or self.is_release_pending:
                 for point in self.trajectory_points:
-                    pygame.draw.circle(self.screen, config.WHITE, (int(point.x), int(point.y)), config.TRAJECTORY_POINT_RADIUS)
+                    sprite_batch.add_circle(config.WHITE, (int(point.x), int(point.y)), config.TRAJECTORY_POINT_RADIUS)
+                sprite_batch.draw(self.screen)
 
             post_rect = pygame.Rect(
                 self.slingshot_pos.x - config.SLINGSHOT_POST_WIDTH / 2,
@@ -475,21 +571,107 @@ class Game:
                     tower_height=self.game_logic_manager.final_block_count,
                     tower_bonus=self.game_logic_manager.tower_bonus_score,
                     best_tower_height=self.best_tower_height,
-                    mouse_pos=mouse_pos
+                    mouse_pos=mouse_pos,
+                    run_rank=self.last_run_rank
                 )
 
             self.ui_manager.draw_ui_overlays()
 
+    def _gc_phase(self):
+        """GCの制御に使う、現在の場面の名前を返す。"""
+        if self.game_state != "PLAYING":
+            return "TITLE"
+        stage_state = self.game_logic_manager.stage_state
+        if stage_state in ["GAME_OVER", "GAME_WON"]:
+            return "END"
+        return stage_state # "PLAYING" または "CLEARING"
+
+    def _is_animating(self):
+        """
+        画面上で動いているものがあるかを返す。Falseの間は描画と状態の更新の頻度を下げてよい。
+        タイトル画面は、にぎやかし用の敵が常に歩き回っているので、いる間は常にTrueになる。
+        リザルト画面では、弾、パーティクル、敵、アイテム、スコアやコンボの表示が動いている間だけTrueになる。
+        """
+        if self.game_state == "TITLE":
+            scene = self.title_scene
+            return bool(scene.decorative_enemies) or scene.bird.is_flying or scene.is_dragging or scene.is_release_pending
+        if self.game_logic_manager.stage_state not in ["GAME_OVER", "GAME_WON"]:
+            return True # プレイ中とステージクリアの待機中は、常に通常の頻度で描画する
+        return bool(
+            self.bird.is_flying or self.particles or self.entities.enemies or self.entities.items
+            or self.ui_manager.combo_indicators or self.ui_manager.score_indicators
+        )
+
+    async def _wait_while_hidden(self):
+        """タブが非表示、またはウィンドウが最小化されている間、ゲームループを止めて待つ。"""
+        print("画面が非表示になったため、ゲームを一時停止します。")
+        hidden_start_time = pygame.time.get_ticks()
+        if self.mixer_initialized:
+            pygame.mixer.pause()
+            pygame.mixer.music.pause()
+        while self.running and frame_scheduler.is_hidden():
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.running = False
+                frame_scheduler.process_event(event)
+            await asyncio.sleep(config.HIDDEN_POLL_INTERVAL_MS / 1000)
+        if self.mixer_initialized:
+            pygame.mixer.unpause()
+            pygame.mixer.music.unpause()
+        self.clock.tick() # 止まっていた時間を、次のフレームの経過時間に含めない
+        # pygame.time.get_ticks()は止まっている間も進むので、止まっていた時間の分だけゲーム内の時刻をずらす
+        self._shift_clock(pygame.time.get_ticks() - hidden_start_time)
+        print("画面が再表示されたため、ゲームを再開します。")
+
+    def _shift_clock(self, delay):
+        """
+        ゲームが一時停止していた時間を、ゲーム内の時間経過に含めないよう、記録している時刻と予定を後ろへずらす。
+        :param delay: 一時停止していた時間 (ms)
+        """
+        if self.game_state == "TITLE":
+            self.title_scene.shift_clock(delay)
+            return
+        self.run_start_time += delay # プレイ時間にも含めない
+        self.drag_start_time += delay
+        self.release_pending_start_time += delay
+        self.last_activity_time += delay
+        self.game_logic_manager.shift_clock(delay)
+
     async def run(self):
         """ゲームのメインループ"""
         while self.running:
+            if frame_scheduler.is_hidden():
+                await self._wait_while_hidden()
+                continue
+
+            frame_start = time.perf_counter()
             self._handle_events()
-            self._update_state()
+            # 何も動いていない間は、描画と状態の更新の回数を減らし、1回の更新で数フレーム分の時間を進める
+            frames = frame_scheduler.frames_per_update(self._is_animating())
+            self._update_state(frames)
+            # 場面に合わせてGCの動作を切り替える
+            gc_policy.set_phase(self._gc_phase())
+            gc_policy.update()
+            # このフレームに要求されたSEをまとめて再生する
+            if self.audio_manager:
+                self.audio_manager.flush()
+            # 変更がしばらく止まったら、セーブデータをまとめて書き込む
+            self.data_manager.update()
             self._draw_screen()
 
-            pygame.display.flip()
+            render_target.present()
+            input_layer.mark_presented()
+            # 待ち時間を除いた1フレームの処理時間から、画質を調整する (アイドル中のフレームは含めない)
+            if frames == 1:
+                quality_governor.record_frame((time.perf_counter() - frame_start) * 1000)
+            if not startup_profiler.reported:
+                startup_profiler.mark("first frame")
+                startup_profiler.report()
             await asyncio.sleep(0)
-            self.clock.tick(config.FPS)
+            self.clock.tick(config.FPS if frames == 1 else config.IDLE_FPS)
+
+        # 書き込み待ちのセーブデータを確実に保存する
+        self.data_manager.flush()
 
         # ゲームループを抜けたらmixerを終了
         if self.mixer_initialized:
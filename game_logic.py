@@ -9,55 +9,48 @@ from speed_up_item import SpeedUpItem
 from size_up_item import SizeUpItem
 from particle import Particle
 from stage_manager import StageManager
+from spawn_timeline import SpawnTimeline
+from timer_scheduler import timer_scheduler
 from boss_enemy import BossEnemy
 from cloud import Cloud
-from level_utils import create_cloud_layout
-
-def calculate_trajectory(start_pos, launch_vector):
-    """
-    与えられた初期位置と発射ベクトルから、弾の軌道を予測して点のリストを返す。
-    :param start_pos: 軌道計算の開始位置 (Vector2)
-    :param launch_vector: 発射ベクトル (Vector2)
-    :return: 軌道上の点のリスト [Vector2, Vector2, ...]
-    """
-    points = []
-    # 実際の物理演算と同じパラメータで計算
-    velocity = launch_vector * config.LAUNCH_POWER_MULTIPLIER
-    pos = start_pos.copy()
-    
-    # 物理シミュレーションのステップ数
-    # 1ステップが1フレームに相当すると考え、指定した数の点を計算する
-    num_steps = config.TRAJECTORY_NUM_POINTS * config.TRAJECTORY_POINT_GAP
-    for step in range(1, num_steps + 1):
-        velocity.y += config.GRAVITY
-        pos += velocity
-        # 指定した間隔ごとに点をリストに追加
-        if step % config.TRAJECTORY_POINT_GAP == 0:
-            points.append(pos.copy())
-    return points
+from level_utils import create_cloud_layout, generate_cloud_positions
+from physics_utils import swept_circle_circle, swept_circle_rect
+from entity_state import EntityState
+from quality_governor import quality_governor
 
 class GameLogicManager:
     """
     ゲームのロジック（衝突判定、エンティティ生成、状態遷移など）を管理するクラス。
     """
-    def __init__(self, bird, tower, clouds, ground, enemies, heart_items, speed_up_items, size_up_items, particles, slingshot_pos, ui_manager, audio_manager, play_start_sound=True):
+    # アイテムの種類名 (config.ITEM_SPAWN_TYPES) と、そのアイテムのクラス
+    ITEM_CLASSES = {"heart": HeartItem, "speed_up": SpeedUpItem, "size_up": SizeUpItem}
+
+    def __init__(self, bird, tower, clouds, ground, entities, particles, slingshot_pos, ui_manager, audio_manager, play_start_sound=True, run_seed=None):
         # ゲームオブジェクトへの参照を保持
         self.bird = bird
         self.tower = tower
         self.clouds = clouds
         self.ground = ground
-        self.enemies = enemies
-        self.heart_items = heart_items
-        self.speed_up_items = speed_up_items
-        self.size_up_items = size_up_items
+        self.entities = entities # 敵とアイテムを管理するEntityRegistry
         self.particles = particles
         self.slingshot_pos = slingshot_pos
         self.ui_manager = ui_manager
         self.audio_manager = audio_manager
 
+        # アイテムの種類ごとの取得時の処理。取得できた場合はTrueを返す
+        self.item_collect_handlers = {
+            "heart": self._collect_heart_item,
+            "speed_up": self._collect_speed_up_item,
+            "size_up": self._collect_size_up_item,
+        }
+
         # ステージ管理クラスを初期化
         self.stage_manager = StageManager()
 
+        # 各ステージの敵の出現予定を決めるシードの元。指定がなければランダムに決める
+        self.run_seed = run_seed if run_seed is not None else random.getrandbits(31)
+        self.spawn_timeline = None
+
         # ゲーム全体を通しての最大コンボ数を記録
         self.max_combo_count = 0
 
@@ -73,7 +66,7 @@ class GameLogicManager:
 
         # ゲージ満タン演出とアイテム出現のタイミング管理
         self.gauge_max_effect_active = False
-        self.item_spawn_timer = 0
+        self.item_spawn_timer = None # アイテムを出現させるタイマー
 
         # ゲームの状態とタイマーを初期化
         self.reset_level_state(play_sound=play_start_sound)
@@ -85,8 +78,15 @@ class GameLogicManager:
         self.is_bird_callable = False
         self.bird_last_active_time = pygame.time.get_ticks()
 
+        # ステージクリア後の待機中に、次のステージの準備を少しずつ進めるためのジェネレータと、その結果
+        self.next_stage_preparation = None
+        self.prepared_next_stage = None
+
     def update(self):
         """ゲームロジック全体を更新する。メインループから毎フレーム呼ばれる。"""
+        # 時刻を過ぎたタイマー (効果の終了、弱点の切り替えなど) の処理を実行する
+        timer_scheduler.update(pygame.time.get_ticks())
+
         self._check_game_over()
 
         # --- コンボゲージ満タン時の処理 ---
@@ -97,13 +97,10 @@ class GameLogicManager:
             if self.ui_manager: self.ui_manager.start_gauge_flash_effect()
             if self.audio_manager: self.audio_manager.play_gauge_max_sound()
             # アイテム出現までのタイマーをセット (演出時間 + 追加の遅延)
-            self.item_spawn_timer = pygame.time.get_ticks() + config.COMBO_GAUGE_FLASH_DURATION + config.ITEM_SPAWN_DELAY_AFTER_GAUGE_MAX
-
-        # 2. アイテム出現タイマーが満了したら、アイテムを出現させる
-        if self.gauge_max_effect_active and self.item_spawn_timer > 0 and pygame.time.get_ticks() >= self.item_spawn_timer:
-            self._spawn_item_from_gauge()
-            self.gauge_max_effect_active = False # 処理完了
-            self.item_spawn_timer = 0 # タイマーをリセット
+            self.item_spawn_timer = timer_scheduler.schedule(
+                config.COMBO_GAUGE_FLASH_DURATION + config.ITEM_SPAWN_DELAY_AFTER_GAUGE_MAX,
+                self._on_item_spawn_timer
+            )
 
         if self.stage_state == "PLAYING":
             self._spawn_entities()
@@ -115,6 +112,11 @@ class GameLogicManager:
             # ステージクリア後の待機処理
             if not hasattr(self, 'stage_clear_time'):
                 self.stage_clear_time = pygame.time.get_ticks()
+                # 待機中に、次のステージの準備を1フレームに1ステップずつ進める
+                self.next_stage_preparation = self._prepare_next_stage()
+                self.prepared_next_stage = None
+            else:
+                self._step_next_stage_preparation()
             
             if pygame.time.get_ticks() - self.stage_clear_time > config.STAGE_CLEAR_WAIT_TIME:
                 self._transition_to_next_stage()
@@ -131,15 +133,39 @@ class GameLogicManager:
         self.boss_spawned = False
         self.combo_gauge = 0 # ステージ開始時にゲージもリセット
         self.gauge_max_effect_active = False # 演出フラグもリセット
-        self.item_spawn_timer = 0
+        if self.item_spawn_timer:
+            self.item_spawn_timer.cancel()
+        self.item_spawn_timer = None
         # ステージ開始SEを再生
         if play_sound and self.audio_manager:
             self.audio_manager.play_stage_start_sound()
 
-        # 敵の出現タイマーのみリセット
+        # このステージの敵の出現予定を作成する
         settings = self.stage_manager.get_current_stage_settings()
-        spawn_interval = settings.get("enemy_spawn_interval", config.ENEMY_SPAWN_INTERVAL)
-        self.last_enemy_spawn_time = pygame.time.get_ticks() - (spawn_interval - config.FIRST_ENEMY_SPAWN_DELAY)
+        self.spawn_timeline = SpawnTimeline(settings, self.get_stage_seed(), pygame.time.get_ticks())
+
+    def shift_clock(self, delay):
+        """
+        ゲームが一時停止していた時間を、時間経過で進む処理（タイマー、敵の出現、ステージクリア後の待機など）に
+        含めないよう、記録している時刻と予定を後ろへずらす。
+        :param delay: 一時停止していた時間 (ms)
+        """
+        timer_scheduler.shift(delay)
+        if self.spawn_timeline is not None:
+            self.spawn_timeline.shift(delay)
+        if hasattr(self, 'stage_clear_time'):
+            self.stage_clear_time += delay
+        self.bird_last_active_time += delay
+        self.bird.shift_clock(delay)
+
+    def get_stage_seed(self, stage_number=None):
+        """
+        ステージの敵の出現予定を決める乱数のシードを返す。同じプレイの同じステージなら常に同じ値になる。
+        :param stage_number: ステージ番号。省略時は現在のステージ
+        """
+        if stage_number is None:
+            stage_number = self.stage_manager.current_stage
+        return f"{self.run_seed}-{stage_number}"
 
     def _check_game_over(self):
         """ゲームオーバー条件をチェックする。"""
@@ -155,69 +181,47 @@ class GameLogicManager:
 
         if settings.get("is_boss_stage"):
             # --- ボスステージのクリア条件 ---
-            # ボスが出現済みで、かつリスト内にボスが見つからない（倒された）場合にクリア
-            boss_exists = any(isinstance(enemy, BossEnemy) for enemy in self.enemies)
-            if self.boss_spawned and not boss_exists:
+            # ボスが出現済みで、かつボスがいなくなった（倒された）場合にクリア
+            if self.boss_spawned and self.entities.boss is None:
                 self.stage_state = "CLEARING"
                 print(f"ボスを撃破！ステージクリア！ ({self.stage_manager.current_stage})")
                 # ボス撃破時に残りのザコ敵を全滅させる
-                for enemy in self.enemies:
-                    if not isinstance(enemy, BossEnemy):
-                        enemy.destroy()
+                for kind, bucket in self.entities.enemy_buckets.items():
+                    if kind != "boss":
+                        for enemy in bucket:
+                            enemy.destroy()
         else:
             # --- 通常ステージのクリア条件 ---
             if self.enemies_defeated_count >= settings["clear_enemies_count"]:
                 self.stage_state = "CLEARING"
                 print(f"ステージクリア！ ({self.stage_manager.current_stage}) 残りの敵を掃討します。")
                 # 画面上の残りの敵を全滅させる
-                for enemy in self.enemies:
+                for enemy in self.entities.enemies:
                     enemy.destroy()
 
     def _spawn_entities(self):
-        """敵やハートアイテムを時間経過で出現させる。"""
-        current_time = pygame.time.get_ticks()
-        settings = self.stage_manager.get_current_stage_settings()
-        if not settings:
-            return # 設定がなければ何もしない
-
-        # ステージ設定からステータス補正値を取得
-        stat_multiplier = settings.get("stat_multiplier", {"hp": 1.0, "speed": 1.0, "attack": 1.0})
-
-        # --- ボスステージの特別処理 ---
-        if settings.get("is_boss_stage") and not self.boss_spawned:
-            # ボスを一度だけ出現させる
-            if settings.get("boss_type") == "giant_square":
-                self.enemies.append(BossEnemy(stat_multiplier))
-                self.boss_spawned = True
-
-        # 敵の出現間隔をステージ設定から取得
-        enemy_spawn_interval = settings.get("enemy_spawn_interval", config.ENEMY_SPAWN_INTERVAL)
-        # 敵の出現処理
-        if current_time - self.last_enemy_spawn_time > enemy_spawn_interval:
-            # タイマーを更新
-            self.last_enemy_spawn_time = current_time
-
-            enemy_weights = settings.get("enemy_weights")
-            # 重みが設定されていない、または空の場合は敵を出現させない（ボスステージなどを想定）
-            if not enemy_weights:
-                return
-
-            enemy_types = list(enemy_weights.keys())
-            weights = list(enemy_weights.values())
-            
-            # 重みに基づいて敵の種類を決定
-            chosen_enemy_type = random.choices(enemy_types, weights=weights, k=1)[0]
+        """出現予定の時刻を過ぎた敵を出現させる。"""
+        timeline = self.spawn_timeline
+        # 次の出現時刻をまだ過ぎていなければ何もしない (毎フレームの処理はこの比較だけ)
+        if timeline is None or timeline.next_time is None or pygame.time.get_ticks() <= timeline.next_time:
+            return
 
-            if chosen_enemy_type == "flying":
-                spawn_x = config.SCREEN_WIDTH + config.FLYING_ENEMY_MAX_SIZE / 2
-                spawn_y = random.uniform(config.FLYING_ENEMY_MIN_Y, config.FLYING_ENEMY_MAX_Y)
-                self.enemies.append(FlyingEnemy(spawn_x, spawn_y, stat_multiplier))
+        stat_multiplier = timeline.stat_multiplier
+        for _, _, enemy_type, spawn_pos, size in timeline.pop_due(pygame.time.get_ticks()):
+            if enemy_type == "boss":
+                # --- ボスステージの特別処理 ---
+                settings = self.stage_manager.get_current_stage_settings()
+                if settings.get("boss_type") == "giant_square":
+                    self.entities.add_enemy(BossEnemy(stat_multiplier))
+                    self.boss_spawned = True
+            elif enemy_type == "flying":
+                self.entities.add_enemy(FlyingEnemy(spawn_pos[0], spawn_pos[1], stat_multiplier, size=size))
                 print("飛行する敵が出現！")
-            elif chosen_enemy_type == "ground":
-                self.enemies.append(Enemy(stat_multiplier))
+            elif enemy_type == "ground":
+                self.entities.add_enemy(Enemy(stat_multiplier, size=size))
                 print("地上の敵が出現！")
-            elif chosen_enemy_type == "jumping":
-                self.enemies.append(JumpingEnemy(stat_multiplier))
+            elif enemy_type == "jumping":
+                self.entities.add_enemy(JumpingEnemy(stat_multiplier, size=size))
                 print("ジャンプする敵が出現！")
 
     def _increase_combo_gauge(self):
@@ -227,12 +231,16 @@ class GameLogicManager:
         self.combo_gauge = min(self.combo_gauge, config.COMBO_GAUGE_MAX)
         # print(f"ゲージ増加: +{increase_amount:.0f} -> 現在のゲージ: {self.combo_gauge:.0f}/{config.COMBO_GAUGE_MAX}") # デバッグ用
 
+    def _on_item_spawn_timer(self):
+        """アイテム出現タイマーが満了した時に呼ばれ、アイテムを出現させる。"""
+        self._spawn_item_from_gauge()
+        self.gauge_max_effect_active = False # 処理完了
+        self.item_spawn_timer = None
+
     def _spawn_item_from_gauge(self):
         """コンボゲージが満タンになった時にアイテムを抽選・出現させる。"""
         # アイテムの抽選
-        item_types = list(config.ITEM_SPAWN_CHANCES.keys())
-        weights = list(config.ITEM_SPAWN_CHANCES.values())
-        chosen_item_type = random.choices(item_types, weights=weights, k=1)[0]
+        chosen_item_type = random.choices(config.ITEM_SPAWN_TYPES, cum_weights=config.ITEM_SPAWN_CUM_WEIGHTS, k=1)[0]
         print(f"ゲージ満タン！ アイテム抽選結果: {chosen_item_type}")
 
         # アイテムが乗っていない雲を探す
@@ -244,12 +252,7 @@ class GameLogicManager:
             chosen_cloud.has_item = True # 雲にアイテムが乗ったことを記録
             if self.audio_manager: self.audio_manager.play_item_spawn_sound()
             print(f"アイテムを雲の上に出現させます。")
-            if chosen_item_type == "heart":
-                self.heart_items.append(HeartItem(parent_cloud=chosen_cloud))
-            elif chosen_item_type == "speed_up":
-                self.speed_up_items.append(SpeedUpItem(parent_cloud=chosen_cloud))
-            elif chosen_item_type == "size_up":
-                self.size_up_items.append(SizeUpItem(parent_cloud=chosen_cloud))
+            self.entities.add_item(self.ITEM_CLASSES[chosen_item_type](parent_cloud=chosen_cloud))
         else:
             # 空いている雲がなければ、空中に直接配置
             print("アイテムを空中に出現させます。")
@@ -257,13 +260,7 @@ class GameLogicManager:
             spawn_x = random.uniform(config.AIR_ITEM_SPAWN_X_MIN, config.AIR_ITEM_SPAWN_X_MAX)
             spawn_y = random.uniform(config.AIR_ITEM_SPAWN_Y_MIN, config.AIR_ITEM_SPAWN_Y_MAX)
             air_position = pygame.math.Vector2(spawn_x, spawn_y)
-
-            if chosen_item_type == "heart":
-                self.heart_items.append(HeartItem(position=air_position))
-            elif chosen_item_type == "speed_up":
-                self.speed_up_items.append(SpeedUpItem(position=air_position))
-            elif chosen_item_type == "size_up":
-                self.size_up_items.append(SizeUpItem(position=air_position))
+            self.entities.add_item(self.ITEM_CLASSES[chosen_item_type](position=air_position))
 
         # ゲージをリセット
         self.combo_gauge = 0
@@ -271,13 +268,94 @@ class GameLogicManager:
     def _handle_collisions(self):
         """全ての衝突判定を処理する。"""
         self._handle_enemy_tower_collision()
+        if self.bird.is_flying and config.BIRD_CCD_ENABLED:
+            self._resolve_swept_bird_contacts()
+        if self.bird.is_flying:
+            self._handle_bird_collisions()
+
+    def _resolve_swept_bird_contacts(self):
+        """
+        高速な弾が1フレームで障害物をすり抜けないよう、連続衝突判定で接触を解決する。
+        このフレームの移動線分上で最も早い接触まで弾を巻き戻し、通常の衝突処理でバウンドさせた後、
+        残りの移動を新しい速度で続ける。これを接触がなくなるまで（最大数まで）時刻順に繰り返す。
+        バウンドが起きなかった障害物は以降の判定から除き、その接触点から移動後の位置までを続けて判定するので、
+        その先にある別の障害物もすり抜けない。
+        """
+        bird = self.bird
+        passed = set() # バウンドせずに通り抜けた障害物 (このフレームでは再び判定しない)
+        for _ in range(config.BIRD_CCD_MAX_CONTACTS):
+            contact = self._find_earliest_bird_contact(passed)
+            if contact is None:
+                return
+            toi, obstacle = contact
+
+            end_pos = bird.pos.copy()
+            velocity_before = bird.velocity.copy()
+            remaining = bird.rewind_to_contact(toi)
+            self._handle_bird_collisions()
+            if not bird.is_flying:
+                return # 衝突処理の結果、弾がリセットされた
+
+            if bird.velocity == velocity_before:
+                # バウンドが起きなかった場合は、その障害物を除いて、接触点から移動後の位置までを判定し直す
+                passed.add(obstacle)
+                bird.prev_pos.update(bird.pos)
+                bird.pos = end_pos
+                continue
+
+            # 残りの移動を、バウンド後の速度で消化する
+            bird.prev_pos.update(bird.pos)
+            bird.pos += bird.velocity * remaining
+
+    def _find_earliest_bird_contact(self, excluded=()):
+        """
+        弾の今フレームの移動線分上で、最も早く接触する障害物と、その接触時刻を返す。
+        移動量が半径未満なら通常の判定で十分なので、計算を省略してNoneを返す。
+        通常の衝突処理で当たらない障害物（安全時間中の雲と塔、無効な弱点、死亡中の敵）は判定しない。
+        :param excluded: 判定から除く障害物
+        :return: (接触時刻 (0.0 ~ 1.0), 障害物)。接触がなければNone
+        """
+        bird = self.bird
+        start, end, radius = bird.prev_pos, bird.pos, bird.radius
+        if start.distance_squared_to(end) < radius * radius:
+            return None
+
+        time_since_launch = pygame.time.get_ticks() - bird.launch_time if bird.launch_time is not None else 0
+        earliest = None
+
+        def consider(toi, obstacle):
+            nonlocal earliest
+            if toi is not None and (earliest is None or toi < earliest[0]) and obstacle not in excluded:
+                earliest = (toi, obstacle)
+
+        if time_since_launch >= config.CLOUD_COLLISION_SAFE_TIME:
+            for cloud in self.clouds:
+                for puff_center, puff_radius in cloud.puffs:
+                    consider(swept_circle_circle(start, end, radius, puff_center, puff_radius), cloud)
+
+        if time_since_launch > config.TOWER_COLLISION_SAFE_TIME:
+            for block in self.tower.blocks:
+                consider(swept_circle_rect(start, end, radius, block.rect), block)
+
+        boss = self.entities.boss
+        if boss is not None:
+            for wp in boss.weak_points:
+                if wp.is_active:
+                    consider(swept_circle_rect(start, end, radius, wp.rect), wp)
+        for enemy in self.entities.enemies:
+            if enemy.state in (EntityState.DYING, EntityState.DESTROYED):
+                continue
+            consider(swept_circle_rect(start, end, radius, enemy.rect), enemy)
+
+        return earliest
+
+    def _handle_bird_collisions(self):
+        """弾と各オブジェクトの（離散的な）衝突判定を処理する。"""
         if self.bird.is_flying:
             self._handle_bird_wall_collision()
             self._handle_bird_cloud_collision()
             self._handle_bird_tower_collision()
-            self._handle_bird_heart_collision()
-            self._handle_bird_speed_up_collision()
-            self._handle_bird_size_up_collision()
+            self._handle_bird_item_collision()
             self._handle_bird_enemy_collision()
             self._handle_bird_ground_collision()
 
@@ -316,13 +394,14 @@ class GameLogicManager:
             if self.audio_manager: self.audio_manager.play_combo_sound()
 
     def _handle_enemy_tower_collision(self):
-        for enemy in self.enemies:
-            if enemy.state != "DYING" and not enemy.velocity.length_squared() > 0.1:
+        boss = self.entities.boss
+        for enemy in self.entities.enemies:
+            if enemy.state != EntityState.DYING and not enemy.velocity.length_squared() > 0.1:
                 for block in self.tower.blocks:
                     if enemy.rect.colliderect(block.rect):
                         # --- ボスの場合、弱点との衝突か判定 ---
                         is_weak_point_hit_by_tower = False
-                        if isinstance(enemy, BossEnemy):
+                        if enemy is boss:
                             for wp in enemy.weak_points:
                                 # 弱点がアクティブで、かつブロックと衝突しているか
                                 if wp.is_active and wp.rect.colliderect(block.rect):
@@ -342,7 +421,7 @@ class GameLogicManager:
                         # タワーからの反撃ダメージ（弱点にヒットした場合は無効）
                         if not is_weak_point_hit_by_tower:
                             is_enemy_defeated = enemy.take_damage(config.TOWER_CONTACT_DAMAGE)
-                            if is_enemy_defeated and not isinstance(enemy, BossEnemy):
+                            if is_enemy_defeated and enemy is not boss:
                                 if self.audio_manager: self.audio_manager.play_enemy_death_sound()
                                 self.enemies_defeated_count += 1
                         else:
@@ -355,7 +434,7 @@ class GameLogicManager:
                         direction.normalize_ip()
 
                         # ボスかどうかでノックバックの力を変える
-                        if isinstance(enemy, BossEnemy):
+                        if enemy is boss:
                             knockback_force = config.BOSS_TOWER_CONTACT_KNOCKBACK_FORCE
                         else:
                             knockback_force = config.TOWER_KNOCKBACK_FORCE
@@ -411,56 +490,45 @@ class GameLogicManager:
                         block.start_animation()
                         break
 
-    def _handle_bird_heart_collision(self):
-        for i in range(len(self.heart_items) - 1, -1, -1):
-            heart = self.heart_items[i]
-            if heart.collide_with_bird(self.bird):
-                print("ハートアイテムを獲得！")
-                if self.tower.repair_one_block():
-                    if self.audio_manager: self.audio_manager.play_heart_collect_sound()
-                    self._spawn_particles(heart.pos, config.PARTICLE_COUNT_ON_HEART_COLLECT, config.PARTICLE_LIFETIME, config.PARTICLE_MIN_SPEED, config.PARTICLE_MAX_SPEED, config.PARTICLE_GRAVITY, config.PARTICLE_START_SIZE, config.PARTICLE_END_SIZE, config.PARTICLE_COLORS)
-                    if heart.parent_cloud:
-                        heart.parent_cloud.has_item = False # 雲のフラグをリセット
-                    del self.heart_items[i]
-                    self.bird.power_up()
-                    break
-
-    def _handle_bird_speed_up_collision(self):
-        """バードとスピードアップアイテムの衝突を処理する。"""
-        for i in range(len(self.speed_up_items) - 1, -1, -1):
-            item = self.speed_up_items[i]
-            if item.collide_with_bird(self.bird):
-                print("スピードアップアイテムを獲得！")
-                self.bird.apply_speed_boost()
-                if self.audio_manager: self.audio_manager.play_speed_up_collect_sound()
+    def _handle_bird_item_collision(self):
+        """バードとアイテムの衝突を処理する。アイテムの効果は種類ごとの処理に任せる。"""
+        for item in self.entities.items:
+            if item.collide_with_bird(self.bird) and self.item_collect_handlers[item.item_kind]():
                 self._spawn_particles(item.pos, config.PARTICLE_COUNT_ON_HEART_COLLECT, config.PARTICLE_LIFETIME, config.PARTICLE_MIN_SPEED, config.PARTICLE_MAX_SPEED, config.PARTICLE_GRAVITY, config.PARTICLE_START_SIZE, config.PARTICLE_END_SIZE, config.PARTICLE_COLORS)
                 if item.parent_cloud:
                     item.parent_cloud.has_item = False # 雲のフラグをリセット
-                del self.speed_up_items[i]
-                # スピードアップはコンボにはならないが、パワーアップはする
+                self.entities.remove_item(item)
+                # アイテムはコンボにはならないが、パワーアップはする
                 self.bird.power_up()
                 break
 
-    def _handle_bird_size_up_collision(self):
-        """バードと巨大化アイテムの衝突を処理する。"""
-        for i in range(len(self.size_up_items) - 1, -1, -1):
-            item = self.size_up_items[i]
-            if item.collide_with_bird(self.bird):
-                print("巨大化アイテムを獲得！")
-                self.bird.apply_size_boost()
-                if self.audio_manager: self.audio_manager.play_size_up_collect_sound()
-                self._spawn_particles(item.pos, config.PARTICLE_COUNT_ON_HEART_COLLECT, config.PARTICLE_LIFETIME, config.PARTICLE_MIN_SPEED, config.PARTICLE_MAX_SPEED, config.PARTICLE_GRAVITY, config.PARTICLE_START_SIZE, config.PARTICLE_END_SIZE, config.PARTICLE_COLORS)
-                if item.parent_cloud:
-                    item.parent_cloud.has_item = False # 雲のフラグをリセット
-                del self.size_up_items[i]
-                # 巨大化もコンボにはならないが、パワーアップはする
-                self.bird.power_up()
-                break
+    def _collect_heart_item(self):
+        """ハートアイテムの効果: タワーを1段修復する。修復できるブロックがなければ取得しない。"""
+        print("ハートアイテムを獲得！")
+        if not self.tower.repair_one_block():
+            return False
+        if self.audio_manager: self.audio_manager.play_heart_collect_sound()
+        return True
+
+    def _collect_speed_up_item(self):
+        """スピードアップアイテムの効果: バードを加速させる。"""
+        print("スピードアップアイテムを獲得！")
+        self.bird.apply_speed_boost()
+        if self.audio_manager: self.audio_manager.play_speed_up_collect_sound()
+        return True
+
+    def _collect_size_up_item(self):
+        """巨大化アイテムの効果: バードを一定時間巨大化させる。"""
+        print("巨大化アイテムを獲得！")
+        self.bird.apply_size_boost()
+        if self.audio_manager: self.audio_manager.play_size_up_collect_sound()
+        return True
 
     def _handle_bird_enemy_collision(self):
-        for enemy in reversed(self.enemies):
+        boss = self.entities.boss
+        for enemy in reversed(self.entities.enemies):
             # --- ボスとの衝突判定ロジック ---
-            if isinstance(enemy, BossEnemy):
+            if enemy is boss:
                 # 1. アクティブな弱点との衝突判定を先に試みる
                 hit_weak_point = False
                 for wp in enemy.weak_points:
@@ -624,12 +692,12 @@ class GameLogicManager:
             self.bird.low_velocity_start_time = None
 
     def _cleanup_entities(self):
-        """不要になったエンティティ（敵、パーティクル）をリストから削除する。"""
+        """不要になったエンティティ（敵、パーティクル）を削除する。"""
         # 寿命が尽きたパーティクルを削除
         self.particles[:] = [p for p in self.particles if p.is_alive()]
 
         # 死亡アニメーションが完了した、または画面外に出た敵を削除
-        self.enemies[:] = [enemy for enemy in self.enemies if not enemy.is_finished() and enemy.rect.right > 0]
+        self.entities.remove_finished_enemies()
 
     def _transition_to_next_stage(self):
         """次のステージへの移行処理を行う。"""
@@ -645,13 +713,23 @@ class GameLogicManager:
         # --- 次のステージの準備 ---
         print(f"--- Preparing for Stage {self.stage_manager.current_stage} ---")
         
+        # 待機中に終わらなかった準備があれば、ここで最後まで進める
+        while self.next_stage_preparation is not None:
+            self._step_next_stage_preparation()
+        prepared = self.prepared_next_stage or {}
+        self.prepared_next_stage = None
+
         # 次のステージの設定を取得
         settings = self.stage_manager.get_current_stage_settings()
 
         # 設定に基づいて雲を再配置するか決定
         if settings.get("rearrange_clouds", False):
             print("Rearranging clouds for the new stage.")
-            self._generate_new_clouds()
+            if "clouds" in prepared:
+                # 準備済みの雲に差し替える (リストはGameと共有しているので中身だけ入れ替える)
+                self.clouds[:] = prepared["clouds"]
+            else:
+                self._generate_new_clouds()
         else:
             print("Keeping existing clouds for the new stage.")
 
@@ -659,16 +737,56 @@ class GameLogicManager:
         self.reset_level_state()
         
         # 前のステージのエンティティをクリア
-        self.enemies.clear()
-        self.heart_items.clear()
-        self.speed_up_items.clear()
-        self.size_up_items.clear()
+        self.entities.clear()
         self.particles.clear()
 
         # バードをリセット
         if self.audio_manager: self.audio_manager.reset_scale()
         self.bird.reset(self.slingshot_pos)
 
+    def _prepare_next_stage(self):
+        """
+        次のステージで必要になるもの（雲の配置、弾の画像、BGM）を用意するジェネレータ。
+        1ステップごとにyieldするので、ステージクリア後の待機中に1フレームずつ進められる。
+        結果はprepared_next_stageに格納し、_transition_to_next_stageで差し替えに使う。
+        """
+        prepared = {}
+        next_settings = self.stage_manager.get_next_stage_settings()
+        if next_settings is None:
+            # 最終ステージなので準備するものはない
+            self.prepared_next_stage = prepared
+            return
+
+        # 1. 雲の配置を決め、雲を1つずつ作る
+        if next_settings.get("rearrange_clouds", False):
+            positions = generate_cloud_positions(self.slingshot_pos.x, self.tower.get_top_y())
+            yield
+            clouds = []
+            for x, y in positions:
+                clouds.append(Cloud(x, y, random.randint(3, 5)))
+                yield
+            prepared["clouds"] = clouds
+
+        # 2. リセット後の弾の画像を描画しておく
+        self.bird.get_image(self.bird.original_radius)
+        yield
+
+        # 3. 次がボスステージで、AudioManager.preload()がまだボス戦BGMを読み込んでいなければ、ここで読み込んでおく
+        if next_settings.get("is_boss_stage", False) and self.audio_manager:
+            self.audio_manager.prefetch_music("boss")
+            yield
+
+        self.prepared_next_stage = prepared
+
+    def _step_next_stage_preparation(self):
+        """次のステージの準備を1ステップ進める。"""
+        if self.next_stage_preparation is None:
+            return
+        try:
+            next(self.next_stage_preparation)
+        except StopIteration:
+            self.next_stage_preparation = None
+
     def _generate_new_clouds(self):
         """雲を新しく生成し、既存の雲リストを置き換える。"""
         slingshot_x = self.slingshot_pos.x
@@ -681,8 +799,8 @@ class GameLogicManager:
         self.clouds.extend(new_clouds)
 
     def _spawn_particles(self, pos, count, lifetime, min_speed, max_speed, gravity, start_size, end_size, colors):
-        """指定された設定でパーティクルを生成し、リストに追加する。"""
-        for _ in range(count):
+        """指定された設定でパーティクルを生成し、リストに追加する。数は現在の画質に合わせて減らす。"""
+        for _ in range(quality_governor.scale_particle_count(count)):
             self.particles.append(Particle(
                 pos.x, pos.y,
                 lifetime,
@@ -714,8 +832,8 @@ class GameLogicManager:
             linear_bonus = (combo_count - 1) * config.SCORE_COMBO_LINEAR_BONUS
 
             # 段階ボーナス
-            # configの辞書を降順でループして、条件に合う最初のボーナスを適用
-            for tier, bonus in sorted(config.SCORE_COMBO_TIER_BONUS.items(), reverse=True):
+            # 降順に並べ済みの段階をループして、条件に合う最初のボーナスを適用
+            for tier, bonus in config.SCORE_COMBO_TIERS_DESC:
                 if combo_count >= tier:
                     tiered_bonus = bonus
                     break
@@ -743,10 +861,7 @@ class GameLogicManager:
     @property
     def current_boss(self):
         """現在のボスインスタンスが存在すればそれを、なければNoneを返す。"""
-        for enemy in self.enemies:
-            if isinstance(enemy, BossEnemy):
-                return enemy
-        return None
+        return self.entities.boss
 
     def jump_to_stage(self, stage_number):
         """指定されたステージにジャンプする（デバッグ用）。"""
@@ -757,17 +872,16 @@ class GameLogicManager:
             
             # 既存の移行処理を参考にリセット
             self.reset_level_state() # stage_stateをPLAYINGに戻す
-            self.enemies.clear()
-            self.heart_items.clear()
-            self.speed_up_items.clear()
-            self.size_up_items.clear()
+            self.entities.clear()
             self.particles.clear()
             if self.audio_manager: self.audio_manager.reset_scale()
             self.bird.reset(self.slingshot_pos)
             
-            # ステージクリア待機タイマーが存在すれば削除
+            # ステージクリア待機タイマーと、進めていた次のステージの準備が存在すれば破棄
             if hasattr(self, 'stage_clear_time'):
                 del self.stage_clear_time
+            self.next_stage_preparation = None
+            self.prepared_next_stage = None
         else:
             print(f"Debug: Stage {stage_number} does not exist.")
 
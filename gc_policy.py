@@ -0,0 +1,99 @@
+import gc
+import time
+import config
+from profiler import pause_profiler
+
+class GCPolicy:
+    """
+    ゲームの場面に合わせて、PythonのGC（循環参照の回収）が動くタイミングを制御するクラス。
+    - 起動時に作られ、最後まで使われ続けるオブジェクト（モジュール、フォント、設定、音声など）は
+      gc.freeze()でGCの対象外にし、以降のGCで毎回たどられないようにする
+    - プレイ中は自動GCを止める（またはしきい値を上げる）ので、弾が飛んでいる最中にGCで止まらない
+    - ステージクリアの待機中、リザルト画面、タイトル画面といった、多少止まっても気にならない場面に
+      入った時にまとめて回収する
+    自動・手動どちらのGCも、停止時間をpause_profilerに記録する。
+    """
+    # 入った時にまとめて回収する場面
+    PAUSE_PHASES = ("TITLE", "CLEARING", "END")
+
+    def __init__(self):
+        self.enabled = config.GC_POLICY_ENABLED
+        self.phase = None # 現在の場面 ("TITLE", "PLAYING", "CLEARING", "END")
+        self.default_thresholds = gc.get_threshold()
+        self.collecting = False # collect()による手動の回収中か
+        self.auto_start_time = None
+        if self.enabled:
+            gc.callbacks.append(self._on_gc)
+
+    def _on_gc(self, phase, info):
+        """GCの開始・終了時にPythonから呼ばれ、自動GCの停止時間を記録する。"""
+        if phase == "start":
+            self.auto_start_time = time.perf_counter()
+        elif self.auto_start_time is not None:
+            if not self.collecting: # 手動の回収はcollect()の方で記録する
+                duration = (time.perf_counter() - self.auto_start_time) * 1000
+                pause_profiler.record(f"gc auto gen{info['generation']} ({self.phase or 'STARTUP'})", duration)
+            self.auto_start_time = None
+
+    def collect(self, generation=2, label=None):
+        """
+        GCを手動で実行し、停止時間を記録する。
+        :param generation: 回収する世代 (2なら全世代)
+        :param label: 記録に使う名前。省略時は現在の場面の名前
+        :return: 回収したオブジェクトの数
+        """
+        self.collecting = True
+        start = time.perf_counter()
+        try:
+            collected = gc.collect(generation)
+        finally:
+            self.collecting = False
+        pause_profiler.record(f"gc collect gen{generation} ({label or self.phase or 'STARTUP'})", (time.perf_counter() - start) * 1000)
+        return collected
+
+    def freeze_long_lived(self, label):
+        """
+        不要なオブジェクトを回収してから、現在生きている全てのオブジェクトをGCの対象外にする。
+        ここで凍結したオブジェクトは、以降のGCでたどられなくなる。
+        ゲームのオブジェクト（タイトル画面のものも含む）を作る前の、起動時にだけ呼ぶこと。
+        :param label: 記録に使う名前
+        """
+        if not self.enabled:
+            return
+        self.collect(label=label)
+        gc.freeze()
+        print(f"GC: {gc.get_freeze_count()} 個のオブジェクトを凍結しました ({label})")
+
+    def set_phase(self, phase):
+        """
+        現在の場面を設定する。毎フレーム呼んでよく、場面が変わった時だけGCの設定を切り替える。
+        :param phase: "TITLE", "PLAYING", "CLEARING", "END" のいずれか
+        """
+        if not self.enabled or phase == self.phase:
+            return
+        self.phase = phase
+
+        if phase == "PLAYING":
+            if config.GC_DISABLE_DURING_PLAY:
+                gc.disable()
+            else:
+                gc.set_threshold(*config.GC_PLAYING_THRESHOLDS)
+            return
+
+        gc.set_threshold(*self.default_thresholds)
+        gc.enable()
+        if phase in self.PAUSE_PHASES:
+            # プレイ中にたまった循環参照を、止まっても気にならない今のうちに回収する
+            self.collect()
+
+    def update(self):
+        """
+        毎フレーム呼ぶ。プレイ中に自動GCを止めている場合でも、
+        未回収の割り当てが増えすぎたら若い世代だけを回収して、メモリが増え続けないようにする。
+        """
+        if self.enabled and self.phase == "PLAYING" and not gc.isenabled():
+            if gc.get_count()[0] > config.GC_PLAYING_MAX_PENDING:
+                self.collect(0)
+
+# アプリ全体で共有するGCの制御用インスタンス
+gc_policy = GCPolicy()
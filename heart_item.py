@@ -8,6 +8,9 @@ class HeartItem(BaseItem):
     雲の上に出現するハートアイテムを管理するクラス。
     取得するとタワーを修復する効果を持つ。
     """
+    item_kind = "heart" # config.ITEM_SPAWN_TYPESでの種類名
+    __slots__ = ("color",)
+
     def __init__(self, parent_cloud=None, position=None):
         # 親クラスの初期化を呼び出し、共通の属性を設定
         super().__init__(parent_cloud, position, config.HEART_ITEM_SIZE)
@@ -0,0 +1,89 @@
+import time
+import pygame
+from profiler import input_latency_profiler
+
+# 1フレームに何個届いても、最新の1個だけを処理すればよいイベント
+MOTION_EVENT_TYPES = (pygame.MOUSEMOTION, pygame.FINGERMOTION)
+
+class InputLayer:
+    """
+    イベントキューからの入力の受け取りをまとめるクラス。
+    - 同じフレームに届いた移動イベント (MOUSEMOTION / FINGERMOTION) は、最新の位置だけを残す。
+      マウスの移動量 (rel) は足し合わせる。押す・離すなどの他のイベントとの順序は保つ
+    - イベントを受け取った時刻を記録し、指を離してから弾が発射されるまで、
+      および発射後の画面が表示されるまでの時間をinput_latency_profilerに記録する
+    pygameのイベントは発生時刻を持たないため、時刻はイベントキューから取り出した時点のものを使う。
+    """
+    def __init__(self):
+        self.poll_time = 0.0 # 直近でイベントを取り出した時刻 (perf_counterの秒)
+        self.received_count = 0 # 受け取ったイベントの数
+        self.delivered_count = 0 # まとめた後に処理へ渡したイベントの数
+        self.release_time = None # 発射につながる可能性のある、直近のリリースの時刻
+        self.launch_time = None # 画面に表示されるのを待っている発射の時刻
+
+    def poll(self):
+        """
+        イベントキューから全てのイベントを取り出し、移動イベントをまとめて返す。
+        :return: 処理するイベントのリスト
+        """
+        self.poll_time = time.perf_counter()
+        events = pygame.event.get()
+        self.received_count += len(events)
+        coalesced = []
+        pending_motion = {} # (イベントの種類, 指のID) -> coalesced内の位置
+        for event in events:
+            if event.type not in MOTION_EVENT_TYPES:
+                pending_motion.clear() # 押す・離すより前の移動は、それより後の移動とまとめない
+                coalesced.append(event)
+                continue
+            key = (event.type, getattr(event, "finger_id", None))
+            index = pending_motion.get(key)
+            if index is None:
+                pending_motion[key] = len(coalesced)
+                coalesced.append(event)
+            else:
+                previous = coalesced[index]
+                if event.type == pygame.MOUSEMOTION:
+                    event.rel = (previous.rel[0] + event.rel[0], previous.rel[1] + event.rel[1])
+                else:
+                    event.dx += previous.dx
+                    event.dy += previous.dy
+                coalesced[index] = event
+        self.delivered_count += len(coalesced)
+        return coalesced
+
+    def mark_release(self):
+        """ドラッグを離した入力を受け取ったことを記録する。"""
+        self.release_time = self.poll_time
+
+    def mark_launch(self):
+        """弾を発射したことを記録し、リリースから発射までの時間を記録する。"""
+        now = time.perf_counter()
+        if self.release_time is not None:
+            input_latency_profiler.record("release -> launch", (now - self.release_time) * 1000)
+            self.launch_time = self.release_time
+            self.release_time = None
+
+    def cancel_release(self):
+        """リリースが発射につながらなかった場合に呼ぶ。"""
+        self.release_time = None
+
+    def mark_presented(self):
+        """画面を表示した直後に呼ぶ。発射後の最初の表示なら、リリースから表示までの時間を記録する。"""
+        if self.launch_time is not None:
+            input_latency_profiler.record("release -> present", (time.perf_counter() - self.launch_time) * 1000)
+            self.launch_time = None
+
+    def report(self):
+        """まとめたイベントの数と、入力の遅延を表示する。"""
+        print(f"Input events: received {self.received_count}, processed {self.delivered_count}")
+        input_latency_profiler.report()
+
+    def clear(self):
+        """イベントの数と入力の遅延の記録を消す。1プレイ分の表示を終えた後に呼ぶ。"""
+        self.received_count = 0
+        self.delivered_count = 0
+        input_latency_profiler.clear()
+
+# アプリ全体で共有する入力の管理用インスタンス
+input_layer = InputLayer()
@@ -2,21 +2,34 @@ import pygame
 import random
 import config
 from enemy import Enemy
+from timer_scheduler import timer_scheduler
+from entity_state import EntityState, JumpState
+from quality_governor import quality_governor
 
 class JumpingEnemy(Enemy):
     """
     地面をジャンプしながら移動する、丸い敵を管理するクラス。
     基本的な機能はEnemyクラスを継承する。
     """
-    def __init__(self, stat_multiplier):
+    sprite_kind = "jumping_enemy"
+    entity_kind = "jumping"
+    __slots__ = ("radius", "jump_state", "can_jump", "jump_cooldown", "jump_timer")
+
+    def __init__(self, stat_multiplier, size=None):
+        """
+        :param stat_multiplier: ステータス補正値の辞書
+        :param size: 敵の大きさ。省略時はランダムに決める
+        """
         # 親クラスの初期化を呼び出す。これにより、基本的な属性(state, is_animatingなど)が設定される。
         # ただし、ステータスや位置は後で上書きする。
         super().__init__(stat_multiplier)
 
         # --- ジャンパー固有のステータスで上書き ---
-        size = random.uniform(config.JUMPING_ENEMY_MIN_SIZE, config.JUMPING_ENEMY_MAX_SIZE)
+        if size is None:
+            size = random.uniform(config.JUMPING_ENEMY_MIN_SIZE, config.JUMPING_ENEMY_MAX_SIZE)
         self.radius = size / 2
         self.original_width = size  # 親クラスとの互換性のため
+        self.death_effect_max_radius = (size / 2) * config.ENEMY_DEATH_EFFECT_MAX_RADIUS_MULTIPLIER
         self.original_height = size
 
         # ステータス計算
@@ -36,24 +49,75 @@ class JumpingEnemy(Enemy):
         self.pos = pygame.math.Vector2(start_x, start_y)
         
         # Rectをposに合わせて再生成
-        self.rect = pygame.Rect(self.pos.x, self.pos.y, self.original_width, self.original_height)
+        self.rect = pygame.FRect(self.pos.x, self.pos.y, self.original_width, self.original_height)
 
         # --- ジャンプ関連の属性 (ステップ3で利用) ---
-        self.jump_state = "ON_GROUND" # "ON_GROUND", "JUMPING"
+        self.jump_state = JumpState.ON_GROUND # ON_GROUND, JUMPING
+        self.can_jump = False # 待機時間が過ぎてジャンプできる状態か
+        self._schedule_next_jump()
+
+        # 通常時の見た目を出現時に焼き込んでおく
+        self.get_sprite()
+
+    def _schedule_next_jump(self):
+        """次のジャンプまでの待機時間をランダムに決め、過ぎたらジャンプできるようにする。"""
+        self.can_jump = False
         self.jump_cooldown = random.uniform(
             config.JUMPING_ENEMY_JUMP_COOLDOWN_MIN,
             config.JUMPING_ENEMY_JUMP_COOLDOWN_MAX
         )
-        self.last_jump_time = pygame.time.get_ticks()
+        self.jump_timer = timer_scheduler.schedule(self.jump_cooldown, self._on_jump_ready)
+
+    def _on_jump_ready(self):
+        self.can_jump = True
+
+    def destroy(self):
+        """死亡アニメーションを開始し、ジャンプの待機タイマーを止める。"""
+        self.jump_timer.cancel()
+        super().destroy()
+
+    def on_removed(self):
+        """登録を解除されたら、ジャンプの待機タイマーを止める。"""
+        self.jump_timer.cancel()
+
+    def _build_sprite(self, width, height):
+        """
+        指定した大きさで、敵の見た目（円形の本体、枠線、目）をSurfaceに描画する。
+        :return: 描画したSurface (円の外側は透明)
+        """
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        current_radius = width / 2
+        center_pos = (width / 2, height / 2)
+
+        # 本体 (円)
+        pygame.draw.circle(surface, self.color, center_pos, current_radius)
+        # 枠線
+        pygame.draw.circle(surface, config.BLACK, center_pos, current_radius, 2)
+
+        # --- 目の描画処理 (Enemyクラスから流用し、円形に合わせる) ---
+        if self.draw_eyes:
+            # 1. 目の大きさを計算
+            eye_radius = current_radius * config.JUMPING_ENEMY_EYE_SIZE_SCALE
+            pupil_radius = eye_radius * config.ENEMY_EYE_PUPIL_SCALE
+
+            # 2. 目の位置を計算
+            offset_x = config.JUMPING_ENEMY_EYE_OFFSET_X_SCALE
+            offset_y = config.JUMPING_ENEMY_EYE_OFFSET_Y_SCALE
+            eye_center = (center_pos[0] + offset_x, center_pos[1] + offset_y)
+
+            # 3. 描画
+            pygame.draw.circle(surface, config.ENEMY_EYE_WHITE_COLOR, eye_center, eye_radius)
+            pygame.draw.circle(surface, config.ENEMY_EYE_PUPIL_COLOR, eye_center, pupil_radius)
+            pygame.draw.circle(surface, config.BLACK, eye_center, eye_radius, config.ENEMY_EYE_OUTLINE_WIDTH)
+        return surface
 
     def update(self, tower, ground):
         """敵の状態を更新する。ジャンプ挙動を実装するために親クラスのupdateをオーバーライド。"""
         # --- 1. 状態に応じたアニメーション処理 (親クラスから流用) ---
-        if self.state == "DYING":
+        if self.state == EntityState.DYING:
             elapsed_time = pygame.time.get_ticks() - self.death_animation_start_time
             progress = min(elapsed_time / config.ENEMY_DEATH_EFFECT_DURATION, 1.0)
-            max_radius = (self.original_width / 2) * config.ENEMY_DEATH_EFFECT_MAX_RADIUS_MULTIPLIER
-            self.death_effect_radius = max_radius * progress
+            self.death_effect_radius = self.death_effect_max_radius * progress
             return # 死亡中は以降の処理は不要
 
         if self.is_animating:
@@ -72,28 +136,22 @@ class JumpingEnemy(Enemy):
 
         # --- 2. AI: 行動決定 (ジャンプ) ---
         # ノックバック中でなく、地上にいる場合のみジャンプを試みる
-        if self.velocity.length_squared() < 0.1 and self.jump_state == "ON_GROUND":
-            current_time = pygame.time.get_ticks()
-            if current_time - self.last_jump_time > self.jump_cooldown:
-                self.jump_state = "JUMPING"
-                jump_force_y = random.uniform(config.JUMPING_ENEMY_MIN_JUMP_FORCE, config.JUMPING_ENEMY_MAX_JUMP_FORCE)
-                self.velocity.y = jump_force_y
-                self.velocity.x = -self.speed # 左向きにジャンプ
-                self.last_jump_time = current_time
-                # 次のジャンプまでの待機時間を再設定
-                self.jump_cooldown = random.uniform(
-                    config.JUMPING_ENEMY_JUMP_COOLDOWN_MIN,
-                    config.JUMPING_ENEMY_JUMP_COOLDOWN_MAX
-                )
+        if self.can_jump and self.velocity.length_squared() < 0.1 and self.jump_state == JumpState.ON_GROUND:
+            self.jump_state = JumpState.JUMPING
+            jump_force_y = random.uniform(config.JUMPING_ENEMY_MIN_JUMP_FORCE, config.JUMPING_ENEMY_MAX_JUMP_FORCE)
+            self.velocity.y = jump_force_y
+            self.velocity.x = -self.speed # 左向きにジャンプ
+            # 次のジャンプまでの待機時間を再設定
+            self._schedule_next_jump()
 
         # --- 3. 物理演算: 重力と移動 ---
         # 空中にいる場合（ジャンプ中またはノックバック中）は重力を適用
-        if self.jump_state == "JUMPING" or self.velocity.length_squared() > 0.1:
+        if self.jump_state == JumpState.JUMPING or self.velocity.length_squared() > 0.1:
             self.velocity.y += config.GRAVITY
             self.pos += self.velocity
 
             # ノックバック中の速度減衰（ジャンプの軌道には影響させない）
-            if self.jump_state != "JUMPING":
+            if self.jump_state != JumpState.JUMPING:
                 self.velocity *= config.ENEMY_FRICTION
 
             # 地面との衝突判定 (Y速度が正、つまり落下中の場合のみ)
@@ -102,62 +160,46 @@ class JumpingEnemy(Enemy):
                 self.pos.y = self.rect.y # 浮動小数点座標も同期
                 self.velocity.x = 0 # 地面に着いたら水平・垂直方向の速度をリセット
                 self.velocity.y = 0
-                self.jump_state = "ON_GROUND"
+                self.jump_state = JumpState.ON_GROUND
 
         # --- 4. 最終的な位置調整 ---
         # ノックバック中でなく、地上にいる場合は、地面のアニメーションに追従させる
-        if self.jump_state == "ON_GROUND" and self.velocity.length_squared() < 0.1:
+        if self.jump_state == JumpState.ON_GROUND and self.velocity.length_squared() < 0.1:
             self.rect.bottom = ground.rect.top
             self.pos.y = self.rect.y
 
-        # 浮動小数点座標を整数のRectに反映
-        self.rect.topleft = (round(self.pos.x), round(self.pos.y))
+        # 浮動小数点座標をFRectに反映
+        self.rect.topleft = self.pos
 
     def draw(self, screen):
         """敵（円形）を描画する。親クラスのdrawをオーバーライド。"""
-        if self.state == "ALIVE":
-            # 現在のスケールを反映した半径と中心を計算
-            current_radius = (self.rect.width / 2)
-            center_pos = self.rect.center
-
-            # 本体 (円)
-            pygame.draw.circle(screen, self.color, center_pos, current_radius)
-            # 枠線
-            pygame.draw.circle(screen, config.BLACK, center_pos, current_radius, 2)
-
-            # --- 目の描画処理 (Enemyクラスから流用し、円形に合わせる) ---
-            if self.draw_eyes:
-                # 1. 目の大きさを計算
-                eye_radius = current_radius * config.JUMPING_ENEMY_EYE_SIZE_SCALE
-                pupil_radius = eye_radius * config.ENEMY_EYE_PUPIL_SCALE
-
-                # 2. 目の位置を計算
-                offset_x = config.JUMPING_ENEMY_EYE_OFFSET_X_SCALE
-                offset_y = config.JUMPING_ENEMY_EYE_OFFSET_Y_SCALE
-                eye_center = (center_pos[0] + offset_x, center_pos[1] + offset_y)
-
-                # 3. 描画
-                pygame.draw.circle(screen, config.ENEMY_EYE_WHITE_COLOR, eye_center, eye_radius)
-                pygame.draw.circle(screen, config.ENEMY_EYE_PUPIL_COLOR, eye_center, pupil_radius)
-                pygame.draw.circle(screen, config.BLACK, eye_center, eye_radius, config.ENEMY_EYE_OUTLINE_WIDTH)
-
-        elif self.state == "DYING":
+        if self.state == EntityState.ALIVE:
+            # 焼き込み済みのスプライト（ひるみ中は縮小版）を、中心に合わせて描画する
+            sprite = self.get_sprite()
+            screen.blit(sprite, sprite.get_rect(center=self.rect.center))
+
+        elif self.state == EntityState.DYING:
             # 死亡エフェクトは親クラスのものをそのまま利用できるが、
             # 描画の基準点がself.rect.centerなので、ここで再実装する。
             progress = (pygame.time.get_ticks() - self.death_animation_start_time) / config.ENEMY_DEATH_EFFECT_DURATION
             progress = min(progress, 1.0)
 
             alpha = 255 * (1 - progress)
-            max_radius = int((self.original_width / 2) * config.ENEMY_DEATH_EFFECT_MAX_RADIUS_MULTIPLIER)
+            max_radius = int(self.death_effect_max_radius)
             
             if max_radius <= 0: return
 
+            current_radius = int(self.death_effect_radius)
+            line_width = min(config.ENEMY_DEATH_EFFECT_LINE_WIDTH, current_radius)
+            if not quality_governor.death_ring_alpha:
+                # 軽量な画質では、半透明にせず画面へ直接描く
+                if line_width > 0:
+                    pygame.draw.circle(screen, config.ENEMY_DEATH_EFFECT_COLOR, self.rect.center, current_radius, line_width)
+                return
+
             surface_size = max_radius * 2
             effect_surface = pygame.Surface((surface_size, surface_size), pygame.SRCALPHA)
             effect_color = (*config.ENEMY_DEATH_EFFECT_COLOR, alpha)
-            
-            current_radius = int(self.death_effect_radius)
-            line_width = min(config.ENEMY_DEATH_EFFECT_LINE_WIDTH, current_radius)
 
             if line_width > 0:
                 pygame.draw.circle(effect_surface, effect_color, (max_radius, max_radius), current_radius, line_width)
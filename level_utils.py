@@ -1,59 +1,134 @@
-import pygame
+import math
 import random
 import config
 from cloud import Cloud
 
+def _split_lanes():
+    """
+    雲を置くY方向の範囲を、互いにCLOUD_MIN_DISTANCE_Y以上離れた帯(レーン)に分ける。
+    別のレーンの雲同士はY方向に十分離れているので、重なりを判定する必要がない。
+    レーンの境界はランダムに決めるため、毎回違う高さの組み合わせになる。
+    :return: [(上端のY, 下端のY), ...]
+    """
+    y_min, y_max = config.CLOUD_SPAWN_Y_MIN, config.CLOUD_SPAWN_Y_MAX
+    num_lanes = (y_max - y_min) // config.CLOUD_MIN_DISTANCE_Y + 1
+    slack = (y_max - y_min) - (num_lanes - 1) * config.CLOUD_MIN_DISTANCE_Y
+    # レーンの切れ目 (0 ~ slack の範囲で昇順)
+    cuts = [0] + sorted(random.randint(0, slack) for _ in range(num_lanes - 1)) + [slack]
+    return [
+        (y_min + i * config.CLOUD_MIN_DISTANCE_Y + cuts[i], y_min + i * config.CLOUD_MIN_DISTANCE_Y + cuts[i + 1])
+        for i in range(num_lanes)
+    ]
+
+def _free_segments(lane, tower_pos):
+    """
+    レーン内で雲を置けるX座標の区間を返す。
+    レーンの高さ全体が塔の周りの円に入ってしまうX座標の範囲だけを除外する。
+    :return: [(左端のX, 右端のX), ...]
+    """
+    x_min = config.CLOUD_SPAWN_PADDING_X
+    x_max = config.SCREEN_WIDTH - config.CLOUD_SPAWN_PADDING_X
+    radius = config.CLOUD_MIN_DISTANCE_FROM_TOWER
+    # レーンの中で塔から最も遠い点までのY方向の距離
+    farthest_dy = max(abs(tower_pos[1] - lane[0]), abs(lane[1] - tower_pos[1]))
+    if farthest_dy >= radius:
+        return [(x_min, x_max)]
+    half_width = math.sqrt(radius ** 2 - farthest_dy ** 2)
+    blocked_left = math.floor(tower_pos[0] - half_width)
+    blocked_right = math.ceil(tower_pos[0] + half_width)
+    segments = [(x_min, min(x_max, blocked_left)), (max(x_min, blocked_right), x_max)]
+    return [(left, right) for left, right in segments if left <= right]
+
+def _lane_capacity(segments):
+    """区間の中に、CLOUD_MIN_DISTANCE_X以上離して置ける雲の最大数を返す。"""
+    if not segments:
+        return 0
+    length = sum(right - left for left, right in segments)
+    return length // config.CLOUD_MIN_DISTANCE_X + 1
+
+def _place_on_segments(segments, count):
+    """
+    区間の中に、互いにCLOUD_MIN_DISTANCE_X以上離れたX座標をcount個ランダムに選ぶ。
+    区間をつなげた1本の線の上で、隙間の長さをランダムに配分してから元の座標に戻すので、
+    やり直しなしで必ずcount個の位置が決まる。
+    """
+    spacing = config.CLOUD_MIN_DISTANCE_X
+    length = sum(right - left for left, right in segments)
+    slack = length - (count - 1) * spacing
+    offsets = sorted(random.randint(0, slack) for _ in range(count))
+
+    xs = []
+    for i, offset in enumerate(offsets):
+        position = offset + i * spacing # つなげた線の上での位置
+        for left, right in segments:
+            if position <= right - left:
+                xs.append(left + position)
+                break
+            position -= right - left
+    return xs
+
+def _pick_y(x, lane, tower_pos):
+    """レーンの中から、塔から十分に離れたY座標をランダムに選ぶ。"""
+    top, bottom = lane
+    dx = x - tower_pos[0]
+    radius_sq = config.CLOUD_MIN_DISTANCE_FROM_TOWER_SQUARED
+    if dx * dx >= radius_sq:
+        return random.randint(top, bottom)
+
+    # 塔の円がこのX座標で覆うY方向の範囲を避ける
+    half_height = math.sqrt(radius_sq - dx * dx)
+    ranges = [
+        (top, min(bottom, math.floor(tower_pos[1] - half_height))),
+        (max(top, math.ceil(tower_pos[1] + half_height)), bottom),
+    ]
+    ranges = [(low, high) for low, high in ranges if low <= high]
+    if not ranges:
+        # 浮動小数点の誤差で範囲が空になった場合は、塔から遠い方の端を使う
+        return top if abs(tower_pos[1] - top) >= abs(bottom - tower_pos[1]) else bottom
+    choice = random.randint(0, sum(high - low for low, high in ranges) + len(ranges) - 1)
+    for low, high in ranges:
+        if choice <= high - low:
+            return low + choice
+        choice -= high - low + 1
+
+def generate_cloud_positions(slingshot_x, tower_top_y):
+    """
+    重ならない雲の中心座標を決めて返す。
+    Y方向の範囲をレーンに分け、各レーンの中ではX方向に一定間隔以上離れるように位置を選ぶ
+    (ポアソンディスクサンプリングの一種)。雲同士の距離はX, Y個別の矩形判定、
+    塔からの距離は円範囲で判定したのと同じ条件を満たす。
+    乱数でやり直すことがないため、配置できる場所がある限り、1回で必ず目標の個数が決まる。
+    :return: [(x, y), ...]
+    """
+    tower_pos = (slingshot_x, tower_top_y)
+    lanes = _split_lanes()
+    lane_segments = [_free_segments(lane, tower_pos) for lane in lanes]
+    capacities = [_lane_capacity(segments) for segments in lane_segments]
+
+    num_clouds = random.randint(config.CLOUD_MIN_COUNT, config.CLOUD_MAX_COUNT)
+    if num_clouds > sum(capacities):
+        print(f"警告: 雲を{num_clouds}個置く場所がないため、{sum(capacities)}個にします。")
+        num_clouds = sum(capacities)
+
+    # 各レーンに置く個数を、空きのあるレーンへ1つずつランダムに割り振る
+    counts = [0] * len(lanes)
+    for _ in range(num_clouds):
+        open_lanes = [i for i, capacity in enumerate(capacities) if counts[i] < capacity]
+        counts[random.choice(open_lanes)] += 1
+
+    positions = []
+    for lane, segments, count in zip(lanes, lane_segments, counts):
+        if count > 0:
+            for x in _place_on_segments(segments, count):
+                positions.append((x, _pick_y(x, lane, tower_pos)))
+    random.shuffle(positions)
+    return positions
+
 def create_cloud_layout(slingshot_x, tower_top_y):
     """
     重ならないように雲を生成し、リストとして返す。
-    最低個数を下回った場合は、生成をやり直す。
-    """
-    outer_attempts = 0
-    max_outer_attempts = 10 # 生成全体のリトライ回数
-
-    while outer_attempts < max_outer_attempts:
-        clouds = []
-        num_clouds = random.randint(config.CLOUD_MIN_COUNT, config.CLOUD_MAX_COUNT)
-        max_attempts = 100 # 無限ループを避けるための最大試行回数
-        attempts = 0
-
-        while len(clouds) < num_clouds and attempts < max_attempts:
-            # 画面の端からパディングを考慮した範囲でランダムな位置を生成
-            cloud_x = random.randint(
-                config.CLOUD_SPAWN_PADDING_X,
-                config.SCREEN_WIDTH - config.CLOUD_SPAWN_PADDING_X
-            )
-            cloud_y = random.randint(
-                config.CLOUD_SPAWN_Y_MIN,
-                config.CLOUD_SPAWN_Y_MAX
-            )
-            new_cloud_pos = pygame.math.Vector2(cloud_x, cloud_y)
-
-            # 他の雲と近すぎないかチェック (X, Y個別の矩形判定)
-            is_too_close_to_clouds = any(
-                (abs(new_cloud_pos.x - c.center.x) < config.CLOUD_MIN_DISTANCE_X and
-                 abs(new_cloud_pos.y - c.center.y) < config.CLOUD_MIN_DISTANCE_Y)
-                for c in clouds)
-
-            # 塔と近すぎないかチェック（円範囲で判定）
-            initial_slingshot_pos = pygame.math.Vector2(slingshot_x, tower_top_y)
-            is_too_close_to_tower = new_cloud_pos.distance_to(initial_slingshot_pos) < config.CLOUD_MIN_DISTANCE_FROM_TOWER
-
-            # 位置が問題なければ雲を生成してリストに追加
-            if not is_too_close_to_clouds and not is_too_close_to_tower:
-                num_puffs = random.randint(3, 5)
-                clouds.append(Cloud(cloud_x, cloud_y, num_puffs))
-
-            attempts += 1
-
-        # 生成された雲の数が最低個数を満たしていれば、ループを抜けて結果を返す
-        if len(clouds) >= config.CLOUD_MIN_COUNT:
-            print(f"雲の生成に成功しました。個数: {len(clouds)}")
-            return clouds
-        
-        outer_attempts += 1
-        print(f"雲の生成数が最低個数({config.CLOUD_MIN_COUNT})に満たなかったため、リトライします... ({outer_attempts}/{max_outer_attempts})")
-
-    # 最大リトライ回数に達しても最低個数を満たせなかった場合
-    print(f"警告: 雲の生成に失敗しました。最後に生成された不完全な雲のリストを返します。個数: {len(clouds)}")
-    return clouds # 最後に生成された（不完全な）雲のリストを返す
\ No newline at end of file
+    位置をすべて決めてから、その位置にだけCloudを作成する。
+    """
+    clouds = [Cloud(x, y, random.randint(3, 5)) for x, y in generate_cloud_positions(slingshot_x, tower_top_y)]
+    print(f"雲の生成に成功しました。個数: {len(clouds)}")
+    return clouds
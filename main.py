@@ -3,7 +3,9 @@
 # https://opensource.org/licenses/MIT
 
 import asyncio # Webアプリ(Pygbag)化のために追加
+from profiler import startup_profiler
 from game import Game
+startup_profiler.mark("import game")
 
 print("--- EXECUTING main.py ---")
 
@@ -19,6 +21,7 @@ async def main():
     except ImportError:
         # Do nothing in a local execution environment where pygbag is not installed
         pass
+    startup_profiler.mark("pygbag preloader")
 
     game = Game()
     await game.run()
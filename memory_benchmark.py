@@ -0,0 +1,182 @@
+"""
+エンティティ1体あたりのメモリ使用量と、大量の敵が出現する場面でのピークRSSを計測するツール。
+スマートフォンのブラウザ(pygbag/WASM)ではヒープが小さいため、エンティティの表現を変えた時に
+どれだけメモリが減ったかをこのツールで確認する。
+
+使い方:
+    python memory_benchmark.py
+    python memory_benchmark.py --count 5000 --enemies 800 --particles 4000 --frames 600
+"""
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+
+# 画面と音声を持たない環境でも動くように、pygameのインポート前にダミードライバを指定する
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+try:
+    import resource
+except ImportError: # resourceを含まないPythonビルド（Windowsなど）
+    resource = None
+
+import pygame
+import config
+from particle import Particle
+from block import Block
+from enemy import Enemy
+from jumping_enemy import JumpingEnemy
+from flying_enemy import FlyingEnemy
+from cloud import Cloud
+from heart_item import HeartItem
+from speed_up_item import SpeedUpItem
+from size_up_item import SizeUpItem
+from weak_point import WeakPoint
+from ui import ComboIndicator, ScoreIndicator
+from tower import Tower
+from ground import Ground
+from entity_registry import EntityRegistry
+from timer_scheduler import timer_scheduler
+from sprite_cache import sprite_cache
+
+STAT_MULTIPLIER = {"hp": 1.0, "speed": 1.0, "attack": 1.0}
+
+# 計測するエンティティの名前と、1体を生成する関数
+ENTITY_FACTORIES = [
+    ("Particle", lambda: Particle(400, 300, 60, 1, 5, 0.1, 6, 1, config.PARTICLE_COLORS)),
+    ("Block", lambda: Block(100, 100, config.TOWER_BLOCK_WIDTH, config.TOWER_BLOCK_HEIGHT)),
+    ("Enemy", lambda: Enemy(STAT_MULTIPLIER, size=config.ENEMY_MIN_SIZE)),
+    ("JumpingEnemy", lambda: JumpingEnemy(STAT_MULTIPLIER, size=config.JUMPING_ENEMY_MIN_SIZE)),
+    ("FlyingEnemy", lambda: FlyingEnemy(config.SCREEN_WIDTH, 200, STAT_MULTIPLIER, size=config.FLYING_ENEMY_MIN_SIZE)),
+    ("Cloud", lambda: Cloud(400, 200, 4)),
+    ("HeartItem", lambda: HeartItem(position=pygame.math.Vector2(400, 200))),
+    ("SpeedUpItem", lambda: SpeedUpItem(position=pygame.math.Vector2(400, 200))),
+    ("SizeUpItem", lambda: SizeUpItem(position=pygame.math.Vector2(400, 200))),
+    ("WeakPoint", lambda: WeakPoint(None, pygame.math.Vector2(0, -40))),
+    ("ComboIndicator", lambda: ComboIndicator(pygame.math.Vector2(400, 200), 10)),
+    ("ScoreIndicator", lambda: ScoreIndicator(pygame.math.Vector2(400, 200), "+100")),
+]
+
+
+def _surface_bytes(entity):
+    """
+    エンティティが個別に持つSurfaceの画素データの大きさを返す (tracemallocでは計測されないため)。
+    スプライトキャッシュで他のエンティティと共有しているSurfaceは数えない。
+    """
+    shared = {id(sprite) for sprite in sprite_cache.sprites.values()}
+    total = 0
+    for cls in type(entity).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            value = getattr(entity, name, None)
+            if isinstance(value, pygame.Surface) and id(value) not in shared:
+                total += value.get_width() * value.get_height() * value.get_bytesize()
+    return total
+
+
+def measure_bytes_per_entity(count):
+    """
+    エンティティの種類ごとに、1体あたりのメモリ使用量を計測する。
+    :param count: 種類ごとに生成する数
+    :return: [(名前, Pythonヒープ上のバイト数, インスタンス本体のバイト数, Surfaceのバイト数), ...]
+    """
+    results = []
+    for name, factory in ENTITY_FACTORIES:
+        factory() # スプライトキャッシュなど、最初の1体だけが確保するものを計測から除く
+        timer_scheduler.clear()
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        entities = [factory() for _ in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        heap_bytes = (after - before) / count
+        results.append((name, heap_bytes, sys.getsizeof(entities[0]), _surface_bytes(entities[0])))
+        del entities
+        timer_scheduler.clear()
+    return results
+
+
+def run_large_wave(num_enemies, num_particles, num_items, frames):
+    """
+    大量の敵、パーティクル、アイテムが同時に存在する場面を再現し、指定フレーム数だけ更新する。
+    :return: 更新中にtracemallocで計測したPythonヒープのピーク (バイト)
+    """
+    tracemalloc.start()
+    tower_top_y = config.GROUND_Y - config.TOWER_INITIAL_BLOCKS * config.TOWER_BLOCK_HEIGHT
+    tower = Tower(config.SLINGSHOT_X - config.TOWER_BLOCK_WIDTH / 2, config.GROUND_Y, tower_top_y)
+    ground = Ground()
+    entities = EntityRegistry()
+    rng = random.Random(0)
+
+    for i in range(num_enemies):
+        kind = i % 3
+        if kind == 0:
+            entities.add_enemy(Enemy(STAT_MULTIPLIER))
+        elif kind == 1:
+            entities.add_enemy(JumpingEnemy(STAT_MULTIPLIER))
+        else:
+            entities.add_enemy(FlyingEnemy(config.SCREEN_WIDTH + rng.uniform(0, 400), rng.uniform(100, 400), STAT_MULTIPLIER))
+    item_classes = (HeartItem, SpeedUpItem, SizeUpItem)
+    for i in range(num_items):
+        position = pygame.math.Vector2(rng.uniform(100, 700), rng.uniform(100, 300))
+        entities.add_item(item_classes[i % 3](position=position))
+    particles = [
+        Particle(rng.uniform(0, config.SCREEN_WIDTH), rng.uniform(0, config.GROUND_Y), 10 ** 6, 1, 5, 0.0, 6, 1, config.PARTICLE_COLORS)
+        for _ in range(num_particles)
+    ]
+
+    for frame in range(frames):
+        timer_scheduler.update(frame * 16)
+        for enemy in entities.enemies: enemy.update(tower, ground)
+        for item in entities.items: item.update()
+        for p in particles: p.update()
+        tower.update()
+
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    timer_scheduler.clear()
+    return peak
+
+
+def peak_rss_bytes():
+    """プロセスの最大RSSをバイト単位で返す。取得できない環境ではNoneを返す。"""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOSではバイト、Linuxではキロバイト単位で返される
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory benchmark for Babel's Tower Shooter entities.")
+    parser.add_argument("--count", type=int, default=2000, help="1体あたりの計測で、種類ごとに生成する数")
+    parser.add_argument("--enemies", type=int, default=600, help="大量出現の場面で同時に存在する敵の数")
+    parser.add_argument("--particles", type=int, default=3000, help="大量出現の場面で同時に存在するパーティクルの数")
+    parser.add_argument("--items", type=int, default=60, help="大量出現の場面で同時に存在するアイテムの数")
+    parser.add_argument("--frames", type=int, default=300, help="大量出現の場面で更新するフレーム数")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+
+    print(f"=== Bytes per entity ({args.count} each) ===")
+    print(f"{'entity':<16} {'heap':>8} {'instance':>9} {'surface':>9}")
+    for name, heap_bytes, instance_bytes, surface_bytes in measure_bytes_per_entity(args.count):
+        print(f"{name:<16} {heap_bytes:8.0f} {instance_bytes:9d} {surface_bytes:9d}")
+    print("heap: Pythonヒープ上の合計 (Vector2/Rectなどの属性を含む)  instance: インスタンス本体  surface: 個別に持つ画素データ")
+
+    peak = run_large_wave(args.enemies, args.particles, args.items, args.frames)
+    print(f"=== Large wave: {args.enemies} enemies, {args.particles} particles, {args.items} items, {args.frames} frames ===")
+    print(f"python heap peak: {peak / 1024:.0f} KiB")
+    rss = peak_rss_bytes()
+    print(f"peak RSS: {rss / 1024 / 1024:.1f} MiB" if rss is not None else "peak RSS: (この環境では取得できません)")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
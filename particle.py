@@ -8,6 +8,9 @@ class Particle:
     画面に表示される小さな粒子（パーティクル）を管理するクラス。
     キラキラ光るエフェクトなどに使用する。
     """
+    # 一度に数百個生成されるため、インスタンスごとの辞書を持たせない
+    __slots__ = ("pos", "velocity", "lifetime", "max_lifetime", "color", "start_size", "end_size", "gravity")
+
     def __init__(self, x, y, lifetime, min_speed, max_speed, gravity, start_size, end_size, colors):
         self.pos = pygame.math.Vector2(x, y)
         
@@ -37,6 +40,13 @@ class Particle:
             current_size = self.start_size * life_ratio + self.end_size * (1 - life_ratio)
             pygame.draw.circle(screen, self.color, (int(self.pos.x), int(self.pos.y)), int(current_size))
 
+    def add_to_batch(self, batch):
+        """drawと同じ見た目の円を、SpriteBatchにまとめて描画する予定として加える。"""
+        if self.is_alive():
+            life_ratio = self.lifetime / self.max_lifetime
+            current_size = self.start_size * life_ratio + self.end_size * (1 - life_ratio)
+            batch.add_circle(self.color, (int(self.pos.x), int(self.pos.y)), int(current_size))
+
     def is_alive(self):
         """パーティクルがまだ表示時間内か判定する。"""
         return self.lifetime > 0
\ No newline at end of file
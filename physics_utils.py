@@ -0,0 +1,146 @@
+import math
+import config
+
+def _ray_circle_toi(start_x, start_y, delta_x, delta_y, center_x, center_y, radius):
+    """
+    線分 start -> start + delta が円に外側から入る最初の時刻 t (0.0 ~ 1.0) を返す。
+    開始点がすでに円の内側にある場合や、円に近づいていない場合はNoneを返す。
+    """
+    offset_x = start_x - center_x
+    offset_y = start_y - center_y
+    a = delta_x * delta_x + delta_y * delta_y
+    b = offset_x * delta_x + offset_y * delta_y
+    c = offset_x * offset_x + offset_y * offset_y - radius * radius
+    if c <= 0 or b >= 0 or a == 0:
+        return None # 開始時点で重なっている、または離れていく方向
+
+    discriminant = b * b - a * c
+    if discriminant < 0:
+        return None # 円をかすめもしない
+
+    t = (-b - math.sqrt(discriminant)) / a
+    if 0.0 <= t <= 1.0:
+        return t
+    return None
+
+def swept_circle_circle(start, end, radius, center, other_radius):
+    """
+    移動する円と静止した円の連続衝突判定を行う。
+    :param start: 移動開始時の円の中心 (Vector2)
+    :param end: 移動終了時の円の中心 (Vector2)
+    :param radius: 移動する円の半径
+    :param center: 静止した円の中心 (Vector2 または (x, y))
+    :param other_radius: 静止した円の半径
+    :return: 最初に接触する時刻 t (0.0 ~ 1.0)。接触しない、または開始時点で重なっている場合はNone
+    """
+    return _ray_circle_toi(
+        start[0], start[1],
+        end[0] - start[0], end[1] - start[1],
+        center[0], center[1],
+        radius + other_radius
+    )
+
+def swept_circle_rect(start, end, radius, rect):
+    """
+    移動する円と静止した四角形の連続衝突判定を行う。
+    四角形を円の半径だけ膨らませた角丸四角形（ミンコフスキー和）に対して、円の中心の線分を当てる。
+    :param start: 移動開始時の円の中心 (Vector2)
+    :param end: 移動終了時の円の中心 (Vector2)
+    :param radius: 移動する円の半径
+    :param rect: 当たり判定用の四角形 (Rect / FRect)
+    :return: 最初に接触する時刻 t (0.0 ~ 1.0)。接触しない、または開始時点で重なっている場合はNone
+    """
+    start_x, start_y = start[0], start[1]
+    delta_x = end[0] - start_x
+    delta_y = end[1] - start_y
+    left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+
+    # 開始時点ですでに重なっている場合は、通常の（離散的な）判定に任せる
+    closest_x = max(left, min(start_x, right))
+    closest_y = max(top, min(start_y, bottom))
+    if (start_x - closest_x) ** 2 + (start_y - closest_y) ** 2 < radius * radius:
+        return None
+
+    # ステップ1: 半径分だけ膨らませた四角形に対するスラブ判定
+    t_enter = 0.0
+    t_exit = 1.0
+    for origin, delta, slab_min, slab_max in (
+        (start_x, delta_x, left - radius, right + radius),
+        (start_y, delta_y, top - radius, bottom + radius),
+    ):
+        if delta == 0:
+            if origin < slab_min or origin > slab_max:
+                return None
+            continue
+        t1 = (slab_min - origin) / delta
+        t2 = (slab_max - origin) / delta
+        if t1 > t2:
+            t1, t2 = t2, t1
+        t_enter = max(t_enter, t1)
+        t_exit = min(t_exit, t2)
+        if t_enter > t_exit:
+            return None
+
+    # ステップ2: 侵入点が辺の正面なら、その時刻が接触時刻
+    hit_x = start_x + delta_x * t_enter
+    hit_y = start_y + delta_y * t_enter
+    if left <= hit_x <= right or top <= hit_y <= bottom:
+        return t_enter
+
+    # ステップ3: 角の領域に入った場合は、角を中心とした円との判定に切り替える
+    corner_x = left if hit_x < left else right
+    corner_y = top if hit_y < top else bottom
+    return _ray_circle_toi(start_x, start_y, delta_x, delta_y, corner_x, corner_y, radius)
+
+def circle_rect_contact(center_x, center_y, radius, rect):
+    """
+    円と四角形の重なりを判定し、円を押し出す方向と量を返す。
+    座標は浮動小数点のまま扱い、Vector2などの一時オブジェクトを作らない。
+    :param center_x: 円の中心のX座標
+    :param center_y: 円の中心のY座標
+    :param radius: 円の半径
+    :param rect: 当たり判定用の四角形 (Rect / FRect)
+    :return: (法線のX成分, 法線のY成分, めり込み量)。重なっていなければNone
+    """
+    # 円の中心から最も近い四角形上の点
+    offset_x = center_x - max(rect.left, min(center_x, rect.right))
+    offset_y = center_y - max(rect.top, min(center_y, rect.bottom))
+    distance_squared = offset_x * offset_x + offset_y * offset_y
+    if distance_squared >= radius * radius:
+        return None
+
+    distance = math.sqrt(distance_squared)
+    if distance <= 0.01:
+        # 中心が四角形にめり込んでいる場合は、四角形の中心から押し出す
+        offset_x = center_x - rect.centerx
+        offset_y = center_y - rect.centery
+        length = math.hypot(offset_x, offset_y)
+        if length == 0:
+            return 0.0, -1.0, radius - distance
+        return offset_x / length, offset_y / length, radius - distance
+    return offset_x / distance, offset_y / distance, radius - distance
+
+def calculate_trajectory(start_pos, launch_vector, num_points=None):
+    """
+    与えられた初期位置と発射ベクトルから、弾の軌道を予測して点のリストを返す。
+    :param start_pos: 軌道計算の開始位置 (Vector2)
+    :param launch_vector: 発射ベクトル (Vector2)
+    :param num_points: 点の数。省略時はTRAJECTORY_NUM_POINTS。軌道の長さは変えずに、点の間隔を調整する
+    :return: 軌道上の点のリスト [Vector2, Vector2, ...]
+    """
+    points = []
+    # 実際の物理演算と同じパラメータで計算
+    velocity = launch_vector * config.LAUNCH_POWER_MULTIPLIER
+    pos = start_pos.copy()
+    
+    # 物理シミュレーションのステップ数
+    # 1ステップが1フレームに相当すると考え、指定した数の点を計算する
+    num_steps = config.TRAJECTORY_NUM_POINTS * config.TRAJECTORY_POINT_GAP
+    point_gap = config.TRAJECTORY_POINT_GAP if num_points is None else num_steps // num_points
+    for step in range(1, num_steps + 1):
+        velocity.y += config.GRAVITY
+        pos += velocity
+        # 指定した間隔ごとに点をリストに追加
+        if step % point_gap == 0:
+            points.append(pos.copy())
+    return points
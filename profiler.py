@@ -0,0 +1,72 @@
+import time
+
+class StartupProfiler:
+    """
+    起動処理の各段階にかかった時間を記録し、最初のフレームの描画後にレポートを表示するクラス。
+    計測の起点は、このモジュールが最初にインポートされた時刻。
+    """
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.marks = [] # [(ラベル, 起点からの経過時間ms), ...]
+        self.reported = False
+
+    def mark(self, label):
+        """
+        現在時刻に名前をつけて記録する。
+        :param label: 計測点の名前
+        """
+        self.marks.append((label, (time.perf_counter() - self.start_time) * 1000))
+
+    def report(self):
+        """記録した計測点ごとに、前の計測点からの時間と起点からの時間を表示する。"""
+        self.reported = True
+        print("--- Startup timing ---")
+        previous = 0.0
+        for label, elapsed in self.marks:
+            print(f"{label:<34} +{elapsed - previous:7.1f} ms  (total {elapsed:7.1f} ms)")
+            previous = elapsed
+
+# アプリ全体で共有する計測用インスタンス
+startup_profiler = StartupProfiler()
+
+class PauseProfiler:
+    """
+    フレームを止める可能性のある処理（GCなど）の停止時間を、種類ごとに集計するクラス。
+    どの処理が、どの場面で、どれだけ止めたかをreport()で確認できる。
+    入力の遅延など、ラベルごとに時間を集計したい他の計測にも使う。
+    """
+    def __init__(self, title="Pause timing"):
+        """
+        :param title: report()で表示する見出し
+        """
+        self.title = title
+        self.stats = {} # ラベル -> [回数, 合計ms, 最大ms]
+
+    def record(self, label, duration_ms):
+        """
+        停止時間を1回分記録する。
+        :param label: 処理の名前 (例: "gc auto gen0")
+        :param duration_ms: 停止時間 (ms)
+        """
+        entry = self.stats.get(label)
+        if entry is None:
+            self.stats[label] = [1, duration_ms, duration_ms]
+        else:
+            entry[0] += 1
+            entry[1] += duration_ms
+            entry[2] = max(entry[2], duration_ms)
+
+    def report(self):
+        """記録した停止時間を、ラベルごとに回数、合計、最大で表示する。"""
+        print(f"--- {self.title} ---")
+        for label, (count, total, longest) in sorted(self.stats.items()):
+            print(f"{label:<34} x{count:<5} total {total:7.1f} ms  max {longest:6.2f} ms")
+
+    def clear(self):
+        """記録をすべて消す。"""
+        self.stats.clear()
+
+# GCなどによる停止時間の集計用インスタンス
+pause_profiler = PauseProfiler()
+# 入力から発射・表示までの時間の集計用インスタンス
+input_latency_profiler = PauseProfiler("Input latency")
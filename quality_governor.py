@@ -0,0 +1,87 @@
+import pygame
+import config
+from collections import deque
+from sprite_cache import sprite_cache
+
+class QualityGovernor:
+    """
+    直近のフレームの処理時間から、描画の重い演出をどこまで省くかを決めるクラス。
+    処理時間の平均が予算 (1000 / FPS ミリ秒) を超え続けたらQUALITY_LEVELSの次のプリセットへ下げ、
+    十分な余裕が続いたら1つ前のプリセットへ戻す。
+    切り替えた直後は計測をやり直すので、1回の切り替えの判断には必ずQUALITY_FRAME_WINDOWフレーム分の計測を使う。
+    各演出は、このインスタンスの属性 (particle_scale など) を見て描き方を変える。
+    """
+    def __init__(self):
+        self.enabled = config.QUALITY_GOVERNOR_ENABLED
+        self.frame_budget_ms = 1000 / config.FPS
+        self.frame_times = deque(maxlen=config.QUALITY_FRAME_WINDOW) # 直近のフレームの処理時間 (ms)
+        self.frame_time_total = 0.0 # frame_timesの合計
+        self.level = None
+        self.set_level(config.QUALITY_INITIAL_LEVEL)
+
+    def set_level(self, level):
+        """
+        画質レベルを設定し、プリセットの値を属性に展開する。
+        :param level: QUALITY_LEVELSの添字
+        """
+        self.level = level
+        preset = config.QUALITY_LEVELS[level]
+        self.name = preset["name"]
+        self.particle_scale = preset["particle_scale"]
+        self.trajectory_points = preset["trajectory_points"]
+        self.death_ring_alpha = preset["death_ring_alpha"]
+        self.rotation_cache_step = preset["rotation_cache_step"]
+        self.cloud_update_interval = preset["cloud_update_interval"]
+        self.frame_times.clear()
+        self.frame_time_total = 0.0
+
+    def record_frame(self, frame_ms):
+        """
+        1フレーム分の処理時間を記録し、必要なら画質レベルを切り替える。
+        :param frame_ms: 描画と画面への転送までにかかった時間 (ms)。待ち時間は含めない
+        """
+        if not self.enabled:
+            return
+        if len(self.frame_times) == self.frame_times.maxlen:
+            self.frame_time_total -= self.frame_times[0]
+        self.frame_times.append(frame_ms)
+        self.frame_time_total += frame_ms
+        if len(self.frame_times) < self.frame_times.maxlen:
+            return
+
+        average = self.frame_time_total / len(self.frame_times)
+        if average > self.frame_budget_ms * config.QUALITY_DOWNGRADE_RATIO and self.level < len(config.QUALITY_LEVELS) - 1:
+            self.set_level(self.level + 1)
+            print(f"画質を下げました: {self.name} (平均 {average:.1f} ms / 予算 {self.frame_budget_ms:.1f} ms)")
+        elif average < self.frame_budget_ms * config.QUALITY_UPGRADE_RATIO and self.level > 0:
+            self.set_level(self.level - 1)
+            print(f"画質を上げました: {self.name} (平均 {average:.1f} ms / 予算 {self.frame_budget_ms:.1f} ms)")
+
+    def scale_particle_count(self, count):
+        """現在の画質に合わせたパーティクルの数を返す。元の数が1以上なら、最低でも1個は残す。"""
+        if count <= 0 or self.particle_scale >= 1:
+            return count
+        return max(1, round(count * self.particle_scale))
+
+    def rotate(self, kind, image, angle, scale=1.0):
+        """
+        画像を回転・拡縮する。rotation_cache_stepが0ならrotozoomをそのまま使い、
+        そうでなければ角度を刻みに丸め、回転済みの画像をスプライトキャッシュから取り出す。
+        :param kind: 画像の見た目を表すキー (種類、色など)。元の画像が同じなら同じキーにする
+        :param image: 回転前の画像
+        :param angle: 回転角度 (度、反時計回り)
+        :param scale: 拡大率
+        :return: 回転・拡縮後のSurface (キャッシュの場合は共有されるので、書き換えないこと)
+        """
+        step = self.rotation_cache_step
+        if step <= 0:
+            return pygame.transform.rotozoom(image, angle, scale)
+        angle = round(angle / step) * step % 360
+        width, height = image.get_size()
+        return sprite_cache.get(
+            (kind, width, height, angle), width * scale, height * scale,
+            lambda w, h: pygame.transform.rotozoom(image, angle, w / width)
+        )
+
+# アプリ全体で共有する画質の管理用インスタンス
+quality_governor = QualityGovernor()
@@ -0,0 +1,75 @@
+import pygame
+import config
+
+class RenderTarget:
+    """
+    ゲームを描画するSurfaceと、実際に表示するウィンドウ（ブラウザではcanvas）の対応を管理するクラス。
+    PRESENT_SCALEが1.0なら、これまで通り論理解像度 (SCREEN_WIDTH x SCREEN_HEIGHT) のウィンドウに直接描画する。
+    1.0未満なら、ウィンドウをその倍率の大きさでpygame.SCALEDとして開き、論理解像度のSurfaceに描いたシーンを
+    フレームの最後に1回だけ縮小して転送する。拡大して画面に合わせる処理はSDL（ブラウザではGPU）が行う。
+    ゲームのコードは、描画も入力もすべて論理解像度の座標のまま扱える。
+    描画そのものは論理解像度で行うので、小さくなるのは表示するフレームの大きさだけである。
+    """
+    def __init__(self, scale=config.PRESENT_SCALE):
+        """
+        :param scale: 表示する大きさの倍率 (0より大きく1.0以下)
+        """
+        self.scale = scale
+        self.display = None # ウィンドウのSurface
+        self.surface = None # ゲームが描画する論理解像度のSurface
+
+    @property
+    def is_scaled(self):
+        """論理解像度と異なる大きさで表示しているか。"""
+        return self.surface is not self.display
+
+    def open(self):
+        """
+        ウィンドウを開き、ゲームが描画するSurfaceを返す。pygame.init()の後に呼ぶこと。
+        :return: 論理解像度のSurface
+        """
+        logical_size = (config.SCREEN_WIDTH, config.SCREEN_HEIGHT)
+        if self.scale >= 1:
+            self.display = pygame.display.set_mode(logical_size)
+            self.surface = self.display
+        else:
+            display_size = (round(config.SCREEN_WIDTH * self.scale), round(config.SCREEN_HEIGHT * self.scale))
+            self.display = pygame.display.set_mode(display_size, pygame.SCALED)
+            self.surface = pygame.Surface(logical_size).convert()
+            print(f"論理解像度: {logical_size[0]}x{logical_size[1]} -> 表示する大きさ: {display_size[0]}x{display_size[1]}")
+        return self.surface
+
+    def to_logical(self, pos):
+        """ウィンドウ上の座標を、論理解像度の座標に変換する。"""
+        if not self.is_scaled:
+            return pos
+        return (pos[0] / self.scale, pos[1] / self.scale)
+
+    def map_event(self, event):
+        """
+        マウスイベントの座標を論理解像度の座標に書き換える。
+        タッチイベントの座標は0.0~1.0の割合なので、そのままでよい。
+        :param event: pygameのイベント
+        :return: 同じイベント (座標を書き換えたもの)
+        """
+        if self.is_scaled and hasattr(event, "pos"):
+            event.pos = self.to_logical(event.pos)
+            if hasattr(event, "rel"):
+                event.rel = self.to_logical(event.rel)
+        return event
+
+    def mouse_pos(self):
+        """現在のマウスの位置を、論理解像度の座標で返す。"""
+        return self.to_logical(pygame.mouse.get_pos())
+
+    def present(self):
+        """描画したシーンをウィンドウに転送して表示する。"""
+        if self.is_scaled:
+            if config.PRESENT_SMOOTH_SCALE:
+                pygame.transform.smoothscale(self.surface, self.display.get_size(), self.display)
+            else:
+                pygame.transform.scale(self.surface, self.display.get_size(), self.display)
+        pygame.display.flip()
+
+# アプリ全体で共有する描画先の管理用インスタンス
+render_target = RenderTarget()
@@ -0,0 +1,107 @@
+try:
+    import sqlite3
+except ImportError: # sqlite3を含まないPythonビルド（一部のWeb環境など）
+    sqlite3 = None
+
+class RunHistory:
+    """
+    1プレイごとの結果（スコア、到達ステージ、最大コンボ、タワーの高さ、プレイ時間、シード）を
+    SQLiteファイルに追記し、スコアの順位を問い合わせるクラス。
+    スコアとステージにインデックスを張っているため、数万件の履歴があっても
+    全件を読み込まずに順位やパーセンタイルを求められる。
+    sqlite3が使えない環境では記録も問い合わせも行わない（enabledがFalseになる）。
+    """
+    def __init__(self, filename="run_history.db"):
+        """
+        :param filename: 履歴を保存するファイル名。Noneならメモリ上だけに保存する
+        """
+        self.filename = filename if filename is not None else ":memory:"
+        self.enabled = sqlite3 is not None
+        self.connection = None # 最初に必要になった時に接続する
+
+    def _connect(self):
+        """データベースに接続し、必要ならテーブルとインデックスを作成する。"""
+        if self.connection is None:
+            connection = sqlite3.connect(self.filename)
+            try:
+                self._create_schema(connection)
+            except sqlite3.Error:
+                # 壊れたファイルなどで準備に失敗した接続は使わず、次に必要になった時に接続し直す
+                connection.close()
+                raise
+            self.connection = connection
+        return self.connection
+
+    @staticmethod
+    def _create_schema(connection):
+        """接続の設定を行い、必要ならテーブルとインデックスを作成する。"""
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    id INTEGER PRIMARY KEY,
+                    score INTEGER NOT NULL,
+                    stage_reached INTEGER NOT NULL,
+                    max_combo INTEGER NOT NULL,
+                    tower_height INTEGER NOT NULL,
+                    duration_ms INTEGER NOT NULL,
+                    seed INTEGER,
+                    result TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_runs_score ON runs (score);
+                CREATE INDEX IF NOT EXISTS idx_runs_stage_score ON runs (stage_reached, score);
+            """)
+
+    def record_run(self, score, stage_reached, max_combo, tower_height, duration_ms, seed, result):
+        """
+        1プレイの結果を追加する。
+        :param result: "GAME_OVER" または "GAME_WON"
+        :return: 追加した行のID。記録できなかった場合はNone
+        """
+        if not self.enabled:
+            return None
+        try:
+            connection = self._connect()
+            with connection:
+                cursor = connection.execute(
+                    "INSERT INTO runs (score, stage_reached, max_combo, tower_height, duration_ms, seed, result) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (int(score), int(stage_reached), int(max_combo), int(tower_height), int(duration_ms), seed, result)
+                )
+            return cursor.lastrowid
+        except sqlite3.Error as e:
+            print(f"プレイ履歴の記録に失敗しました: {e}")
+            return None
+
+    def count(self):
+        """記録されているプレイ数を返す。"""
+        if not self.enabled:
+            return 0
+        return self._connect().execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def rank_of(self, score):
+        """指定したスコアの順位（1位から）を返す。同点は同じ順位になる。"""
+        if not self.enabled:
+            return None
+        higher = self._connect().execute("SELECT COUNT(*) FROM runs WHERE score > ?", (score,)).fetchone()[0]
+        return higher + 1
+
+    def rank_summary(self, score):
+        """
+        リザルト画面用に、順位、総プレイ数、上位パーセントをまとめて返す。
+        :return: {"rank": int, "total": int, "percentile": float}。履歴がない、または問い合わせに失敗した場合はNone
+        """
+        try:
+            total = self.count()
+            if total == 0:
+                return None
+            rank = self.rank_of(score)
+        except sqlite3.Error as e: # ロックされている、または壊れているデータベース
+            print(f"プレイ履歴の問い合わせに失敗しました: {e}")
+            return None
+        return {"rank": rank, "total": total, "percentile": rank / total * 100}
+
+    def close(self):
+        """データベースとの接続を閉じる。"""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
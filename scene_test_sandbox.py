@@ -5,6 +5,7 @@ import pygame_gui
 from ground import Ground
 from bird import Bird
 from boss_enemy import BossEnemy
+from timer_scheduler import timer_scheduler
 
 class SandboxUIManager:
     """サンドボックスシーンのUI要素の作成と管理を担当するクラス。"""
@@ -178,6 +179,8 @@ class TestSandboxScene:
         # UIマネージャーの更新
         self.ui.ui_manager.update(time_delta)
         self.ui.update()
+        # 時刻を過ぎたタイマー (ボスの弱点の切り替えなど) の処理を実行する
+        timer_scheduler.update(pygame.time.get_ticks())
 
         self.ground.update()
         # ボスはタワーなし、地面ありで更新
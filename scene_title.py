@@ -2,11 +2,17 @@ import pygame
 import config
 from bird import Bird
 from tower import Tower
-from game_logic import calculate_trajectory
+from physics_utils import calculate_trajectory
 from ui_utils import draw_text
 import random
 from enemy import Enemy
 from ground import Ground
+from render_target import render_target
+from sprite_batch import sprite_batch
+
+class DecorativeEnemy(Enemy):
+    """タイトル画面のにぎやかし用の敵。左右に少し動く巡回アニメーション用の属性を持つ。"""
+    __slots__ = ("patrol_center_x", "patrol_range", "patrol_speed", "patrol_direction")
 
 class TitleScene:
     """
@@ -94,9 +100,9 @@ class TitleScene:
             'y': config.GROUND_Y,
             'size': size
         }
-        enemy = Enemy(enemy_settings)
+        enemy = DecorativeEnemy(enemy_settings)
 
-        # 左右に少し動く巡回アニメーション用のカスタム属性を追加
+        # 左右に少し動く巡回アニメーション用の属性を設定
         enemy.patrol_center_x = x_pos
         enemy.patrol_range = 30
         enemy.patrol_speed = random.uniform(0.2, 0.6)
@@ -164,6 +170,16 @@ class TitleScene:
 
         return None
 
+    def shift_clock(self, delay):
+        """
+        画面が非表示で止まっていた時間を、リリース待機や敵の出現間隔に含めないよう、記録している時刻を後ろへずらす。
+        :param delay: 止まっていた時間 (ms)
+        """
+        self.last_activity_time += delay
+        self.release_pending_start_time += delay
+        self.last_enemy_spawn_time += delay
+        self.bird.shift_clock(delay)
+
     def update(self):
         """タイトル画面のオブジェクトの状態を更新する。"""
         current_time = pygame.time.get_ticks()
@@ -201,11 +217,10 @@ class TitleScene:
             # スリングショットの位置に、ドラッグベクトルを加算してボールを配置（直感的な引っ張り操作）
             self.bird.pos = self.slingshot_pos + drag_vector
 
-            distance = self.slingshot_pos.distance_to(self.bird.pos)
-            if distance > config.MAX_PULL_DISTANCE:
-                if distance > 0:
-                    direction = (self.bird.pos - self.slingshot_pos).normalize()
-                    self.bird.pos = self.slingshot_pos + direction * config.MAX_PULL_DISTANCE
+            # 平方根を避けるため、距離の2乗で比較する
+            if self.slingshot_pos.distance_squared_to(self.bird.pos) > config.MAX_PULL_DISTANCE_SQUARED:
+                direction = (self.bird.pos - self.slingshot_pos).normalize()
+                self.bird.pos = self.slingshot_pos + direction * config.MAX_PULL_DISTANCE
             # 軌道計算
             current_launch_vector = self.slingshot_pos - self.bird.pos
             self.trajectory_points = calculate_trajectory(self.bird.pos, current_launch_vector)
@@ -231,7 +246,7 @@ class TitleScene:
 
     def draw(self, screen):
         """インタラクティブなタイトル画面を描画する。"""
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = render_target.mouse_pos()
         
         # --- カーソル形状の更新 ---
         is_start_hovered = self.start_button_rect.collidepoint(mouse_pos)
@@ -253,7 +268,8 @@ class TitleScene:
 
         if self.is_dragging or self.is_release_pending:
             for point in self.trajectory_points:
-                pygame.draw.circle(screen, config.WHITE, (int(point.x), int(point.y)), config.TRAJECTORY_POINT_RADIUS)
+                sprite_batch.add_circle(config.WHITE, (int(point.x), int(point.y)), config.TRAJECTORY_POINT_RADIUS)
+            sprite_batch.draw(screen)
 
             pygame.draw.line(screen, config.BLACK, self.slingshot_pos, self.bird.pos, 5)
 
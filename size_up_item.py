@@ -8,6 +8,9 @@ class SizeUpItem(BaseItem):
     雲の上に出現する巨大化アイテムを管理するクラス。
     取得するとバードが一定時間巨大化する。
     """
+    item_kind = "size_up" # config.ITEM_SPAWN_TYPESでの種類名
+    __slots__ = ("color", "outline_color", "float_offset", "float_direction")
+
     def __init__(self, parent_cloud=None, position=None):
         super().__init__(parent_cloud, position, config.SIZE_UP_ITEM_SIZE)
         self.color = config.SIZE_UP_ITEM_COLOR
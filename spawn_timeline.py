@@ -0,0 +1,102 @@
+import heapq
+import random
+import config
+from itertools import accumulate
+
+class SpawnTimeline:
+    """
+    ステージ開始時に、そのステージの敵の出現予定（時刻、種類、出現位置、大きさ）を決めて
+    時刻順のヒープとして保持するクラス。
+    抽選にはステージごとのシードで初期化した専用の乱数を使うので、同じシードなら
+    プレイヤーの操作に関係なく同じ順番で同じ敵が出現する（リプレイや出現予定の表示に使える）。
+    毎フレームの処理は、ヒープの先頭の時刻を見るだけで済む。
+    """
+    def __init__(self, settings, seed, start_time, lookahead=config.SPAWN_TIMELINE_LOOKAHEAD):
+        """
+        :param settings: ステージ設定の辞書
+        :param seed: このステージの出現予定を決める乱数のシード
+        :param start_time: ステージの開始時刻 (ms)
+        :param lookahead: 出現予定を何体先まで決めておくか
+        """
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.lookahead = lookahead
+        self.stat_multiplier = settings.get("stat_multiplier", {"hp": 1.0, "speed": 1.0, "attack": 1.0})
+        self.events = [] # (時刻, 通し番号, 敵の種類, 出現位置, 大きさ) のヒープ
+        self.sequence = 0 # 同じ時刻のイベントを登録順に並べるための通し番号
+
+        # --- ボスステージでは、開始直後にボスを一度だけ出現させる ---
+        if settings.get("is_boss_stage") and settings.get("boss_type"):
+            self._push(start_time, "boss", None, None)
+
+        # --- 一定間隔で出現するザコ敵 ---
+        self.spawn_interval = settings.get("enemy_spawn_interval", config.ENEMY_SPAWN_INTERVAL)
+        enemy_weights = settings.get("enemy_weights") or {}
+        # 重みが0の種類は抽選に含めない
+        enemy_weights = {enemy_type: weight for enemy_type, weight in enemy_weights.items() if weight > 0}
+        self.enemy_types = tuple(enemy_weights)
+        self.cum_weights = tuple(accumulate(enemy_weights.values()))
+        self.next_wave_time = start_time + config.FIRST_ENEMY_SPAWN_DELAY
+        self._extend()
+
+    @property
+    def next_time(self):
+        """次のイベントの時刻を返す。予定がなければNoneを返す。"""
+        return self.events[0][0] if self.events else None
+
+    def _push(self, time, enemy_type, spawn_pos, size):
+        heapq.heappush(self.events, (time, self.sequence, enemy_type, spawn_pos, size))
+        self.sequence += 1
+
+    def _extend(self):
+        """一定間隔の出現予定が、lookahead体分ヒープに入っている状態にする。"""
+        if not self.enemy_types:
+            return
+        while len(self.events) < self.lookahead:
+            enemy_type = self.rng.choices(self.enemy_types, cum_weights=self.cum_weights, k=1)[0]
+            spawn_pos = None # Noneなら敵の種類ごとの既定の位置 (画面右端の地面の上)
+            if enemy_type == "flying":
+                size = self.rng.uniform(config.FLYING_ENEMY_MIN_SIZE, config.FLYING_ENEMY_MAX_SIZE)
+                spawn_pos = (config.SCREEN_WIDTH + config.FLYING_ENEMY_MAX_SIZE / 2,
+                             self.rng.uniform(config.FLYING_ENEMY_MIN_Y, config.FLYING_ENEMY_MAX_Y))
+            elif enemy_type == "jumping":
+                size = self.rng.uniform(config.JUMPING_ENEMY_MIN_SIZE, config.JUMPING_ENEMY_MAX_SIZE)
+            else:
+                size = self.rng.uniform(config.ENEMY_MIN_SIZE, config.ENEMY_MAX_SIZE)
+            self._push(self.next_wave_time, enemy_type, spawn_pos, size)
+            self.next_wave_time += self.spawn_interval
+
+    def pop_due(self, current_time):
+        """
+        出現時刻を過ぎたイベントをヒープから取り出して返す。
+        処理落ちなどで出現時刻からspawn_interval以上遅れていた場合は、遅れていた予定をまとめて返さず、
+        取り出した1件より後の予定を遅れの分だけ後ろへずらす（同じ位置に何体も同時に出現させないため）。
+        :param current_time: 現在時刻 (ms)
+        :return: [(時刻, 通し番号, 敵の種類, 出現位置, 大きさ), ...] (時刻順)
+        """
+        due = []
+        while self.events and self.events[0][0] < current_time:
+            event = heapq.heappop(self.events)
+            due.append(event)
+            lag = current_time - event[0]
+            if lag > self.spawn_interval:
+                self.shift(lag)
+        if due:
+            self._extend()
+        return due
+
+    def shift(self, delay):
+        """
+        まだ取り出していない全ての予定を、指定した時間だけ後ろへずらす。
+        :param delay: ずらす時間 (ms)
+        """
+        # 全ての時刻に同じ値を足すだけなので、ヒープの順序は崩れない
+        self.events = [(time + delay, sequence, enemy_type, spawn_pos, size) for time, sequence, enemy_type, spawn_pos, size in self.events]
+        self.next_wave_time += delay
+
+    def preview(self, count=5):
+        """
+        これから出現する予定のイベントを、時刻の早い順に返す（ヒープは変更しない）。
+        :param count: 返す件数
+        """
+        return heapq.nsmallest(count, self.events)
@@ -8,6 +8,9 @@ class SpeedUpItem(BaseItem):
     雲の上に出現するスピードアップアイテムを管理するクラス。
     取得するとバードの速度が上昇する。
     """
+    item_kind = "speed_up" # config.ITEM_SPAWN_TYPESでの種類名
+    __slots__ = ("color", "outline_color", "angle")
+
     def __init__(self, parent_cloud=None, position=None):
         super().__init__(parent_cloud, position, config.SPEED_UP_ITEM_SIZE)
         self.color = config.SPEED_UP_ITEM_COLOR
@@ -0,0 +1,75 @@
+import pygame
+from ui_utils import draw_heart
+
+# 描画済みの小さなスプライトのキャッシュ。パーティクルの色と大きさ、軌道の点、ハートの種類は少ないので、上限は設けない
+_circle_sprites = {} # (色, 半径) -> Surface
+_heart_sprites = {} # (大きさ, 色) -> (Surface, 中心までのオフセット)
+
+def _prepare(surface):
+    """画面と同じピクセル形式に変換しておく (blitが速くなる)。"""
+    return surface.convert_alpha() if pygame.display.get_surface() is not None else surface
+
+def circle_sprite(color, radius):
+    """
+    pygame.draw.circleで描く塗りつぶしの円と同じ見た目のスプライトを返す。
+    :param color: 円の色
+    :param radius: 円の半径 (整数)
+    :return: (半径 * 2 + 1) 四方のSurface。円の中心は (radius, radius)
+    """
+    key = (color, radius)
+    sprite = _circle_sprites.get(key)
+    if sprite is None:
+        size = radius * 2 + 1
+        sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, color, (radius, radius), radius)
+        sprite = _circle_sprites[key] = _prepare(sprite)
+    return sprite
+
+def heart_sprite(size, color):
+    """
+    draw_heartで描くハートと同じ見た目のスプライトを返す。
+    :param size: ハートの大きさ
+    :param color: ハートの色
+    :return: (Surface, ハートの中心までのオフセット (整数))
+    """
+    key = (size, color)
+    entry = _heart_sprites.get(key)
+    if entry is None:
+        # ハートの曲線は中心から左右に size / 2、上下に size * 17 / 32 程度まで広がる
+        offset = int(size * 0.6) + 2
+        sprite = pygame.Surface((offset * 2, offset * 2), pygame.SRCALPHA)
+        draw_heart(sprite, offset, offset, size, color)
+        entry = _heart_sprites[key] = (_prepare(sprite), offset)
+    return entry
+
+class SpriteBatch:
+    """
+    小さなスプライトの描画をためておき、Surface.fblitsの1回の呼び出しでまとめて描画するクラス。
+    パーティクルや軌道の点のように、同じ形の小さな図形を大量に描く場合に、
+    図形ごとにpygame.drawを呼ぶ代わりに使う。
+    """
+    def __init__(self):
+        self.items = [] # (Surface, 描画する左上の座標) のリスト
+
+    def add(self, sprite, topleft):
+        """スプライトを描画する予定に加える。"""
+        self.items.append((sprite, topleft))
+
+    def add_circle(self, color, center, radius):
+        """
+        塗りつぶしの円を描画する予定に加える。pygame.draw.circleと同じ位置に描かれる。
+        :param center: 円の中心 (整数の座標)
+        :param radius: 円の半径 (整数)。1未満なら何も描かない
+        """
+        if radius < 1:
+            return
+        self.items.append((circle_sprite(color, radius), (center[0] - radius, center[1] - radius)))
+
+    def draw(self, screen):
+        """ためておいたスプライトをまとめて描画し、予定を空にする。"""
+        if self.items:
+            screen.fblits(self.items)
+            self.items.clear()
+
+# アプリ全体で共有する描画のまとめ役。描画する順番を保つため、図形のまとまりごとにdraw()を呼ぶこと
+sprite_batch = SpriteBatch()
@@ -0,0 +1,70 @@
+import pygame
+import config
+from collections import OrderedDict
+
+class SpriteCache:
+    """
+    敵の見た目を大きさごとに一度だけSurfaceへ焼き込み、同じ種類・同じ大きさの敵で共有するキャッシュ。
+    大きさはSPRITE_CACHE_SIZE_BUCKETの刻みに丸めてから探すので、ランダムな大きさの敵や
+    ひるみアニメーション中の縮小版も、少数のスプライトで描画できる。
+    合計サイズがSPRITE_CACHE_MAX_BYTESを超えたら、最も長く使われていないものから捨てる。
+    """
+    def __init__(self, max_bytes=config.SPRITE_CACHE_MAX_BYTES):
+        """
+        :param max_bytes: キャッシュするスプライトの合計サイズの上限 (バイト)
+        """
+        self.max_bytes = max_bytes
+        self.sprites = OrderedDict() # (種類, 幅, 高さ) -> Surface。末尾ほど最近使われたもの
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def bucket(size):
+        """大きさをキャッシュの刻みに丸める (最小でも1刻み分)。"""
+        step = config.SPRITE_CACHE_SIZE_BUCKET
+        return max(step, int(size / step + 0.5) * step)
+
+    def get(self, kind, width, height, builder):
+        """
+        指定した種類と大きさのスプライトを返す。なければbuilderで作成してキャッシュする。
+        :param kind: スプライトの種類を表すキー (色などの見た目の違いも含める)
+        :param width: 描画したい幅 (px)。刻みに丸められる
+        :param height: 描画したい高さ (px)。刻みに丸められる
+        :param builder: (幅, 高さ) を受け取り、Surfaceを返す関数
+        :return: 焼き込み済みのSurface
+        """
+        key = (kind, self.bucket(width), self.bucket(height))
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            self.sprites.move_to_end(key)
+            return sprite
+
+        self.misses += 1
+        sprite = builder(key[1], key[2])
+        if pygame.display.get_surface() is not None:
+            # 画面と同じピクセル形式にしておくと、blitが速くなる
+            sprite = sprite.convert_alpha() if sprite.get_flags() & pygame.SRCALPHA else sprite.convert()
+        self.sprites[key] = sprite
+        self.total_bytes += self._size_of(sprite)
+        self._evict()
+        return sprite
+
+    def _size_of(self, sprite):
+        width, height = sprite.get_size()
+        return width * height * sprite.get_bytesize()
+
+    def _evict(self):
+        """合計サイズが上限を超えている間、最も長く使われていないスプライトを捨てる。"""
+        while self.total_bytes > self.max_bytes and len(self.sprites) > 1:
+            _, sprite = self.sprites.popitem(last=False)
+            self.total_bytes -= self._size_of(sprite)
+
+    def clear(self):
+        """キャッシュを空にする。"""
+        self.sprites.clear()
+        self.total_bytes = 0
+
+# アプリ全体で共有するスプライトキャッシュ
+sprite_cache = SpriteCache()
@@ -16,6 +16,10 @@ class StageManager:
         """現在のステージの設定データを返す。"""
         return self.stages.get(self.current_stage)
 
+    def get_next_stage_settings(self):
+        """次のステージの設定データを返す。現在が最終ステージならNoneを返す。"""
+        return self.stages.get(self.current_stage + 1)
+
     def advance_stage(self):
         """次のステージに進む。"""
         next_stage_number = self.current_stage + 1
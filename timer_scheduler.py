@@ -0,0 +1,81 @@
+import heapq
+import pygame
+
+class Timer:
+    """TimerScheduler.schedule() が返す、登録済みのタイマー。cancel()で取り消せる。"""
+    def __init__(self, time, callback, args):
+        self.time = time # 発火する時刻 (ms)
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        """タイマーを取り消す。発火済みの場合は何もしない。"""
+        self.cancelled = True
+        # ヒープに残っている間も、コールバックの持ち主 (敵など) を生かし続けないよう参照を手放す
+        self.callback = None
+        self.args = ()
+
+class TimerScheduler:
+    """
+    時間経過で発生する処理（効果の終了、一定間隔の切り替えなど）をまとめて管理するクラス。
+    タイマーは発火時刻の早い順にヒープで保持し、update()では時刻を過ぎたものだけを取り出して
+    コールバックを呼ぶ。各オブジェクトが毎フレーム時刻を確認する必要がなくなるため、
+    オブジェクトの数が増えても毎フレームの処理はヒープの先頭を見るだけで済む。
+    取り消されたタイマーはヒープから即座には削除せず、取り出した時に読み捨てる。
+    """
+    def __init__(self):
+        self.timers = [] # (発火時刻, 通し番号, Timer) のヒープ
+        self.sequence = 0 # 同じ時刻のタイマーを登録順に発火させるための通し番号
+
+    def schedule(self, delay, callback, *args):
+        """
+        現在時刻からdelayミリ秒後に、callback(*args)を呼ぶタイマーを登録する。
+        :return: 登録したTimer
+        """
+        return self.schedule_at(pygame.time.get_ticks() + delay, callback, *args)
+
+    def schedule_at(self, time, callback, *args):
+        """
+        指定した時刻に、callback(*args)を呼ぶタイマーを登録する。
+        :param time: 発火する時刻 (pygame.time.get_ticks()と同じ基準のms)
+        :return: 登録したTimer
+        """
+        timer = Timer(time, callback, args)
+        heapq.heappush(self.timers, (time, self.sequence, timer))
+        self.sequence += 1
+        return timer
+
+    def update(self, current_time):
+        """
+        発火時刻を過ぎたタイマーのコールバックを、時刻順に呼ぶ。
+        コールバックの中で新しいタイマーを登録してもよい（時刻を過ぎていれば同じupdate内で発火する）。
+        :param current_time: 現在時刻 (ms)
+        """
+        timers = self.timers
+        while timers and timers[0][0] <= current_time:
+            timer = heapq.heappop(timers)[2]
+            if not timer.cancelled:
+                timer.cancelled = True # 発火済みの印。以降のcancel()は何もしない
+                timer.callback(*timer.args)
+
+    def shift(self, delay):
+        """
+        登録されている全てのタイマーの発火時刻を、指定した時間だけ後ろへずらす。
+        ゲームを一時停止していた時間を、効果時間などに含めないために使う。
+        :param delay: ずらす時間 (ms)
+        """
+        # 全ての時刻に同じ値を足すだけなので、ヒープの順序は崩れない
+        self.timers = [(time + delay, sequence, timer) for time, sequence, timer in self.timers]
+        for _, _, timer in self.timers:
+            timer.time += delay
+
+    def clear(self):
+        """登録されているタイマーをすべて破棄する。"""
+        self.timers.clear()
+
+    def __len__(self):
+        return len(self.timers)
+
+# アプリ全体で共有するタイマー管理
+timer_scheduler = TimerScheduler()
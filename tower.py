@@ -17,6 +17,8 @@ class Tower:
         self.base_x = base_x
         self.ground_y = ground_y
         self.blocks = []
+        # 落下中・アニメーション中・破壊中のブロック。静止しているブロックは更新しない
+        self.active_blocks = set()
         block_width = config.TOWER_BLOCK_WIDTH
         block_height = config.TOWER_BLOCK_HEIGHT
 
@@ -25,30 +27,47 @@ class Tower:
         for i in range(self.original_num_blocks):
             block_x = base_x
             block_y = ground_y - (i + 1) * block_height
-            self.blocks.append(Block(block_x, block_y, block_width, block_height))
+            self._add_block(Block(block_x, block_y, block_width, block_height))
+
+    def _add_block(self, block):
+        """ブロックをタワーに加え、動き出した時に更新対象へ戻せるようにする。"""
+        block.on_wake = self._wake_block
+        self.blocks.append(block)
+
+    def _wake_block(self, block):
+        """静止していたブロックが動き出した (衝突、ダメージ、支えの消失) ので、更新対象に加える。"""
+        self.active_blocks.add(block)
 
     def update(self):
         """
-        タワーを構成する全てのブロックを更新する。
+        動いているブロックだけを更新する。
         破壊されたブロックを検知し、その上のブロックを落下させる。
         """
-        # 1. 各ブロックの内部状態（アニメーション、落下物理）を更新する
-        for i, block in enumerate(self.blocks):
-            # 自分より下にあるブロックのリストを渡す
-            blocks_below = self.blocks[:i]
+        if not self.active_blocks:
+            return # 全てのブロックが静止している
+
+        # 1. 動いているブロックの内部状態（アニメーション、落下物理）を、下のブロックから順に更新する
+        for block in sorted(self.active_blocks, key=self.blocks.index):
+            # 落下中なら、自分より下にあるブロックのリストを渡す
+            blocks_below = self.blocks[:self.blocks.index(block)] if block.is_falling else ()
             block.update(blocks_below, self.ground_y)
 
         # 2. 破壊アニメーションが完了したブロックをリストから削除する
-        #    リストを逆順に走査することで、安全に要素を削除できる
-        for i in range(len(self.blocks) - 1, -1, -1):
-            if self.blocks[i].is_finished():
-                # ブロックをリストから削除
-                del self.blocks[i]
+        #    上のブロックから順に削除することで、インデックスがずれないようにする
+        finished = sorted((block for block in self.active_blocks if block.is_finished()), key=self.blocks.index, reverse=True)
+        for block in finished:
+            i = self.blocks.index(block)
+            # ブロックをリストから削除
+            del self.blocks[i]
+            self.active_blocks.discard(block)
+
+            # 削除によって生じた隙間の上にあるブロック全てを落下させる
+            # 削除後のリストのインデックス`i`から末尾までが対象
+            for j in range(i, len(self.blocks)):
+                self.blocks[j].start_falling()
 
-                # 削除によって生じた隙間の上にあるブロック全てを落下させる
-                # 削除後のリストのインデックス`i`から末尾までが対象
-                for j in range(i, len(self.blocks)):
-                    self.blocks[j].start_falling()
+        # 3. 静止したブロックを更新対象から外す
+        self.active_blocks = {block for block in self.active_blocks if not block.is_resting()}
 
     def draw(self, screen):
         """タワーを構成する全てのブロックを描画する。"""
@@ -77,7 +96,7 @@ class Tower:
 
         # 新しいブロックを作成してリストの末尾に追加（一番上に追加される）
         new_block = Block(self.base_x, new_block_top_y, config.TOWER_BLOCK_WIDTH, config.TOWER_BLOCK_HEIGHT)
-        self.blocks.append(new_block)
+        self._add_block(new_block)
 
         # ブロックが正しく層になるように、Y座標でソートする（下から上へ）
         self.blocks.sort(key=lambda b: b.rect.y, reverse=True)
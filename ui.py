@@ -1,14 +1,16 @@
 import pygame
 import math
 import config
-from ui_utils import draw_text, draw_heart
-from end_screen import EndScreen
+from ui_utils import draw_text, render_text
+from sprite_batch import heart_sprite
 
 class ComboIndicator:
     """
     画面に表示されるコンボテキストの情報を保持し、
     アニメーションと描画のロジックを自己完結して持つクラス。
     """
+    __slots__ = ("start_pos", "combo_count", "start_time", "alive", "current_pos", "current_color", "alpha")
+
     def __init__(self, position, combo_count: int):
         self.start_pos = position.copy()
         self.combo_count = combo_count
@@ -32,11 +34,8 @@ class ComboIndicator:
         # 位置 (下から上へ)
         self.current_pos.y = self.start_pos.y - (config.COMBO_MOVE_Y * progress)
 
-        # 色 (開始色から終了色へ線形補間)
-        r = config.COMBO_START_COLOR[0] + (config.COMBO_END_COLOR[0] - config.COMBO_START_COLOR[0]) * progress
-        g = config.COMBO_START_COLOR[1] + (config.COMBO_END_COLOR[1] - config.COMBO_START_COLOR[1]) * progress
-        b = config.COMBO_START_COLOR[2] + (config.COMBO_END_COLOR[2] - config.COMBO_START_COLOR[2]) * progress
-        self.current_color = (r, g, b)
+        # 色 (開始色から終了色へ線形補間。補間結果はconfigで事前計算済み)
+        self.current_color = config.lerp_color(config.COMBO_COLOR_TABLE, progress)
 
         # 透明度 (不透明 -> 透明)
         self.alpha = 255 * (1.0 - progress)
@@ -83,6 +82,8 @@ class ScoreIndicator:
     画面に表示されるスコアテキストの情報を保持するデータクラス。
     アニメーションと描画のロジックを自己完結して持つ。
     """
+    __slots__ = ("start_pos", "text", "start_time", "alive", "current_pos", "alpha")
+
     def __init__(self, position, text: str):
         self.start_pos = position.copy()
         self.text = text
@@ -124,22 +125,86 @@ class ScoreIndicator:
     def is_alive(self):
         return self.alive
 
+class WidgetCache:
+    """
+    HUDの部品ごとに、描画済みのSurfaceを表示内容（キー）と一緒に保持するクラス。
+    キーが前回と同じなら描き直さず、前回のSurfaceをそのまま使う。
+    """
+    def __init__(self):
+        self.widgets = {} # 部品の名前 -> (キー, Surface, 左上の座標)
+        self.render_count = 0 # 描き直した回数 (確認用)
+
+    def get(self, name, key, render, *args):
+        """
+        部品の描画済みSurfaceを返す。キーが変わっていればrender(*args)で描き直す。
+        :param name: 部品の名前
+        :param key: 表示内容を表す値。これが変わった時だけ描き直す
+        :param render: (Surface, 左上の座標) を返す関数
+        :return: (Surface, 左上の座標)
+        """
+        entry = self.widgets.get(name)
+        if entry is None or entry[0] != key:
+            surface, topleft = render(*args)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+            entry = self.widgets[name] = (key, surface, topleft)
+            self.render_count += 1
+        return entry[1], entry[2]
+
 class HUD:
-    """ゲーム中の通常HUD（スコア、ライフなど）の描画を担当するクラス。"""
+    """
+    ゲーム中の通常HUD（スコア、ライフなど）の描画を担当するクラス。
+    各部品は表示する値が変わった時だけ描き直し、毎フレームは描画済みの部品を1回のfblitsで画面に転送する。
+    """
+    # 満タン時に大きくなる"COMBO"の文字がはみ出さないように、ゲージの部品の周りに取る余白
+    GAUGE_MARGIN = config.COMBO_GAUGE_TEXT_PULSE_ADDITIONAL_SIZE
+
     def __init__(self, screen, ui_font, boss_font):
         self.screen = screen
         self.ui_font = ui_font
         self.boss_font = boss_font
-        self.gauge_font = pygame.font.Font(None, config.COMBO_GAUGE_TEXT_BASE_FONT_SIZE) # ゲージ用フォント
+        self.gauge_fonts = {config.COMBO_GAUGE_TEXT_BASE_FONT_SIZE: pygame.font.Font(None, config.COMBO_GAUGE_TEXT_BASE_FONT_SIZE)} # 大きさ -> ゲージ用フォント
         # ゲージ満タンエフェクト用の状態変数
         self.is_gauge_flashing = False
         self.gauge_flash_start_time = 0
-
+        self.widgets = WidgetCache()
+
+    def _gauge_font(self, size):
+        """ゲージの文字用のフォントを返す。点滅中に大きさが変わるので、大きさごとに使い回す。"""
+        font = self.gauge_fonts.get(size)
+        if font is None:
+            font = self.gauge_fonts[size] = pygame.font.Font(None, size)
+        return font
+
+    def _render_gauge(self, fg_width, foreground_color, font_size):
+        """コンボゲージ（背景、溜まっている量、枠線、"COMBO"の文字）を描画する。"""
+        margin = self.GAUGE_MARGIN
+        surface = pygame.Surface((config.COMBO_GAUGE_WIDTH + margin * 2, config.COMBO_GAUGE_HEIGHT + margin * 2), pygame.SRCALPHA)
+        bg_rect = pygame.Rect(margin, margin, config.COMBO_GAUGE_WIDTH, config.COMBO_GAUGE_HEIGHT)
+        pygame.draw.rect(surface, config.COMBO_GAUGE_BG_COLOR, bg_rect, border_radius=5)
+        if fg_width > 0:
+            fg_rect = pygame.Rect(bg_rect.left, bg_rect.top, fg_width, bg_rect.height)
+            pygame.draw.rect(surface, foreground_color, fg_rect, border_radius=5)
+        pygame.draw.rect(surface, config.COMBO_GAUGE_OUTLINE_COLOR, bg_rect, config.COMBO_GAUGE_OUTLINE_WIDTH, border_radius=5)
+        draw_text(surface, "COMBO", self._gauge_font(font_size), config.WHITE, bg_rect.center, config.BLACK, 1)
+
+        screen_rect = pygame.Rect(0, 0, config.COMBO_GAUGE_WIDTH, config.COMBO_GAUGE_HEIGHT)
+        screen_rect.center = (config.COMBO_GAUGE_X, config.COMBO_GAUGE_Y)
+        return surface, (screen_rect.left - margin, screen_rect.top - margin)
+
+    def _render_hearts(self, count):
+        """タワーのライフを表すハートを、count個並べて描画する。"""
+        sprite, offset = heart_sprite(config.TOWER_HEART_SIZE, config.TOWER_HEART_COLOR)
+        surface = pygame.Surface(((count - 1) * config.TOWER_HEART_SPACING + offset * 2, offset * 2), pygame.SRCALPHA)
+        surface.fblits([(sprite, (i * config.TOWER_HEART_SPACING, 0)) for i in range(count)])
+        return surface, (config.TOWER_HEART_START_X - offset, config.TOWER_HEART_Y - offset)
 
     def draw(self, tower, current_stage, max_combo_count, current_score, combo_gauge, combo_gauge_max):
         """
         ゲーム中の共通HUD（ステージ、スコア、コンボ、ライフ）を描画する。
         """
+        parts = []
+
         # --- コンボゲージの描画 ---
         if combo_gauge_max > 0:
             current_time = pygame.time.get_ticks()
@@ -153,137 +218,94 @@ class HUD:
                 if elapsed_time < config.COMBO_GAUGE_FLASH_DURATION:
                     # サイン波を使って滑らかに点滅させる (0 -> 1 -> 0)
                     flash_progress = math.sin((elapsed_time / config.COMBO_GAUGE_FLASH_DURATION) * math.pi)
-                    # 色を線形補間
-                    r = int(config.COMBO_GAUGE_COLOR[0] + (config.COMBO_GAUGE_FLASH_COLOR[0] - config.COMBO_GAUGE_COLOR[0]) * flash_progress)
-                    g = int(config.COMBO_GAUGE_COLOR[1] + (config.COMBO_GAUGE_FLASH_COLOR[1] - config.COMBO_GAUGE_COLOR[1]) * flash_progress)
-                    b = int(config.COMBO_GAUGE_COLOR[2] + (config.COMBO_GAUGE_FLASH_COLOR[2] - config.COMBO_GAUGE_COLOR[2]) * flash_progress)
-                    foreground_color = (r, g, b)
+                    # 色を線形補間 (補間結果はconfigで事前計算済み)
+                    foreground_color = config.lerp_color(config.COMBO_GAUGE_FLASH_COLOR_TABLE, flash_progress)
                 else:
                     self.is_gauge_flashing = False # エフェクト終了
 
-            # 背景
-            bg_rect = pygame.Rect(0, 0, config.COMBO_GAUGE_WIDTH, config.COMBO_GAUGE_HEIGHT)
-            bg_rect.center = (config.COMBO_GAUGE_X, config.COMBO_GAUGE_Y)
-            pygame.draw.rect(self.screen, config.COMBO_GAUGE_BG_COLOR, bg_rect, border_radius=5)
+            # 溜まっているゲージの幅。フラッシュ中はゲージを満タンで表示する
+            gauge_ratio = 1.0 if self.is_gauge_flashing else min(combo_gauge / combo_gauge_max, 1.0)
+            fg_width = int(config.COMBO_GAUGE_WIDTH * gauge_ratio)
 
-            # 前景（溜まっているゲージ）
-            gauge_ratio = min(combo_gauge / combo_gauge_max, 1.0)
-            # フラッシュ中はゲージを満タンで表示する
-            if self.is_gauge_flashing:
-                gauge_ratio = 1.0
-
-            fg_width = bg_rect.width * gauge_ratio
-            if fg_width > 0:
-                fg_rect = pygame.Rect(bg_rect.left, bg_rect.top, fg_width, bg_rect.height)
-                pygame.draw.rect(self.screen, foreground_color, fg_rect, border_radius=5)
-
-            # 枠線
-            pygame.draw.rect(self.screen, config.COMBO_GAUGE_OUTLINE_COLOR, bg_rect, config.COMBO_GAUGE_OUTLINE_WIDTH, border_radius=5)
-
-            # --- "COMBO" テキストを描画 ---
-            # エフェクト中はフォントサイズを動的に変更
-            current_gauge_font = self.gauge_font
+            # エフェクト中は"COMBO"のフォントサイズを動的に変更
+            font_size = config.COMBO_GAUGE_TEXT_BASE_FONT_SIZE
             if self.is_gauge_flashing and flash_progress > 0:
-                additional_size = int(config.COMBO_GAUGE_TEXT_PULSE_ADDITIONAL_SIZE * flash_progress)
-                current_font_size = config.COMBO_GAUGE_TEXT_BASE_FONT_SIZE + additional_size
-                current_gauge_font = pygame.font.Font(None, current_font_size)
+                font_size += int(config.COMBO_GAUGE_TEXT_PULSE_ADDITIONAL_SIZE * flash_progress)
 
-            draw_text(
-                self.screen,
-                "COMBO",
-                current_gauge_font,
-                config.WHITE,
-                (bg_rect.centerx, bg_rect.centery), # ゲージの中央に配置
-                config.BLACK, 1
-            )
+            # 点滅中は毎フレーム描き直し、それ以外はゲージの量が変わった時だけ描き直す
+            parts.append(self.widgets.get("gauge", (fg_width, foreground_color, font_size), self._render_gauge, fg_width, foreground_color, font_size))
 
-        # --- 現在のステージ番号を描画 ---
-        stage_text = f"STAGE {current_stage}"
-        draw_text(
-            self.screen,
-            stage_text,
-            self.ui_font,
-            config.WHITE,
-            (150, 40), # 画面左上に表示
-            config.BLACK,
-            config.UI_COUNTER_OUTLINE_WIDTH
-        )
+        # --- 現在のステージ番号を描画 (画面左上) ---
+        parts.append(self.widgets.get(
+            "stage", current_stage, render_text,
+            f"STAGE {current_stage}", self.ui_font, config.WHITE, (150, 40), config.BLACK, config.UI_COUNTER_OUTLINE_WIDTH
+        ))
 
-        # --- 最大コンボ数を描画 ---
+        # --- 最大コンボ数を描画 (画面右上、ステージ番号より少し小さいフォント) ---
         if max_combo_count > 0:
-            max_combo_text = f"MAX COMBO: {max_combo_count}"
-            draw_text(
-                self.screen,
-                max_combo_text,
-                self.boss_font, # ステージ番号より少し小さいフォント
-                config.YELLOW,
-                (config.SCREEN_WIDTH - 150, 80), # 画面右上に表示
-                config.BLACK,
-                config.UI_COUNTER_OUTLINE_WIDTH
-            )
+            parts.append(self.widgets.get(
+                "max_combo", max_combo_count, render_text,
+                f"MAX COMBO: {max_combo_count}", self.boss_font, config.YELLOW, (config.SCREEN_WIDTH - 150, 80), config.BLACK, config.UI_COUNTER_OUTLINE_WIDTH
+            ))
 
-        # --- 現在のスコアを描画 ---
-        score_text = f"SCORE: {current_score}"
-        draw_text(
-            self.screen,
-            score_text,
-            self.boss_font, # MAX COMBOと同じフォントサイズ
-            config.WHITE,
-            (150, 80), # ステージ番号の下に表示
-            config.BLACK,
-            config.UI_COUNTER_OUTLINE_WIDTH
-        )
+        # --- 現在のスコアを描画 (ステージ番号の下) ---
+        parts.append(self.widgets.get(
+            "score", current_score, render_text,
+            f"SCORE: {current_score}", self.boss_font, config.WHITE, (150, 80), config.BLACK, config.UI_COUNTER_OUTLINE_WIDTH
+        ))
 
         # --- タワーのライフ（ブロック数）を描画 ---
-        num_lives = len(tower.blocks)
-        if num_lives > 0:
-            for i in range(int(num_lives)):
-                heart_x = config.TOWER_HEART_START_X + i * config.TOWER_HEART_SPACING
-                if heart_x > config.SCREEN_WIDTH - config.TOWER_HEART_SIZE:
-                    break
-                draw_heart(self.screen, heart_x, config.TOWER_HEART_Y, config.TOWER_HEART_SIZE, config.TOWER_HEART_COLOR)
+        # 画面の右端からはみ出すハートは描かない
+        max_hearts = (config.SCREEN_WIDTH - config.TOWER_HEART_SIZE - config.TOWER_HEART_START_X) // config.TOWER_HEART_SPACING + 1
+        num_hearts = min(len(tower.blocks), max_hearts)
+        if num_hearts > 0:
+            parts.append(self.widgets.get("hearts", num_hearts, self._render_hearts, num_hearts))
+
+        self.screen.fblits(parts)
 
 class BossHUD:
-    """ボス戦専用のHUD（HPバーなど）の描画を担当するクラス。"""
+    """ボス戦専用のHUD（HPバーなど）の描画を担当するクラス。HPとボスの名前が変わった時だけ描き直す。"""
     def __init__(self, screen, boss_font):
         self.screen = screen
         self.boss_font = boss_font
+        self.widgets = WidgetCache()
+
+    def _render_hp_bar(self, current_hp_width):
+        """HPバー（背景、残りHP、枠線）を描画する。"""
+        bar_width = config.BOSS_HP_BAR_WIDTH
+        bar_height = config.BOSS_HP_BAR_HEIGHT
+        surface = pygame.Surface((bar_width, bar_height), pygame.SRCALPHA)
+
+        bg_rect = pygame.Rect(0, 0, bar_width, bar_height)
+        pygame.draw.rect(surface, config.BOSS_HP_BAR_BG_COLOR, bg_rect, border_radius=5)
+        if current_hp_width > 0:
+            hp_rect = pygame.Rect(0, 0, current_hp_width, bar_height)
+            pygame.draw.rect(surface, config.BOSS_HP_BAR_COLOR, hp_rect, border_radius=5)
+        pygame.draw.rect(surface, config.BLACK, bg_rect, config.BOSS_HP_BAR_OUTLINE_WIDTH, border_radius=5)
+        return surface, ((config.SCREEN_WIDTH - bar_width) / 2, config.BOSS_HP_BAR_Y)
 
     def draw(self, boss, boss_name):
         """ボス戦のUIを描画する。"""
         # --- "BOSS BATTLE" テキスト ---
-        draw_text(
-            self.screen,
-            "BOSS BATTLE", self.boss_font, config.BOSS_UI_TITLE_COLOR,
-            (config.SCREEN_WIDTH - 160, 40),
-            config.BLACK, config.UI_COUNTER_OUTLINE_WIDTH
+        title = self.widgets.get(
+            "title", None, render_text,
+            "BOSS BATTLE", self.boss_font, config.BOSS_UI_TITLE_COLOR, (config.SCREEN_WIDTH - 160, 40), config.BLACK, config.UI_COUNTER_OUTLINE_WIDTH
         )
 
         # --- HPバー ---
-        bar_width = config.BOSS_HP_BAR_WIDTH
-        bar_height = config.BOSS_HP_BAR_HEIGHT
-        bar_x = (config.SCREEN_WIDTH - bar_width) / 2
-        bar_y = config.BOSS_HP_BAR_Y
-
         hp_ratio = boss.hp / boss.max_hp if boss.max_hp > 0 else 0
-        current_hp_width = bar_width * hp_ratio
-
-        bg_rect = pygame.Rect(bar_x, bar_y, bar_width, bar_height)
-        pygame.draw.rect(self.screen, config.BOSS_HP_BAR_BG_COLOR, bg_rect, border_radius=5)
-
-        if current_hp_width > 0:
-            hp_rect = pygame.Rect(bar_x, bar_y, current_hp_width, bar_height)
-            pygame.draw.rect(self.screen, config.BOSS_HP_BAR_COLOR, hp_rect, border_radius=5)
-
-        pygame.draw.rect(self.screen, config.BLACK, bg_rect, config.BOSS_HP_BAR_OUTLINE_WIDTH, border_radius=5)
-
-        name_pos = (bar_x + bar_width / 2, bar_y + config.BOSS_NAME_OFFSET_Y)
-        draw_text(
-            self.screen,
-            boss_name, self.boss_font, config.WHITE,
-            name_pos, config.BLACK, config.UI_COUNTER_OUTLINE_WIDTH
+        current_hp_width = int(config.BOSS_HP_BAR_WIDTH * hp_ratio)
+        hp_bar = self.widgets.get("hp_bar", current_hp_width, self._render_hp_bar, current_hp_width)
+
+        # --- ボスの名前 (HPバーの中央) ---
+        name_pos = (config.SCREEN_WIDTH / 2, config.BOSS_HP_BAR_Y + config.BOSS_NAME_OFFSET_Y)
+        name = self.widgets.get(
+            "name", boss_name, render_text,
+            boss_name, self.boss_font, config.WHITE, name_pos, config.BLACK, config.UI_COUNTER_OUTLINE_WIDTH
         )
 
+        self.screen.fblits([title, hp_bar, name])
+
 class UIManager:
     """
     ゲームのUI要素（テキスト、カウンター、メッセージなど）の描画を管理するクラス。
@@ -303,19 +325,39 @@ class UIManager:
         self.title_font = title_font
         self.boss_font = boss_font
         self.combo_font = combo_font
+        self.result_font = result_font
         self.drag_font = pygame.font.Font(None, config.DRAG_TEXT_FONT_SIZE) # DRAG表示用のフォント
         self.score_font = pygame.font.Font(None, config.SCORE_INDICATOR_FONT_SIZE) # スコアポップアップ用
         self.combo_indicators = [] # 表示中のコンボテキストを保持するリスト
         self.score_indicators = [] # 表示中のスコアテキストを保持するリスト
+        self.widgets = WidgetCache() # 討伐数カウンターなど、値が変わった時だけ描き直す部品
 
-        # --- ステップC-1: HUDクラスのインスタンス化 ---
-        self.hud = HUD(self.screen, self.ui_font, self.boss_font)
+        # HUD、BossHUD、EndScreenはゲームプレイ中にしか使わないため、最初に必要になった時に作成する
+        self._hud = None
+        self._boss_hud = None
+        self._end_screen = None
 
-        # --- ステップC-2: BossHUDクラスのインスタンス化 ---
-        self.boss_hud = BossHUD(self.screen, self.boss_font)
+    @property
+    def hud(self):
+        """ゲームプレイ中のHUD。最初に参照された時に作成する。"""
+        if self._hud is None:
+            self._hud = HUD(self.screen, self.ui_font, self.boss_font)
+        return self._hud
+
+    @property
+    def boss_hud(self):
+        """ボス戦用のHUD。最初に参照された時に作成する。"""
+        if self._boss_hud is None:
+            self._boss_hud = BossHUD(self.screen, self.boss_font)
+        return self._boss_hud
 
-        # --- ステップC-4: EndScreenクラスのインスタンス化 ---
-        self.end_screen = EndScreen(self.screen, self.title_font, result_font, self.boss_font)
+    @property
+    def end_screen(self):
+        """リザルト画面。最初に参照された時に作成する。"""
+        if self._end_screen is None:
+            from end_screen import EndScreen
+            self._end_screen = EndScreen(self.screen, self.title_font, self.result_font, self.boss_font)
+        return self._end_screen
 
     def update(self):
         """UI要素の状態（アニメーションなど）を更新し、不要なものを削除する。"""
@@ -377,18 +419,18 @@ class UIManager:
         else:
             # --- 通常UI (討伐数カウンター) ---
             counter_text = f"{enemies_defeated_count}/{enemies_to_clear}"
-            draw_text(
-                self.screen,
-                counter_text, self.ui_font, config.WHITE,
-                (config.SCREEN_WIDTH - 100, 40), config.BLACK, config.UI_COUNTER_OUTLINE_WIDTH
+            surface, topleft = self.widgets.get(
+                "counter", counter_text, render_text,
+                counter_text, self.ui_font, config.WHITE, (config.SCREEN_WIDTH - 100, 40), config.BLACK, config.UI_COUNTER_OUTLINE_WIDTH
             )
+            self.screen.blit(surface, topleft)
 
-    def draw_end_screen(self, stage_state, score=0, high_score=0, max_combo=0, best_combo=0, tower_height=0, tower_bonus=0, best_tower_height=0, mouse_pos=(0,0)):
+    def draw_end_screen(self, stage_state, score=0, high_score=0, max_combo=0, best_combo=0, tower_height=0, tower_bonus=0, best_tower_height=0, mouse_pos=(0,0), run_rank=None):
         """
         ステージクリアまたはゲームオーバーの画面を描画する。
         内部でEndScreenクラスのdrawを呼び出す。
         """
-        self.end_screen.draw(stage_state, score, high_score, max_combo, best_combo, tower_height, tower_bonus, best_tower_height, mouse_pos)
+        self.end_screen.draw(stage_state, score, high_score, max_combo, best_combo, tower_height, tower_bonus, best_tower_height, mouse_pos, run_rank)
 
     def draw_recall_button(self, position):
         """
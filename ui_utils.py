@@ -28,6 +28,18 @@ def draw_text(screen, text, font, color, center_pos, outline_color=None, outline
     text_rect = text_surface.get_rect(center=center_pos)
     screen.blit(text_surface, text_rect)
 
+def render_text(text, font, color, center_pos, outline_color=None, outline_width=0):
+    """
+    draw_textと同じ見た目のテキストを、背景が透明なSurfaceに描画して返す。
+    何度も同じテキストを表示する場合に、描画済みのSurfaceを使い回すために使う。
+    :return: (Surface, 画面上で描画する左上の座標)
+    """
+    pad = outline_width if outline_color else 0
+    width, height = font.size(text)
+    surface = pygame.Surface((width + pad * 2, height + pad * 2), pygame.SRCALPHA)
+    draw_text(surface, text, font, color, (surface.get_width() / 2, surface.get_height() / 2), outline_color, outline_width)
+    return surface, surface.get_rect(center=center_pos).topleft
+
 def draw_heart(screen, center_x, center_y, size, color):
     """指定された位置にハートを描画する。"""
     points = []
@@ -1,11 +1,14 @@
 import pygame
 import config
+from sprite_cache import sprite_cache
 
 class WeakPoint:
     """
     ボスに付属する「弱点」オブジェクト。
     位置、状態（アクティブ/非アクティブ）を管理し、自身の描画を行う。
     """
+    __slots__ = ("boss", "relative_pos", "size", "radius", "absolute_pos", "rect", "is_active")
+
     def __init__(self, boss, relative_pos):
         """
         弱点を初期化する。
@@ -19,8 +22,8 @@ class WeakPoint:
 
         # 画面上の絶対座標。毎フレームupdateで更新される。
         self.absolute_pos = pygame.math.Vector2(0, 0)
-        # 当たり判定用のRect。これも毎フレーム更新される。
-        self.rect = pygame.Rect(0, 0, self.size, self.size)
+        # 当たり判定用のFRect。これも毎フレーム更新される。
+        self.rect = pygame.FRect(0, 0, self.size, self.size)
 
         self.is_active = False # 初期状態は非アクティブ
 
@@ -28,34 +31,47 @@ class WeakPoint:
         """
         親であるボスの位置に基づいて、自身の絶対座標と当たり判定を更新する。
         """
-        # ボスの中心座標をVector2として取得
-        boss_center = pygame.math.Vector2(self.boss.rect.center)
-        
+        # ボスの中心座標を取得
+        boss_center_x, boss_center_y = self.boss.rect.center
+
         # ボスの現在の永続スケールを取得（なければ1.0）
         boss_scale = getattr(self.boss, 'persistent_scale', 1.0)
 
-        # 絶対座標を計算
-        self.absolute_pos = boss_center + (self.relative_pos * boss_scale)
+        # 絶対座標を計算 (毎フレーム新しいVector2を作らないよう、その場で更新する)
+        self.absolute_pos.update(boss_center_x + self.relative_pos.x * boss_scale, boss_center_y + self.relative_pos.y * boss_scale)
         # Rectの中心を絶対座標に合わせる
         self.rect.center = self.absolute_pos
 
-    def draw(self, screen):
-        """弱点を画面に描画する。アクティブかどうかで色を変える。"""
-        if self.is_active:
+    @staticmethod
+    def _build_sprite(is_active, width, height):
+        """
+        弱点の見た目をSurfaceに描画する。アクティブかどうかで色を変える。
+        :return: 描画したSurface (円の外側は透明)
+        """
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        radius = width / 2
+        center = (width / 2, height / 2)
+        if is_active:
             # --- 開いた目（アクティブ）の描画 ---
             # 1. 白目を描画
-            pygame.draw.circle(screen, config.WEAK_POINT_EYE_WHITE_COLOR, self.absolute_pos, self.radius)
+            pygame.draw.circle(surface, config.WEAK_POINT_EYE_WHITE_COLOR, center, radius)
             # 2. 黒目を描画
-            pupil_radius = self.radius * config.WEAK_POINT_PUPIL_RADIUS_SCALE
-            pygame.draw.circle(screen, config.WEAK_POINT_PUPIL_COLOR, self.absolute_pos, pupil_radius)
+            pupil_radius = radius * config.WEAK_POINT_PUPIL_RADIUS_SCALE
+            pygame.draw.circle(surface, config.WEAK_POINT_PUPIL_COLOR, center, pupil_radius)
         else:
             # --- 閉じた目（非アクティブ）の描画 ---
             # 1. 背景を描画
-            pygame.draw.circle(screen, config.WEAK_POINT_COLOR_INACTIVE, self.absolute_pos, self.radius)
+            pygame.draw.circle(surface, config.WEAK_POINT_COLOR_INACTIVE, center, radius)
             # 2. 閉じた瞼の線を描画
-            start_pos = (self.absolute_pos.x - self.radius, self.absolute_pos.y)
-            end_pos = (self.absolute_pos.x + self.radius, self.absolute_pos.y)
-            pygame.draw.line(screen, config.BLACK, start_pos, end_pos, config.WEAK_POINT_CLOSED_LINE_WIDTH)
+            pygame.draw.line(surface, config.BLACK, (0, center[1]), (width, center[1]), config.WEAK_POINT_CLOSED_LINE_WIDTH)
 
         # 輪郭線はどちらの状態でも最後に描画
-        pygame.draw.circle(screen, config.BLACK, self.absolute_pos, self.radius, config.WEAK_POINT_OUTLINE_WIDTH)
+        pygame.draw.circle(surface, config.BLACK, center, radius, config.WEAK_POINT_OUTLINE_WIDTH)
+        return surface
+
+    def draw(self, screen):
+        """弱点を画面に描画する。開いた目と閉じた目は、焼き込み済みのものを使い分ける。"""
+        is_active = self.is_active
+        sprite = sprite_cache.get(("weak_point", is_active), self.size, self.size,
+                                  lambda width, height: self._build_sprite(is_active, width, height))
+        screen.blit(sprite, sprite.get_rect(center=(round(self.absolute_pos.x), round(self.absolute_pos.y))))